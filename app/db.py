@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings
 
@@ -23,13 +24,33 @@ class Base(DeclarativeBase):
     """Базовый класс моделей."""
 
 
-_connect_args = {"timeout": 10} if settings.database_url.startswith("sqlite+") else {}
+def _engine_options(url: str) -> dict:
+    """Параметры пула под драйвер.
+
+    Почему: для файловой SQLite через aiosqlite SQLAlchemy по умолчанию берёт
+    NullPool — каждая сессия (хендлер, джоба планировщика, флашер журнала)
+    заново открывала файл, поднимала поток aiosqlite и гоняла PRAGMA из
+    _configure_sqlite_pragmas. Держим небольшой пул живых соединений; ping
+    перед выдачей локальному файлу не нужен — разрывов как у сетевой БД нет.
+    In-memory базу не трогаем: у каждого соединения она своя.
+    """
+    if not url.startswith("sqlite+"):
+        return {"pool_pre_ping": True}
+    options: dict = {"connect_args": {"timeout": 10}}
+    if ":memory:" not in url:
+        options.update(
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=5,
+            max_overflow=10,
+            pool_pre_ping=False,
+        )
+    return options
+
 
 engine: AsyncEngine = create_async_engine(
     settings.database_url,
     echo=False,
-    connect_args=_connect_args,
-    pool_pre_ping=True,
+    **_engine_options(settings.database_url),
 )
 
 
@@ -43,6 +64,10 @@ def _configure_sqlite_pragmas(dbapi_connection: object, _connection_record: obje
     cursor.execute("PRAGMA synchronous=NORMAL;")
     cursor.execute("PRAGMA busy_timeout=5000;")
     cursor.execute("PRAGMA temp_store=MEMORY;")
+    # Кэш страниц и mmap — на соединение; с пулом они живут между сессиями,
+    # и горячие таблицы (счётчики, состояние игр) читаются без обращения к диску.
+    cursor.execute("PRAGMA cache_size=-64000;")  # ~64 МБ, выделяется по мере роста
+    cursor.execute("PRAGMA mmap_size=268435456;")
     cursor.execute("PRAGMA auto_vacuum=INCREMENTAL;")
     cursor.close()
 
@@ -55,3 +80,14 @@ async def get_session() -> AsyncIterator[AsyncSession]:
 
     async with SessionFactory() as session:
         yield session
+
+
+def get_session_ctx() -> AsyncSession:
+    """Сессия для ``async with get_session_ctx() as session:``.
+
+    Почему: AsyncSession сама является async-контекстным менеджером — без
+    async-генератора и ``break`` код хендлера проще, а закрытие сессии
+    гарантировано при любом выходе из блока.
+    """
+
+    return SessionFactory()
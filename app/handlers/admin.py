@@ -358,9 +358,14 @@ async def strike_user(message: Message, bot: Bot) -> None:
     if target_id is None:
         await message.reply("Нужен реплай на сообщение пользователя.")
         return
+    # Почему: страйк и сброс счётчика — одна транзакция; соединение с БД
+    # освобождается до сетевого вызова restrict_chat_member.
     async for session in get_session():
         count = await add_strike(session, target_id, settings.forum_chat_id)
+        if count >= 3:
+            await clear_strikes(session, target_id, settings.forum_chat_id)
         await session.commit()
+        break
     if count >= 3:
         until = datetime.now(timezone.utc) + timedelta(hours=24)
         permissions = ChatPermissions(can_send_messages=False)
@@ -373,9 +378,6 @@ async def strike_user(message: Message, bot: Bot) -> None:
             ),
             log_ctx=f"/strike L3 mute user_id={target_id}",
         )
-        async for session in get_session():
-            await clear_strikes(session, target_id, settings.forum_chat_id)
-            await session.commit()
         await message.reply("Третий страйк! Мут на 24 часа.")
         return
     await message.reply(f"Страйк добавлен. Всего: {count}")
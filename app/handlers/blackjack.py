@@ -10,6 +10,7 @@ from __future__ import annotations
 import asyncio
 import logging
 import random
+import time
 from datetime import datetime, timezone
 
 from aiogram import Bot, F, Router
@@ -259,6 +260,7 @@ async def cmd_blackjack(message: Message, bot: Bot) -> None:
     if not _in_games_topic(message) or message.from_user is None:
         return
     user_id = message.from_user.id
+    display_name = _display_name(message)
     async with _lock_for(user_id):
         async for session in get_session():
             await _register_cleanup(session, message)
@@ -274,29 +276,32 @@ async def cmd_blackjack(message: Message, bot: Bot) -> None:
                 return
 
             existing = await bj.load_game(session, user_id, message.chat.id)
+            # Правка старого стола откладывается до коммита нового: закрытие
+            # старой партии и открытие новой — одна транзакция, а Telegram-вызов
+            # не держит её открытой.
+            closed_text: str | None = None
             if existing is not None:
                 # Самолечение зависших партий: /21 никогда не отвечает «жди» —
                 # либо переоткрывает стол, либо закрывает просрочку и стартует заново.
                 if existing.phase == "betting":
                     # Ставки нет — деньги не тронуты, просто открываем новый стол.
                     await bj.delete_game(session, user_id, message.chat.id)
-                    await _safe_edit(bot, message.chat.id, existing.message_id,
-                                     "✖️ Стол переоткрыт — смотри новое сообщение ниже.")
+                    closed_text = "✖️ Стол переоткрыт — смотри новое сообщение ниже."
                 elif existing.is_timed_out(datetime.now(timezone.utc)):
                     # Просроченная партия — доигрываем авто-«хватит» и идём дальше.
                     result, payout, balance = await _settle(
                         session, user_id, message.chat.id, existing, closed_by="timeout"
                     )
-                    await session.commit()
-                    name = _display_name(message) or str(user_id)
-                    await _safe_edit(bot, message.chat.id, existing.message_id,
-                                     "⏰ Время вышло — авто-«хватит».\n\n"
-                                     + _outcome_text(existing, result, payout, balance, name))
+                    name = display_name or str(user_id)
+                    closed_text = (
+                        "⏰ Время вышло — авто-«хватит».\n\n"
+                        + _outcome_text(existing, result, payout, balance, name)
+                    )
                 else:
                     # Живая партия — пересылаем стол с кнопками (анти-завис: старое
                     # сообщение могло не обновиться из-за флуд-контроля).
                     await session.commit()
-                    name = _display_name(message) or str(user_id)
+                    name = display_name or str(user_id)
                     reply = await message.reply(
                         _playing_text(existing, name), reply_markup=_play_keyboard(user_id)
                     )
@@ -311,13 +316,15 @@ async def cmd_blackjack(message: Message, bot: Bot) -> None:
                     return
 
             stats = await get_or_create_stats(
-                session, user_id, message.chat.id, display_name=_display_name(message)
+                session, user_id, message.chat.id, display_name=display_name
             )
             rescued = rescue_if_bankrupt(stats, MIN_BET, BANKRUPT_TOP_UP)
             balance = stats.coins
             state = bj.new_betting_state()
             await bj.save_game(session, user_id, message.chat.id, state)
             await session.commit()
+            if closed_text is not None:
+                await _safe_edit(bot, message.chat.id, existing.message_id, closed_text)
 
             prefix = (
                 f"🆘 Банкрот! Держи {BANKRUPT_TOP_UP} 🪙 на реванш.\n\n" if rescued else ""
@@ -367,11 +374,12 @@ async def cmd_bonus(message: Message) -> None:
 async def cmd_score(message: Message) -> None:
     if not _in_games_topic(message) or message.from_user is None:
         return
+    display_name = _display_name(message)
     async for session in get_session():
         await _register_cleanup(session, message)
         stats = await get_or_create_stats(
             session, message.from_user.id, message.chat.id,
-            display_name=_display_name(message),
+            display_name=display_name,
         )
         rounds = await bj.get_recent_rounds(session, message.from_user.id, message.chat.id)
         total_bet, total_paid = await bj.get_round_totals(
@@ -380,7 +388,7 @@ async def cmd_score(message: Message) -> None:
         await session.commit()
 
         lines = [
-            f"📊 {_display_name(message) or 'Игрок'}",
+            f"📊 {display_name or 'Игрок'}",
             f"Монеты: {stats.coins} 🪙 | Партий: {stats.games_played} | Побед: {stats.wins}",
         ]
         if rounds:
@@ -396,14 +404,28 @@ async def cmd_score(message: Message) -> None:
         return
 
 
+# Почему: /21top в разгар вечера зовут подряд, а два ORDER BY по user_stats
+# на каждый вызов ради таблицы, которая за полминуты почти не меняется, —
+# лишнее. Отдаём текст из памяти; смещение баланса на секунды допустимо.
+_TOP_CACHE_TTL_SEC = 30.0
+_top_cache: dict[int, tuple[float, str]] = {}
+
+
 @router.message(Command("21top"))
 async def cmd_leaderboard(message: Message) -> None:
     if not _in_games_topic(message):
         return
+    chat_id = message.chat.id
     async for session in get_session():
         await _register_cleanup(session, message)
         await session.commit()
-        text = await _leaderboard_text(session, message.chat.id)
+        now = time.monotonic()
+        hit = _top_cache.get(chat_id)
+        if hit is not None and now - hit[0] < _TOP_CACHE_TTL_SEC:
+            text = hit[1]
+        else:
+            text = await _leaderboard_text(session, chat_id)
+            _top_cache[chat_id] = (now, text)
         await message.reply(text)
         return
 
@@ -451,11 +473,12 @@ async def cmd_gift(message: Message) -> None:
     if target_id == message.from_user.id:
         await message.reply("Нельзя подарить монеты самому себе.")
         return
+    display_name = _display_name(message)
     async with _lock_for(message.from_user.id):
         async for session in get_session():
             sender = await get_or_create_stats(
                 session, message.from_user.id, message.chat.id,
-                display_name=_display_name(message),
+                display_name=display_name,
             )
             receiver = await get_or_create_stats(
                 session, target_id, message.chat.id, display_name=target_name
@@ -465,7 +488,7 @@ async def cmd_gift(message: Message) -> None:
                 await message.reply(error)
                 return
             await session.commit()
-            sender_name = _display_name(message) or str(message.from_user.id)
+            sender_name = display_name or str(message.from_user.id)
             await message.reply(
                 f"🎁 {sender_name} подарил(а) {amount} 🪙 — {target_name or target_id}!\n"
                 f"Балансы: {sender.coins} | {receiver.coins}"
@@ -9,7 +9,7 @@ from aiogram.filters import BaseFilter, Command
 from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
 
 from app.config import settings
-from app.db import get_session
+from app.db import get_session_ctx
 from app.services.improvements import (
     IMPROVEMENT_CREATE_COST,
     IMPROVEMENT_THRESHOLD,
@@ -57,7 +57,7 @@ async def improvement_command(message: Message) -> None:
 
     user_id = message.from_user.id
 
-    async for session in get_session():
+    async with get_session_ctx() as session:
         can_create = await can_create_improvement_this_month(
             session, user_id, settings.forum_chat_id
         )
@@ -104,35 +104,39 @@ async def improvement_text_handler(message: Message, bot: Bot) -> None:
         return
 
     user_name = message.from_user.full_name
-    improvement = None
-    async for session in get_session():
+    # Почему: в блоке сессии — только работа с БД; ответы в Telegram идут
+    # после него, чтобы соединение не висело на сетевых вызовах.
+    result = extra = None
+    async with get_session_ctx() as session:
         # Перепроверяем лимит (защита от гонки)
         can_create = await can_create_improvement_this_month(
             session, user_id, settings.forum_chat_id
         )
-        if not can_create:
-            await message.reply("В этом месяце вы уже подавали доработку.")
-            return
+        if can_create:
+            result, extra = await create_improvement(
+                session,
+                chat_id=settings.forum_chat_id,
+                author_id=user_id,
+                author_name=user_name,
+                text=text,
+            )
+            if result is not None:
+                await session.commit()
 
-        result, extra = await create_improvement(
-            session,
-            chat_id=settings.forum_chat_id,
-            author_id=user_id,
-            author_name=user_name,
-            text=text,
+    if not can_create:
+        await message.reply("В этом месяце вы уже подавали доработку.")
+        return
+    if result is None:
+        reason = extra
+        balance = int(reason.split(":")[1]) if ":" in reason else 0
+        await message.reply(
+            f"Недостаточно монет.\n"
+            f"Нужно: {IMPROVEMENT_CREATE_COST} монет, у вас: {balance}.\n"
+            "Сейчас доступных игровых способов заработка нет."
         )
-        if result is None:
-            reason = extra
-            balance = int(reason.split(":")[1]) if ":" in reason else 0
-            await message.reply(
-                f"Недостаточно монет.\n"
-                f"Нужно: {IMPROVEMENT_CREATE_COST} монет, у вас: {balance}.\n"
-                "Сейчас доступных игровых способов заработка нет."
-            )
-            return
-        improvement = result
-        new_balance = extra
-        await session.commit()
+        return
+    improvement = result
+    new_balance = extra
 
     expires_str = improvement.expires_at.strftime("%d.%m.%Y")
     sent = await message.answer(
@@ -151,7 +155,7 @@ async def improvement_text_handler(message: Message, bot: Bot) -> None:
 @router.message(Command("доработки", "improvements"))
 async def improvements_list_command(message: Message) -> None:
     """Показывает список активных доработок бота."""
-    async for session in get_session():
+    async with get_session_ctx() as session:
         improvements = await get_active_improvements(session, settings.forum_chat_id)
 
     if not improvements:
@@ -195,9 +199,7 @@ async def improvement_vote_callback(callback: CallbackQuery, bot: Bot) -> None:
     user_id = callback.from_user.id
     user_name = callback.from_user.full_name
 
-    improvement = None
-    just_completed = False
-    async for session in get_session():
+    async with get_session_ctx() as session:
         result, extra, just_completed = await vote_for_improvement(
             session,
             improvement_id=improvement_id,
@@ -205,28 +207,29 @@ async def improvement_vote_callback(callback: CallbackQuery, bot: Bot) -> None:
             user_name=user_name,
             chat_id=settings.forum_chat_id,
         )
+        if result is not None:
+            await session.commit()
+
+    if result is None:
+        reason = extra
+        if reason == "already_voted":
+            await callback.answer("Вы уже поддержали эту доработку.", show_alert=False)
+        elif reason == "already_completed":
+            await callback.answer("Доработка уже принята в работу!", show_alert=False)
+        elif reason == "expired":
+            await callback.answer("Срок голосования истёк.", show_alert=True)
+        elif reason == "not_found":
+            await callback.answer("Доработка не найдена.", show_alert=True)
+        else:
+            balance = int(reason.split(":")[1]) if ":" in reason else 0
+            await callback.answer(
+                f"Недостаточно монет. У вас: {balance}, нужно: {IMPROVEMENT_VOTE_COST}.",
+                show_alert=True,
+            )
+        return
 
-        if result is None:
-            reason = extra
-            if reason == "already_voted":
-                await callback.answer("Вы уже поддержали эту доработку.", show_alert=False)
-            elif reason == "already_completed":
-                await callback.answer("Доработка уже принята в работу!", show_alert=False)
-            elif reason == "expired":
-                await callback.answer("Срок голосования истёк.", show_alert=True)
-            elif reason == "not_found":
-                await callback.answer("Доработка не найдена.", show_alert=True)
-            else:
-                balance = int(reason.split(":")[1]) if ":" in reason else 0
-                await callback.answer(
-                    f"Недостаточно монет. У вас: {balance}, нужно: {IMPROVEMENT_VOTE_COST}.",
-                    show_alert=True,
-                )
-            return
-
-        improvement = result
-        new_balance = extra
-        await session.commit()
+    improvement = result
+    new_balance = extra
 
     await callback.answer(f"Поддержали! Остаток: {new_balance} монет", show_alert=False)
 
@@ -5,7 +5,7 @@ from __future__ import annotations
 import asyncio
 import logging
 
-from aiogram import Bot, F, Router
+from aiogram import Bot, Router
 from aiogram.filters import Command, StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
@@ -14,6 +14,8 @@ from aiogram.types import Message
 
 from app.config import settings
 from app.utils.admin import is_admin
+from app.utils.safe_telegram import safe_call
+from app.utils.tasks import spawn_background
 
 logger = logging.getLogger(__name__)
 router = Router()
@@ -94,7 +96,12 @@ async def _handle_neighbor_timeout(
             message_thread_id=thread_id,
         )
     finally:
-        _neighbor_timeout_tasks.pop((chat_id, user_id), None)
+        # Снимаем только себя: отменённый таймер доходит сюда уже после того,
+        # как _start_neighbor_timeout положил на его место новый, и pop по
+        # ключу выбрасывал бы свежую задачу (а на неё больше нет сильных ссылок).
+        key = (chat_id, user_id)
+        if _neighbor_timeout_tasks.get(key) is asyncio.current_task():
+            del _neighbor_timeout_tasks[key]
 
 
 @router.message(Command("form"))
@@ -135,7 +142,7 @@ async def start_gate_form_command(message: Message, state: FSMContext, bot: Bot)
         "4) Номер был в постоянной базе пропусков? (да/нет)\n"
         "5) Вы выезжали из ЖК или заезжали?"
     )
-    logger.info(f"HANDLER: start_gate_form_command, target={target.id}")
+    logger.info("HANDLER: start_gate_form_command, target=%s", target.id)
 
 
 # FSM handlers MUST be registered BEFORE catch-all handlers
@@ -143,7 +150,7 @@ async def start_gate_form_command(message: Message, state: FSMContext, bot: Bot)
 @router.message(GateForm.waiting_response)
 async def gate_response(message: Message, state: FSMContext, bot: Bot) -> None:
     """Обработчик ответа пользователя на все вопросы формы шлагбаума."""
-    logger.info(f"HANDLER: gate_response, text={message.text!r}")
+    logger.info("HANDLER: gate_response, text=%r", message.text)
     await state.clear()
 
     user = message.from_user
@@ -154,14 +161,22 @@ async def gate_response(message: Message, state: FSMContext, bot: Bot) -> None:
         f"{message.text}\n\n"
         f"От пользователя ({user.full_name}{username_part} {user.id})"
     )
-    await bot.send_message(settings.admin_log_chat_id, text)
+    # Почему: житель не должен ждать round-trip до лог-чата — подтверждение
+    # уходит сразу, а заявка админам отправляется в фоне (ошибку залогирует
+    # safe_call, как и фоновые отправки модерации).
+    spawn_background(
+        safe_call(
+            bot.send_message(settings.admin_log_chat_id, text),
+            log_ctx=f"gate form user_id={user.id}",
+        )
+    )
     await message.reply("Спасибо! Заявка отправлена администраторам.")
     logger.info("OUT: Спасибо! Заявка отправлена администраторам.")
 
 
 @router.message(NeighborForm.name)
 async def neighbor_name(message: Message, state: FSMContext, bot: Bot) -> None:
-    logger.info(f"HANDLER: neighbor_name, text={message.text!r}")
+    logger.info("HANDLER: neighbor_name, text=%r", message.text)
     await state.update_data(name=message.text)
     await state.set_state(NeighborForm.building)
     await message.reply("В каком корпусе/доме живешь?")
@@ -177,7 +192,7 @@ async def neighbor_name(message: Message, state: FSMContext, bot: Bot) -> None:
 
 @router.message(NeighborForm.building)
 async def neighbor_building(message: Message, state: FSMContext, bot: Bot) -> None:
-    logger.info(f"HANDLER: neighbor_building, text={message.text!r}")
+    logger.info("HANDLER: neighbor_building, text=%r", message.text)
     await state.update_data(building=message.text)
     await state.set_state(NeighborForm.about)
     await message.reply("Чем увлекаешься или чем можешь быть полезен соседям?")
@@ -193,7 +208,7 @@ async def neighbor_building(message: Message, state: FSMContext, bot: Bot) -> No
 
 @router.message(NeighborForm.about)
 async def neighbor_finish(message: Message, state: FSMContext, bot: Bot) -> None:
-    logger.info(f"HANDLER: neighbor_finish, text={message.text!r}")
+    logger.info("HANDLER: neighbor_finish, text=%r", message.text)
     await state.update_data(about=message.text)
     data = await state.get_data()
     await state.clear()
@@ -212,15 +227,24 @@ async def neighbor_finish(message: Message, state: FSMContext, bot: Bot) -> None
 # Catch-all trigger handlers AFTER state handlers
 # Используем фильтры чтобы не блокировать модерацию для других топиков
 
-@router.message(
-    F.chat.id == settings.forum_chat_id,
-    F.message_thread_id == settings.topic_neighbors,
-    F.from_user,
-    F.text,
-    StateFilter(None),
-)
+def _is_neighbors_topic_text(message: Message) -> bool:
+    """Текст от пользователя в теме «Соседи» форума.
+
+    Почему: фильтр проверяется на каждое сообщение форума. Обычная функция
+    с коротким замыканием дешевле цепочки MagicFilter: сообщения других тем
+    отсекаются первым же сравнением номера темы.
+    """
+    return (
+        message.message_thread_id == settings.topic_neighbors
+        and message.chat.id == settings.forum_chat_id
+        and message.from_user is not None
+        and bool(message.text)
+    )
+
+
+@router.message(_is_neighbors_topic_text, StateFilter(None))
 async def neighbor_trigger(message: Message, state: FSMContext, bot: Bot) -> None:
-    logger.info(f"HANDLER: neighbor_trigger MATCH, text={message.text!r}")
+    logger.info("HANDLER: neighbor_trigger MATCH, text=%r", message.text)
     await state.set_state(NeighborForm.name)
     await message.reply("Добро пожаловать! Давай познакомимся. Как тебя зовут?")
     _start_neighbor_timeout(
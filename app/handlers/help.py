@@ -9,6 +9,7 @@ import re
 from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache, partial
 
 from aiogram import Bot, F, Router
 from aiogram.filters import BaseFilter, Command
@@ -43,18 +44,26 @@ from app.services.resident_profile import (
     parse_extracted_facts,
     update_profile,
 )
-from app.utils.admin import is_admin
+from app.utils.admin import is_admin_cached
 from app.utils.admin_help import ADMIN_HELP
+from app.utils.cache import remember_bounded
+from app.utils.tasks import spawn_background
 from app.utils.text import (
     extract_phones,
     extract_urls,
     phone_to_tel_uri,
+    pick_other,
     url_to_href,
 )
 
 logger = logging.getLogger(__name__)
 router = Router()
 _BOT_PROFILE_CACHE: User | None = None
+# Подстроки, без которых обращения к боту по имени/@username быть не может.
+# Заполняются вместе с профилем бота (см. _remember_bot_profile).
+_MENTION_NEEDLES: tuple[str, ...] = ()
+# Почему: два конкурентных первых упоминания не должны оба звать get_me().
+_BOT_PROFILE_LOCK = asyncio.Lock()
 _ASSISTANT_CHAT_IDS = {settings.forum_chat_id, settings.admin_log_chat_id}
 
 
@@ -68,22 +77,47 @@ def _is_silent_topic(topic_id: int | None) -> bool:
 async def _get_bot_profile(bot: Bot) -> User:
     """Почему: снижаем число вызовов Telegram API при частых упоминаниях."""
 
-    global _BOT_PROFILE_CACHE
-    if _BOT_PROFILE_CACHE is None:
-        # Если aiogram уже закэшировал профиль через startup-probe — переиспользуем.
-        bot_me = getattr(bot, "_me", None)
-        if bot_me is not None:
-            _BOT_PROFILE_CACHE = bot_me
-        else:
-            _BOT_PROFILE_CACHE = await bot.get_me()
+    if _BOT_PROFILE_CACHE is not None:
+        return _BOT_PROFILE_CACHE
+    async with _BOT_PROFILE_LOCK:
+        if _BOT_PROFILE_CACHE is None:
+            # Если aiogram уже закэшировал профиль через startup-probe — переиспользуем.
+            bot_me = getattr(bot, "_me", None)
+            if bot_me is None:
+                bot_me = await bot.get_me()
+            _remember_bot_profile(bot_me)
     return _BOT_PROFILE_CACHE
 
 
+def _remember_bot_profile(bot_user: User) -> None:
+    """Сохраняет профиль бота и пересчитывает подстроки для быстрого фильтра."""
+    global _BOT_PROFILE_CACHE, _MENTION_NEEDLES
+    _BOT_PROFILE_CACHE = bot_user
+    needles = {alias.casefold() for alias in _BOT_NAME_ALIASES}
+    username = getattr(bot_user, "username", None)
+    if username:
+        needles.add(f"@{username}".casefold())
+    first_name = getattr(bot_user, "first_name", None)
+    if first_name:
+        needles.add(str(first_name).casefold())
+    _MENTION_NEEDLES = tuple(needles)
+    # Прогреваем скомпилированный паттерн обращения по имени.
+    _name_call_pattern(str(first_name).casefold() if first_name else None)
+
+
 def prewarm_bot_profile(bot_user: User) -> None:
     """Предзаполняет кэш профиля бота из on_startup, чтобы первое упоминание
     не ждало лишний round-trip к Telegram API."""
-    global _BOT_PROFILE_CACHE
-    _BOT_PROFILE_CACHE = bot_user
+    _remember_bot_profile(bot_user)
+
+
+def _may_mention_bot(text: str, entities: list[MessageEntity]) -> bool:
+    """Дешёвый префильтр: без подстроки имени/@username и text_mention
+    обращения к боту точно нет, и regex-проверки можно не запускать."""
+    if any(entity.type == "text_mention" for entity in entities):
+        return True
+    lowered = text.casefold()
+    return any(needle in lowered for needle in _MENTION_NEEDLES)
 
 
 class HelpRoutingActiveFilter(BaseFilter):
@@ -121,8 +155,7 @@ class AdminCorrectionFilter(BaseFilter):
         # Отправитель — администратор
         if not message.from_user:
             return False
-        from app.utils.admin import is_admin
-        return await is_admin(bot, message.chat.id, message.from_user.id)
+        return await is_admin_cached(bot, message.chat.id, message.from_user.id)
 
 
 # Реакции на ответ бота — короткие эмоциональные фразы, которые не требуют ответа
@@ -156,7 +189,11 @@ class BotMentionFilter(BaseFilter):
             return False
         me = await _get_bot_profile(bot)
 
-        has_direct_mention = _is_bot_mentioned(message, me) or _is_bot_name_called(text, me)
+        # Почему: подавляющее большинство сообщений не содержит ни имени бота,
+        # ни @username — отсекаем их поиском подстроки до разбора сущностей и regex.
+        has_direct_mention = _may_mention_bot(text, entities) and (
+            _is_bot_mentioned(message, me) or _is_bot_name_called(text, me)
+        )
 
         # Реплай на сообщение бота — отвечаем ВСЕГДА (это прямое обращение к нему),
         # даже без «?». Исключаем только пустышки/односложные реакции («ок», «лол»)
@@ -327,6 +364,12 @@ _PROCESSED_MSG_IDS: set[int] = set()
 _PROCESSED_MSG_IDS_MAX = 500
 _LAST_UNCERTAIN_REPLY_TIME: dict[tuple[int, int, int | None], datetime] = {}
 
+# Почему: словари «когда этому жителю отвечали в последний раз» пополнялись
+# каждым, кто хоть раз обратился к боту, и за аптайм не чистились. Держим не
+# больше _PER_USER_STATE_MAX записей (см. remember_bounded).
+_PER_USER_STATE_MAX = 4096
+
+
 _UNCERTAIN_REPLY_PATTERNS: tuple[re.Pattern[str], ...] = (
     re.compile(r"\bне\s+знаю\b", re.IGNORECASE),
     re.compile(r"\bнет\s+(?:точного\s+)?ответа\b", re.IGNORECASE),
@@ -400,7 +443,7 @@ def _should_skip_uncertain_reply(
     last_sent = _LAST_UNCERTAIN_REPLY_TIME.get(key)
     if last_sent and now - last_sent < AI_UNCERTAIN_REPLY_COOLDOWN:
         return True
-    _LAST_UNCERTAIN_REPLY_TIME[key] = now
+    remember_bounded(_LAST_UNCERTAIN_REPLY_TIME, key, now, _PER_USER_STATE_MAX)
     return False
 
 
@@ -475,11 +518,10 @@ def _local_social_reply(prompt: str, chat_id: int, user_id: int) -> str | None:
     # «Привет, ты дебил» не должен получать радостный ответ: при любых
     # локальных признаках мата/агрессии уходим в обычный путь с модерацией.
     from app.services.ai_module import (
-        detect_profanity,
         local_moderation,
-        normalize_for_profanity,
+        text_has_profanity,
     )
-    if detect_profanity(normalize_for_profanity(text)) or local_moderation(text).severity > 0:
+    if text_has_profanity(text) or local_moderation(text).severity > 0:
         return None
     # Шорткат только для ЧИСТО социальных сообщений: «привет, телефон УК» —
     # это фактический запрос, его нельзя гасить дежурной фразой.
@@ -494,9 +536,8 @@ def _local_social_reply(prompt: str, chat_id: int, user_id: int) -> str | None:
         return None
     key = (chat_id, user_id)
     prev = _LAST_SOCIAL_REPLY.get(key)
-    candidates = [r for r in pool if r != prev] or list(pool)
-    reply = random.choice(candidates)
-    _LAST_SOCIAL_REPLY[key] = reply
+    reply = pick_other(pool, prev)
+    remember_bounded(_LAST_SOCIAL_REPLY, key, reply, _PER_USER_STATE_MAX)
     return reply
 
 
@@ -659,9 +700,14 @@ HELP_ROUTING_STATE: dict[tuple[int, int], HelpRoutingState] = {}
 HELP_TIMEOUT_TASKS: dict[tuple[int, int], asyncio.Task[None]] = {}
 LAST_HINT_TIME: dict[tuple[int, int], datetime] = {}
 HELP_DELETE_TASKS: dict[tuple[int, int], asyncio.Task[None]] = {}
-# In-memory кэш используется как быстрый fallback; основная история — в БД
-AI_CHAT_HISTORY: dict[tuple[int, int], deque[str]] = {}
+# In-memory кэш используется как быстрый fallback; основная история — в БД.
+# Храним пары (роль, текст): строка «роль: текст» собирается только при чтении,
+# которое бывает лишь на fallback-пути, а префиксы ролей не дублируются в памяти.
+AI_CHAT_HISTORY: dict[tuple[int, int], deque[tuple[str, str]]] = {}
+_ROLE_USER = "user"
+_ROLE_ASSISTANT = "assistant"
 AI_CHAT_HISTORY_LIMIT = 30
+_AI_CHAT_HISTORY_USERS_MAX = 1000
 LAST_AI_REPLY_TIME: dict[tuple[int, int], datetime] = {}
 # Кэш промпт→ответ для feedback кнопок (message_id → данные).
 # Храним category для кнопки «Ещё про …» — лезть за ней в KB из callback данных дороже.
@@ -683,7 +729,8 @@ async def _get_menu_text(bot: Bot, user_id: int | None) -> str:
     if user_id is None:
         return HELP_MENU_TEXT
     try:
-        if await is_admin(bot, settings.forum_chat_id, user_id):
+        # /help зовут все жители подряд — статус из кэша, без getChatMember на каждый.
+        if await is_admin_cached(bot, settings.forum_chat_id, user_id):
             return f"{HELP_MENU_TEXT}\n\n{ADMIN_HELP}"
     except Exception:  # noqa: BLE001 - не ломаем /help при ошибке проверки
         logger.exception("Не удалось проверить права администратора для /help.")
@@ -839,17 +886,54 @@ def _back_keyboard() -> InlineKeyboardMarkup:
     )
 
 
+# Почему: клавиатуры статичны — собираем один раз, а не на каждый клик.
+_MENU_KEYBOARD = _menu_keyboard()
+_BACK_KEYBOARD = _back_keyboard()
+
+# Последний отрисованный текст справки по (chat_id, message_id): повторное
+# нажатие той же кнопки не шлёт edit_text, на который Telegram ответит
+# «message is not modified».
+_RENDERED_TEXT: dict[tuple[int, int], str] = {}
+_RENDERED_TEXT_MAX = 4096
+
+
+def _remember_rendered(chat_id: int, message_id: int, text: str) -> None:
+    key = _message_key(chat_id, message_id)
+    remember_bounded(_RENDERED_TEXT, key, text, _RENDERED_TEXT_MAX)
+
+
+async def _edit_help_text(
+    message: Message,
+    text: str,
+    reply_markup: InlineKeyboardMarkup,
+    parse_mode: str | None = None,
+) -> None:
+    """Редактирует сообщение справки, пропуская правку без изменений."""
+    if _RENDERED_TEXT.get(_message_key(message.chat.id, message.message_id)) == text:
+        return
+    if parse_mode is None:
+        await message.edit_text(text, reply_markup=reply_markup)
+    else:
+        await message.edit_text(text, reply_markup=reply_markup, parse_mode=parse_mode)
+    _remember_rendered(message.chat.id, message.message_id, text)
+
+
+# Плоский индекс «ключевое слово → тема»: один проход вместо вложенных циклов.
+# Порядок вставки повторяет TOPIC_KEYWORDS — при равенстве очков побеждает
+# тема, объявленная раньше, как и прежде.
+_KEYWORD_TO_TOPIC: dict[str, str] = {
+    kw: topic for topic, keywords in TOPIC_KEYWORDS.items() for kw in keywords
+}
+
+
 def _classify_topic(text: str) -> str | None:
-    best_topic: str | None = None
-    best_score = 0
-    for topic, keywords in TOPIC_KEYWORDS.items():
-        score = sum(1 for kw in keywords if kw in text)
-        if score > best_score:
-            best_score = score
-            best_topic = topic
-    if best_score >= 1:
-        return best_topic
-    return None
+    scores: dict[str, int] = {}
+    for kw, topic in _KEYWORD_TO_TOPIC.items():
+        if kw in text:
+            scores[topic] = scores.get(topic, 0) + 1
+    if not scores:
+        return None
+    return max(scores, key=scores.__getitem__)
 
 
 def _state_key(chat_id: int, user_id: int) -> tuple[int, int]:
@@ -860,23 +944,51 @@ def _message_key(chat_id: int, message_id: int) -> tuple[int, int]:
     return (chat_id, message_id)
 
 
+def _forget_task(
+    tasks: dict[tuple[int, int], asyncio.Task[None]],
+    key: tuple[int, int],
+    task: asyncio.Task[None],
+) -> None:
+    """Done-callback: снимает завершённую (или отменённую) задачу из реестра.
+
+    Почему: таймер, вышедший по раннему return, оставался в словаре вместе с
+    кадром корутины и ботом до следующего запроса того же пользователя.
+    Сверяем identity — на место отменённой могла уже встать новая задача.
+    """
+    if tasks.get(key) is task:
+        del tasks[key]
+
+
+def _track_task(
+    tasks: dict[tuple[int, int], asyncio.Task[None]],
+    key: tuple[int, int],
+    task: asyncio.Task[None],
+) -> None:
+    tasks[key] = task
+    task.add_done_callback(partial(_forget_task, tasks, key))
+
+
+def _cancel_task(task: asyncio.Task[None] | None) -> None:
+    # Таймер сам зовёт очистку состояния — отменять себя он не должен, иначе
+    # CancelledError прилетит на его же следующем await (правке сообщения).
+    if task is not None and task is not asyncio.current_task():
+        task.cancel()
+
+
 def _clear_waiting_state(key: tuple[int, int]) -> None:
     HELP_ROUTING_STATE.pop(key, None)
-    task = HELP_TIMEOUT_TASKS.pop(key, None)
-    if task:
-        task.cancel()
+    _cancel_task(HELP_TIMEOUT_TASKS.pop(key, None))
 
 
 def _clear_delete_task(key: tuple[int, int]) -> None:
-    task = HELP_DELETE_TASKS.pop(key, None)
-    if task:
-        task.cancel()
+    _cancel_task(HELP_DELETE_TASKS.pop(key, None))
 
 
 async def _delete_help_message(bot: Bot, key: tuple[int, int]) -> None:
     await asyncio.sleep(HELP_DELETE_TIMEOUT.total_seconds())
     task_key = _message_key(*key)
     HELP_DELETE_TASKS.pop(task_key, None)
+    _RENDERED_TEXT.pop(task_key, None)
     try:
         await bot.delete_message(chat_id=key[0], message_id=key[1])
     except Exception:  # noqa: BLE001 - сообщение могло быть уже удалено
@@ -886,7 +998,7 @@ async def _delete_help_message(bot: Bot, key: tuple[int, int]) -> None:
 def schedule_help_delete(bot: Bot, chat_id: int, message_id: int) -> None:
     key = _message_key(chat_id, message_id)
     _clear_delete_task(key)
-    HELP_DELETE_TASKS[key] = asyncio.create_task(_delete_help_message(bot, key))
+    _track_task(HELP_DELETE_TASKS, key, asyncio.create_task(_delete_help_message(bot, key)))
 
 
 async def _run_timeout(bot: Bot, key: tuple[int, int]) -> None:
@@ -902,8 +1014,9 @@ async def _run_timeout(bot: Bot, key: tuple[int, int]) -> None:
         HELP_TIMEOUT_TEXT,
         chat_id=state.chat_id,
         message_id=state.message_id,
-        reply_markup=_menu_keyboard(),
+        reply_markup=_MENU_KEYBOARD,
     )
+    _remember_rendered(state.chat_id, state.message_id, HELP_TIMEOUT_TEXT)
 
 
 def _ai_key(chat_id: int, user_id: int) -> tuple[int, int]:
@@ -915,19 +1028,22 @@ def _get_ai_context(chat_id: int, user_id: int) -> list[str]:
     history = AI_CHAT_HISTORY.get(_ai_key(chat_id, user_id))
     if history is None:
         return []
-    return list(history)
+    return [f"{role}: {body}" for role, body in history]
 
 
 
 
 def _remember_ai_exchange(chat_id: int, user_id: int, prompt: str, reply: str) -> None:
     """Сохраняет обмен в in-memory историю (обратная совместимость для тестов)."""
-    history = AI_CHAT_HISTORY.setdefault(
-        _ai_key(chat_id, user_id),
-        deque(maxlen=AI_CHAT_HISTORY_LIMIT),
-    )
-    history.append(f"user: {prompt[:1000]}")
-    history.append(f"assistant: {reply[:800]}")
+    key = _ai_key(chat_id, user_id)
+    history = AI_CHAT_HISTORY.get(key)
+    if history is None:
+        history = deque(maxlen=AI_CHAT_HISTORY_LIMIT)
+    # История дублируется в БД, поэтому в памяти держим только недавних
+    # собеседников — давние вытесняются.
+    remember_bounded(AI_CHAT_HISTORY, key, history, _AI_CHAT_HISTORY_USERS_MAX)
+    history.append((_ROLE_USER, prompt[:1000]))
+    history.append((_ROLE_ASSISTANT, reply[:800]))
 
 
 async def _get_recent_topic_messages(
@@ -1148,7 +1264,7 @@ def _is_ai_reply_rate_limited(chat_id: int, user_id: int) -> bool:
     last_reply = LAST_AI_REPLY_TIME.get(key)
     if last_reply and now - last_reply < AI_MENTION_COOLDOWN:
         return True
-    LAST_AI_REPLY_TIME[key] = now
+    remember_bounded(LAST_AI_REPLY_TIME, key, now, _PER_USER_STATE_MAX)
     return False
 
 
@@ -1187,7 +1303,7 @@ async def set_waiting_state(
         message_thread_id=message_thread_id,
         started_at=datetime.now(timezone.utc),
     )
-    HELP_TIMEOUT_TASKS[key] = asyncio.create_task(_run_timeout(bot, key))
+    _track_task(HELP_TIMEOUT_TASKS, key, asyncio.create_task(_run_timeout(bot, key)))
 
 
 def clear_routing_state(
@@ -1224,9 +1340,10 @@ async def help_command(message: Message, bot: Bot) -> None:
     menu_text = await _get_menu_text(bot, message.from_user.id if message.from_user else None)
     response = await message.answer(
         menu_text,
-        reply_markup=_menu_keyboard(),
+        reply_markup=_MENU_KEYBOARD,
         parse_mode="HTML",
     )
+    _remember_rendered(response.chat.id, response.message_id, menu_text)
     schedule_help_delete(message.bot, response.chat.id, response.message_id)
     logger.info("OUT: HELP_MENU")
 
@@ -1293,19 +1410,21 @@ def _is_bot_name_called(text: str | None, bot_user: object) -> bool:
         return False
     # Берём только начало сообщения — позиция обращения
     first_part = text[:40].casefold()
-    names = set(_BOT_NAME_ALIASES)
     first_name = getattr(bot_user, "first_name", None)
+    pattern = _name_call_pattern(str(first_name).casefold() if first_name else None)
+    return pattern.match(first_part) is not None
+
+
+@lru_cache(maxsize=8)
+def _name_call_pattern(first_name: str | None) -> re.Pattern[str]:
+    """Один скомпилированный regex на все клички бота вместо re.match на каждую."""
+    names = set(_BOT_NAME_ALIASES)
     if first_name:
-        names.add(str(first_name).casefold())
-    for name in names:
-        if not name:
-            continue
-        # Имя в самом начале, перед запятой/воскл./двоеточием/пробелом ИЛИ в конце
-        # сообщения (чистое «Жабот»). Так «Жаботина» и «жабры» не срабатывают.
-        pattern = rf"^\s*{re.escape(name)}(?:\s*[,!:.?\s]|$)"
-        if re.match(pattern, first_part):
-            return True
-    return False
+        names.add(first_name)
+    alternation = "|".join(re.escape(name) for name in sorted(names, key=len, reverse=True))
+    # Имя в самом начале, перед запятой/воскл./двоеточием/пробелом ИЛИ в конце
+    # сообщения (чистое «Жабот»). Так «Жаботина» и «жабры» не срабатывают.
+    return re.compile(rf"^\s*(?:{alternation})(?:\s*[,!:.?\s]|$)")
 
 
 @router.callback_query(F.data == CALLBACK_BACK)
@@ -1316,11 +1435,7 @@ async def help_back(callback: CallbackQuery) -> None:
     key = _state_key(callback.message.chat.id, callback.from_user.id)
     _clear_waiting_state(key)
     menu_text = await _get_menu_text(callback.message.bot, callback.from_user.id)
-    await callback.message.edit_text(
-        menu_text,
-        reply_markup=_menu_keyboard(),
-        parse_mode="HTML",
-    )
+    await _edit_help_text(callback.message, menu_text, _MENU_KEYBOARD, parse_mode="HTML")
     schedule_help_delete(
         callback.message.bot,
         callback.message.chat.id,
@@ -1338,10 +1453,7 @@ async def help_where(callback: CallbackQuery, bot: Bot) -> None:
     now = datetime.now(timezone.utc)
     last_hint = LAST_HINT_TIME.get(key)
     if last_hint and now - last_hint < HINT_COOLDOWN:
-        await callback.message.edit_text(
-            HELP_RATE_LIMIT_TEXT,
-            reply_markup=_back_keyboard(),
-        )
+        await _edit_help_text(callback.message, HELP_RATE_LIMIT_TEXT, _BACK_KEYBOARD)
         schedule_help_delete(
             callback.message.bot,
             callback.message.chat.id,
@@ -1356,10 +1468,7 @@ async def help_where(callback: CallbackQuery, bot: Bot) -> None:
         callback.message.message_id,
         callback.message.message_thread_id,
     )
-    await callback.message.edit_text(
-        HELP_WAIT_TEXT,
-        reply_markup=_back_keyboard(),
-    )
+    await _edit_help_text(callback.message, HELP_WAIT_TEXT, _BACK_KEYBOARD)
     schedule_help_delete(
         callback.message.bot,
         callback.message.chat.id,
@@ -1388,11 +1497,7 @@ async def help_topic(callback: CallbackQuery) -> None:
             f"{description}\n\n"
             f"Перейти в тему: {_topic_link(topic, thread_id)}"
         )
-    await callback.message.edit_text(
-        reply_text,
-        reply_markup=_back_keyboard(),
-        parse_mode="HTML",
-    )
+    await _edit_help_text(callback.message, reply_text, _BACK_KEYBOARD, parse_mode="HTML")
     schedule_help_delete(
         callback.message.bot,
         callback.message.chat.id,
@@ -1445,13 +1550,15 @@ async def ai_command(message: Message) -> None:
         return
 
     try:
+        # Индикатор «печатает…» — фоном: пользователь видит его сразу, а загрузка
+        # контекста и LLM-вызов не ждут лишний round-trip send_chat_action.
+        _bot = getattr(message, "bot", None)
+        if _bot:
+            spawn_background(_send_typing(_bot, message))
         question_key = _normalize_cache_key(prompt)
 
         context = await _get_ai_context_persistent(message.chat.id, message.from_user.id)
         ai_client = get_ai_client()
-        _bot = getattr(message, "bot", None)
-        if _bot:
-            await _send_typing(_bot, message)
         try:
             reply = await ai_client.assistant_reply(
                 prompt,
@@ -1478,7 +1585,7 @@ async def ai_command(message: Message) -> None:
         _mark_prompt_answered(message.chat.id, message.from_user.id, prompt)
 
         # Извлечение фактов о пользователе (фоново, не блокирует ответ)
-        asyncio.create_task(
+        spawn_background(
             _extract_and_save_profile(
                 message.chat.id, message.from_user.id, prompt, reply,
                 getattr(message.from_user, "full_name", None),
@@ -1552,11 +1659,11 @@ async def admin_correction_handler(message: Message, bot: Bot) -> None:
 
 @router.message(BotMentionFilter(), flags={"block": False})
 async def mention_help(message: Message, bot: Bot) -> None:
-    logger.info(f"HANDLER: mention_help called, text={message.text!r}")
+    logger.info("HANDLER: mention_help called, text=%r", message.text)
     me = await _get_bot_profile(bot)
     username = getattr(me, "username", None)
     if username:
-        logger.info(f"HANDLER: mention_help MATCH @{username}")
+        logger.info("HANDLER: mention_help MATCH @%s", username)
     else:
         logger.info("HANDLER: mention_help MATCH by id")
     if message.chat.id not in _ASSISTANT_CHAT_IDS:
@@ -1662,6 +1769,9 @@ async def mention_help(message: Message, bot: Bot) -> None:
                     logger.warning("Не удалось обработать коррекцию.")
 
     if prompt:
+        # Индикатор «печатает…» — сразу и фоном, параллельно загрузке контекста
+        # и LLM-вызову, а не последовательным round-trip перед генерацией.
+        spawn_background(_send_typing(bot, message))
         # Загружаем историю диалога заранее — нужна и для дедупа, и для дальнейшей логики.
         context: list[str] = await _get_ai_context_persistent(
             message.chat.id, message.from_user.id
@@ -1731,7 +1841,6 @@ async def mention_help(message: Message, bot: Bot) -> None:
             if dialog_depth >= 5:
                 full_prompt += "\n[Продолжительный диалог — после ответа предложи итог или спроси «Ещё что-то?»]"
 
-            await _send_typing(bot, message)
             reply = await get_ai_client().assistant_reply(
                 full_prompt, context, chat_id=message.chat.id,
                 user_id=message.from_user.id,
@@ -1768,7 +1877,7 @@ async def mention_help(message: Message, bot: Bot) -> None:
             # Извлечение фактов о пользователе (фоново) — только если в сообщении
             # есть личные маркеры: экономим LLM-вызов на «где аптека?»-вопросах.
             if _has_personal_markers(prompt):
-                asyncio.create_task(
+                spawn_background(
                     _extract_and_save_profile(
                         message.chat.id, message.from_user.id, prompt, reply,
                         getattr(message.from_user, "full_name", None),
@@ -1884,12 +1993,12 @@ async def ai_feedback_callback(callback: CallbackQuery) -> None:
         # дайджесте (ответ админа уйдёт в RAG и закроет её), а битый ответ
         # убираем из кэша, чтобы не отдавался другим жителям.
         try:
-            from app.services.ai_module import _spawn_background, invalidate_cache_by_keywords
+            from app.services.ai_module import invalidate_cache_by_keywords
             from app.services.unanswered import log_stale_report
 
             _stale_words = [w for w in _normalize_cache_key(prompt_text).split("|") if len(w) >= 3][:7]
             invalidate_cache_by_keywords(_stale_words)
-            _spawn_background(log_stale_report(chat_id, prompt_text, reply_text))
+            spawn_background(log_stale_report(chat_id, prompt_text, reply_text))
         except Exception:
             logger.debug("Не удалось записать жалобу «устарело».", exc_info=True)
         try:
@@ -1946,12 +2055,12 @@ async def ai_feedback_callback(callback: CallbackQuery) -> None:
     # увидит его в еженедельном дайджесте и даст правильный ответ в RAG.
     if rating < 0:
         try:
-            from app.services.ai_module import _spawn_background, invalidate_cache_by_keywords
+            from app.services.ai_module import invalidate_cache_by_keywords
             from app.services.unanswered import log_unanswered
 
             _bad_words = [w for w in _normalize_cache_key(prompt_text).split("|") if len(w) >= 3][:7]
             invalidate_cache_by_keywords(_bad_words)
-            _spawn_background(log_unanswered(chat_id, prompt_text))
+            spawn_background(log_unanswered(chat_id, prompt_text))
         except Exception:
             logger.debug("Не удалось обработать 👎 для петли качества.", exc_info=True)
 
@@ -2062,12 +2171,13 @@ async def help_routing_response(message: Message, bot: Bot) -> None:
             reply_text = f"Ваш вопрос подходит для темы «{topic}»."
         else:
             reply_text = f"Ваш вопрос подходит для темы {_topic_link(topic, thread_id)}."
-    LAST_HINT_TIME[key] = now
+    remember_bounded(LAST_HINT_TIME, key, now, _PER_USER_STATE_MAX)
     await bot.edit_message_text(
         reply_text,
         chat_id=state.chat_id,
         message_id=state.message_id,
-        reply_markup=_back_keyboard(),
+        reply_markup=_BACK_KEYBOARD,
         parse_mode="HTML",
     )
+    _remember_rendered(state.chat_id, state.message_id, reply_text)
     schedule_help_delete(bot, state.chat_id, state.message_id)
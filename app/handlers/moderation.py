@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import logging
 import random
@@ -13,6 +15,7 @@ from aiogram import Bot, F, Router
 from aiogram.filters import Command, StateFilter
 from aiogram.types import (
     CallbackQuery,
+    ChatMemberUpdated,
     ChatPermissions,
     InlineKeyboardButton,
     InlineKeyboardMarkup,
@@ -20,15 +23,19 @@ from aiogram.types import (
 )
 
 from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
-from app.db import get_session
+from app.db import get_session, get_session_ctx
 from app.models import FloodRecord, MessageLog, ModerationEvent, ModerationTraining
-from app.services.ai_module import get_ai_client
+from app.services.ai_module import ModerationDecision, get_ai_client
 from app.services.flood import FloodTracker
+from app.services.message_log import enqueue_message_log
 from app.services.strikes import add_strike, clear_strikes
-from app.utils.admin import is_admin
+from app.utils.admin import invalidate_admin_cache, is_admin_cached
+from app.utils.cache import remember_bounded
 from app.utils.safe_telegram import safe_call
+from app.utils.tasks import spawn_background
 from app.utils.text import contains_forbidden_link
 from app.utils.time import ensure_aware
 
@@ -68,11 +75,10 @@ def _can_skip_ai_moderation(text: str) -> bool:
     if len(text) > 400:
         return False
     from app.services.ai_module import (
-        detect_profanity,
         local_moderation,
-        normalize_for_profanity,
+        text_has_profanity,
     )
-    if detect_profanity(normalize_for_profanity(text)):
+    if text_has_profanity(text):
         return False
     if local_moderation(text).severity > 0:
         return False
@@ -82,6 +88,56 @@ def _can_skip_ai_moderation(text: str) -> bool:
     return True
 
 
+# Кэш вердиктов AI-модерации: автор, повторяющий одно и то же сообщение в
+# теме, не должен стоить LLM-вызова на каждую копию.
+_AI_DECISION_TTL_SEC = 600.0
+_AI_DECISION_MAX = 4096
+_AI_DECISION_CACHE: dict[bytes, tuple[float, ModerationDecision]] = {}
+_AI_DECISION_INFLIGHT: dict[bytes, asyncio.Task[ModerationDecision]] = {}
+
+
+def _ai_decision_key(chat_id: int, thread_id: int | None, current_msg: str) -> bytes:
+    body = f"{chat_id}\x00{thread_id}\x00{' '.join(current_msg.lower().split())}"
+    return hashlib.blake2b(body.encode("utf-8"), digest_size=16).digest()
+
+
+async def _moderate_with_ai(
+    chat_id: int, thread_id: int | None, current_msg: str, context: list[str],
+) -> ModerationDecision:
+    """AI-модерация с кэшем вердиктов и объединением одновременных запросов.
+
+    Почему: модель видит не только текст, но и автора ([user_id]) и контекст
+    темы, поэтому вердикт переиспользуется лишь для того же автора в той же
+    теме — дословного повтора с тем же входом для LLM. Контекст темы за TTL
+    может сдвинуться, отсюда короткие 10 минут. Пока первый запрос в полёте,
+    остальные с тем же ключом ждут его же задачу (single-flight).
+    Fallback-вердикты (таймаут, ошибка провайдера) не кэшируются.
+    """
+    key = _ai_decision_key(chat_id, thread_id, current_msg)
+    cached = _AI_DECISION_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[0] < _AI_DECISION_TTL_SEC:
+        # Попадание освежает позицию (LRU), но не срок жизни вердикта.
+        remember_bounded(_AI_DECISION_CACHE, key, cached, _AI_DECISION_MAX)
+        return cached[1]
+
+    task = _AI_DECISION_INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(
+            get_ai_client().moderate(current_msg, chat_id=chat_id, context=context)
+        )
+        _AI_DECISION_INFLIGHT[key] = task
+        task.add_done_callback(lambda _: _AI_DECISION_INFLIGHT.pop(key, None))
+    # shield: отмена одного ожидающего не отменяет вердикт для остальных.
+    decision = await asyncio.shield(task)
+
+    if not getattr(decision, "used_fallback", False):
+        # Метка после ответа модели: иначе TTL съедала бы латентность LLM.
+        remember_bounded(
+            _AI_DECISION_CACHE, key, (time.monotonic(), decision), _AI_DECISION_MAX
+        )
+    return decision
+
+
 def _should_collect_gate_request(text: str) -> bool:
     """Определяет, нужно ли запускать сбор полей заявки в топике шлагбаума."""
     lowered = text.lower()
@@ -109,6 +165,7 @@ def is_training_mode() -> bool:
 # высокой уверенности модели. При сомнении понижаем до мягкого замечания —
 # лучше не наказать виновного, чем наказать невиновного соседа за шутку.
 _STRIKE_MIN_CONFIDENCE = 0.8
+_STRIKE_BAN_THRESHOLD = 5
 
 # Dict message_id → timestamp для идемпотентности модерации
 _MODERATED_MSG_IDS: dict[int, float] = {}
@@ -165,21 +222,28 @@ async def _warn_user(message: Message, text: str, bot: Bot) -> None:
     )
 
 
-async def _store_message_log(message: Message, severity: int, sentiment: str | None = None) -> None:
+async def _store_message_log(
+    message: Message,
+    severity: int,
+    sentiment: str | None = None,
+    session: AsyncSession | None = None,
+) -> None:
+    """Пишет сообщение в журнал; с переданной session — в её транзакцию."""
     if message.from_user is None:
         return
-    async for session in get_session():
-        session.add(
-            MessageLog(
-                chat_id=message.chat.id,
-                topic_id=message.message_thread_id,
-                user_id=message.from_user.id,
-                text=message.text,
-                severity=severity,
-                sentiment=sentiment,
-            )
-        )
-        await session.commit()
+    record = MessageLog(
+        chat_id=message.chat.id,
+        topic_id=message.message_thread_id,
+        user_id=message.from_user.id,
+        text=message.text,
+        severity=severity,
+        sentiment=sentiment,
+    )
+    if session is not None:
+        session.add(record)
+        return
+    # Без внешней транзакции — в очередь: строки пишутся пачкой фоновым flusher'ом.
+    enqueue_message_log(record)
 
 
 async def _get_topic_context(chat_id: int, topic_id: int | None, limit: int = 10) -> list[str]:
@@ -190,7 +254,7 @@ async def _get_topic_context(chat_id: int, topic_id: int | None, limit: int = 10
     if topic_id is None:
         return []
     try:
-        async for session in get_session():
+        async with get_session_ctx() as session:
             result = await session.execute(
                 select(MessageLog.user_id, MessageLog.text)
                 .where(
@@ -218,20 +282,59 @@ async def _store_mod_event(
     message_id: int | None = None,
     reason: str | None = None,
     confidence: float | None = None,
+    session: AsyncSession | None = None,
 ) -> None:
-    async for session in get_session():
-        session.add(
-            ModerationEvent(
-                chat_id=chat_id,
-                user_id=user_id,
-                event_type=event_type,
-                severity=severity,
-                message_id=message_id,
-                reason=reason,
-                confidence=confidence,
-            )
+    """Пишет событие модерации; с переданной session — без своего commit."""
+    event = ModerationEvent(
+        chat_id=chat_id,
+        user_id=user_id,
+        event_type=event_type,
+        severity=severity,
+        message_id=message_id,
+        reason=reason,
+        confidence=confidence,
+    )
+    if session is not None:
+        session.add(event)
+        return
+    async with get_session_ctx() as session:
+        session.add(event)
+        await session.commit()
+
+
+async def _record_strike(
+    message: Message,
+    event_type: str,
+    severity: int,
+    sentiment: str | None = None,
+    reason: str | None = None,
+    confidence: float | None = None,
+) -> int:
+    """Журнал сообщения, страйк, событие модерации и сброс счётчика при бане —
+    одной транзакцией.
+
+    Почему: раньше каждая запись открывала свою сессию и делала свой commit,
+    умножая открытие транзакций на горячем пути модерации.
+    """
+    user_id = message.from_user.id
+    async with get_session_ctx() as session:
+        await _store_message_log(message, severity, sentiment=sentiment, session=session)
+        strike_count = await add_strike(session, user_id, settings.forum_chat_id)
+        await _store_mod_event(
+            message.chat.id, user_id, event_type, severity,
+            message_id=message.message_id, reason=reason, confidence=confidence,
+            session=session,
         )
+        if strike_count >= _STRIKE_BAN_THRESHOLD:
+            await clear_strikes(session, user_id, settings.forum_chat_id)
         await session.commit()
+    return strike_count
+
+
+@router.chat_member()
+async def on_chat_member_updated(event: ChatMemberUpdated) -> None:
+    """Повышение/снятие админа должно сразу учитываться модерацией."""
+    invalidate_admin_cache(event.chat.id, event.new_chat_member.user.id)
 
 
 @router.message(Command("rules"))
@@ -269,21 +372,27 @@ async def run_moderation(message: Message, bot: Bot) -> int:
     if _is_already_moderated(message.message_id):
         return 0
 
-    if await is_admin(bot, settings.forum_chat_id, message.from_user.id):
+    if await is_admin_cached(bot, settings.forum_chat_id, message.from_user.id):
         return 0
 
     text = message.text
     user_id = message.from_user.id
     chat_id = message.chat.id
 
-    # Проверка запрещённых ссылок (до AI)
-    if contains_forbidden_link(text):
-        await safe_call(
-            message.delete(),
-            log_ctx=f"delete forbidden link msg={message.message_id}",
+    # Проверка запрещённых ссылок (до AI). Любой маркер ссылки («://», «www.»,
+    # «t.me/») содержит точку или слэш — без них regex не запускаем.
+    if ("." in text or "/" in text) and contains_forbidden_link(text):
+        # Почему: удаление и предупреждение независимы — ждём max(RTT), а не сумму.
+        await asyncio.gather(
+            safe_call(
+                message.delete(),
+                log_ctx=f"delete forbidden link msg={message.message_id}",
+            ),
+            _warn_user(message, "ссылки разрешены только в формате Telegram.", bot),
+        )
+        spawn_background(
+            _store_mod_event(chat_id, user_id, "delete", 1, message_id=message.message_id)
         )
-        await _warn_user(message, "ссылки разрешены только в формате Telegram.", bot)
-        await _store_mod_event(chat_id, user_id, "delete", 1, message_id=message.message_id)
         return 2
 
     # Загружаем контекст разговора из того же топика
@@ -293,9 +402,8 @@ async def run_moderation(message: Message, bot: Bot) -> int:
     current_msg = f"[user_{user_id}]: {text}"
 
     if settings.ai_feature_moderation and not _can_skip_ai_moderation(text):
-        ai_client = get_ai_client()
-        decision = await ai_client.moderate(
-            current_msg, chat_id=chat_id, context=topic_context,
+        decision = await _moderate_with_ai(
+            chat_id, message.message_thread_id, current_msg, topic_context
         )
     else:
         from app.services.ai_module import local_moderation
@@ -315,7 +423,9 @@ async def run_moderation(message: Message, bot: Bot) -> int:
         )
         severity = 1
 
-    await _store_message_log(message, severity, sentiment=sentiment)
+    # L2/L3 пишут журнал в одной транзакции со страйком (см. _record_strike).
+    if severity < 2 or is_training_mode():
+        await _store_message_log(message, severity, sentiment=sentiment)
 
     # Записываем sentiment в буфер настроения чата
     if sentiment:
@@ -328,7 +438,10 @@ async def run_moderation(message: Message, bot: Bot) -> int:
     # Режим тихого обучения: не модерируем, а отправляем в лог-чат для разметки
     if is_training_mode():
         if severity >= 1:
-            await _send_training_sample(message, bot, severity, violation_type, confidence)
+            # Образец уходит в лог-чат админам — пользователю его ждать незачем.
+            spawn_background(
+                _send_training_sample(message, bot, severity, violation_type, confidence)
+            )
         return 0
 
     # L0: ничего
@@ -377,9 +490,11 @@ async def run_moderation(message: Message, bot: Bot) -> int:
                             f"Проблема: {fields.problem_description}\n"
                             f"От: user_id={user_id}"
                         )
-                        await safe_call(
-                            bot.send_message(settings.admin_log_chat_id, gate_log),
-                            log_ctx="gate_request_log",
+                        spawn_background(
+                            safe_call(
+                                bot.send_message(settings.admin_log_chat_id, gate_log),
+                                log_ctx="gate_request_log",
+                            )
                         )
             except Exception:  # noqa: BLE001
                 pass
@@ -396,12 +511,9 @@ async def run_moderation(message: Message, bot: Bot) -> int:
 
     # L2: жёсткое предупреждение + счётчик +1, без удаления
     if severity == 2:
-        async for session in get_session():
-            strike_count = await add_strike(session, user_id, settings.forum_chat_id)
-            await session.commit()
-        await _store_mod_event(
-            chat_id, user_id, "warn", severity,
-            message_id=message.message_id, reason=violation_type, confidence=confidence,
+        strike_count = await _record_strike(
+            message, "warn", severity,
+            sentiment=sentiment, reason=violation_type, confidence=confidence,
         )
         warn_text = random.choice(_HARD_WARNINGS).format(count=strike_count)
         await _warn_user(message, warn_text, bot)
@@ -410,31 +522,31 @@ async def run_moderation(message: Message, bot: Bot) -> int:
 
     # L3: удаление + счётчик +1 + немедленный мут + уведомление админа
     if severity >= 3:
-        await safe_call(
-            message.delete(),
-            log_ctx=f"delete L3 msg={message.message_id}",
-        )
-        async for session in get_session():
-            strike_count = await add_strike(session, user_id, settings.forum_chat_id)
-            await session.commit()
-        await _store_mod_event(
-            chat_id, user_id, "delete", severity,
-            message_id=message.message_id, reason=violation_type, confidence=confidence,
-        )
-        # Немедленный мут 24ч
+        # Немедленный мут 24ч. Удаление, запись страйка, мут и предупреждение
+        # независимы — ждём самый медленный из них, а не сумму round-trip'ов.
         until = datetime.now(timezone.utc) + timedelta(hours=24)
         permissions = ChatPermissions(can_send_messages=False)
-        await safe_call(
-            bot.restrict_chat_member(
-                settings.forum_chat_id,
-                user_id,
-                permissions=permissions,
-                until_date=until,
+        _, strike_count, _, _ = await asyncio.gather(
+            safe_call(
+                message.delete(),
+                log_ctx=f"delete L3 msg={message.message_id}",
             ),
-            log_ctx=f"L3 mute user_id={user_id}",
+            _record_strike(
+                message, "delete", severity,
+                sentiment=sentiment, reason=violation_type, confidence=confidence,
+            ),
+            safe_call(
+                bot.restrict_chat_member(
+                    settings.forum_chat_id,
+                    user_id,
+                    permissions=permissions,
+                    until_date=until,
+                ),
+                log_ctx=f"L3 mute user_id={user_id}",
+            ),
+            _warn_user(message, "сообщение удалено, мут на 24 часа за грубое нарушение.", bot),
         )
-        await _warn_user(message, "сообщение удалено, мут на 24 часа за грубое нарушение.", bot)
-        # Уведомление админа
+        # Уведомление админа — в фоне, пользователю его ждать незачем
         mention = message.from_user.mention_html()
         admin_text = (
             f"🔴 L3 модерация\n"
@@ -443,9 +555,11 @@ async def run_moderation(message: Message, bot: Bot) -> int:
             f"Уверенность: {confidence or 'н/д'}\n"
             f"Текст: {text[:200]}"
         )
-        await safe_call(
-            bot.send_message(settings.admin_log_chat_id, admin_text, parse_mode="HTML"),
-            log_ctx="L3 admin notify",
+        spawn_background(
+            safe_call(
+                bot.send_message(settings.admin_log_chat_id, admin_text, parse_mode="HTML"),
+                log_ctx="L3 admin notify",
+            )
         )
         await _apply_strike_threshold(bot, message, user_id, strike_count)
         return 3
@@ -454,16 +568,16 @@ async def run_moderation(message: Message, bot: Bot) -> int:
 
 
 async def _apply_strike_threshold(bot: Bot, message: Message, user_id: int, strike_count: int) -> None:
-    """Применяет мут/бан по порогам счётчика предупреждений."""
-    if strike_count >= 5:
+    """Применяет мут/бан по порогам счётчика предупреждений.
+
+    Страйки при бане уже сброшены в _record_strike — здесь только Telegram.
+    """
+    if strike_count >= _STRIKE_BAN_THRESHOLD:
         # Бан
         await safe_call(
             bot.ban_chat_member(settings.forum_chat_id, user_id),
             log_ctx=f"strike ban user_id={user_id}",
         )
-        async for session in get_session():
-            await clear_strikes(session, user_id, settings.forum_chat_id)
-            await session.commit()
         await _warn_user(message, "слишком много нарушений — бан.", bot)
     elif strike_count == 3:
         # Мут 24ч ровно на 3-м страйке. Точное сравнение (не >=): при гонке
@@ -471,53 +585,66 @@ async def _apply_strike_threshold(bot: Bot, message: Message, user_id: int, stri
         # 4-й страйк — только предупреждение, эскалация дальше на 5-м (бан).
         until = datetime.now(timezone.utc) + timedelta(hours=24)
         permissions = ChatPermissions(can_send_messages=False)
-        await safe_call(
-            bot.restrict_chat_member(
-                settings.forum_chat_id,
-                user_id,
-                permissions=permissions,
-                until_date=until,
+        await asyncio.gather(
+            safe_call(
+                bot.restrict_chat_member(
+                    settings.forum_chat_id,
+                    user_id,
+                    permissions=permissions,
+                    until_date=until,
+                ),
+                log_ctx=f"strike mute user_id={user_id}",
             ),
-            log_ctx=f"strike mute user_id={user_id}",
+            _warn_user(message, "3 предупреждения — пауза в чате на 24 часа.", bot),
         )
-        await _warn_user(message, "3 предупреждения — пауза в чате на 24 часа.", bot)
 
 
 async def _check_flood(message: Message, bot: Bot) -> bool:
     """Flood-проверка (не связана с AI severity)."""
     if message.from_user is None:
         return False
-    count = FLOOD_TRACKER.register(message.from_user.id, settings.forum_chat_id, datetime.now(timezone.utc))
-    if count <= 10:
+    count = FLOOD_TRACKER.register(message.from_user.id, settings.forum_chat_id)
+    if count <= FLOOD_TRACKER.limit:
         return False
 
-    async for session in get_session():
+    # Почему: одно «сейчас» на обработку — запись в БД и срок мута согласованы.
+    now = datetime.now(timezone.utc)
+    async with get_session_ctx() as session:
         record = await session.get(
             FloodRecord,
             {"user_id": message.from_user.id, "chat_id": settings.forum_chat_id},
         )
-        now = datetime.now(timezone.utc)
         if record is None:
             record = FloodRecord(user_id=message.from_user.id, chat_id=settings.forum_chat_id)
             session.add(record)
         repeat_within_hour = record.last_flood_at and now - ensure_aware(record.last_flood_at) < timedelta(hours=1)
         record.last_flood_at = now
+        # Почему: событие мута пишем в ту же транзакцию — одна сессия, один commit.
+        session.add(
+            ModerationEvent(
+                chat_id=message.chat.id,
+                user_id=message.from_user.id,
+                event_type="mute",
+                severity=2,
+            )
+        )
         await session.commit()
 
     mute_minutes = 60 if repeat_within_hour else 15
-    until = datetime.now(timezone.utc) + timedelta(minutes=mute_minutes)
+    until = now + timedelta(minutes=mute_minutes)
     permissions = ChatPermissions(can_send_messages=False)
-    await safe_call(
-        bot.restrict_chat_member(
-            settings.forum_chat_id,
-            message.from_user.id,
-            permissions=permissions,
-            until_date=until,
+    await asyncio.gather(
+        safe_call(
+            bot.restrict_chat_member(
+                settings.forum_chat_id,
+                message.from_user.id,
+                permissions=permissions,
+                until_date=until,
+            ),
+            log_ctx=f"flood mute user_id={message.from_user.id}",
         ),
-        log_ctx=f"flood mute user_id={message.from_user.id}",
+        _warn_user(message, f"слишком частые сообщения. Мут на {mute_minutes} минут.", bot),
     )
-    await _warn_user(message, f"слишком частые сообщения. Мут на {mute_minutes} минут.", bot)
-    await _store_mod_event(message.chat.id, message.from_user.id, "mute", 2)
     return True
 
 
@@ -793,13 +920,14 @@ async def _maybe_react(message: Message, bot: Bot) -> None:
         pass
 
 
-@router.message(StateFilter(None), flags={"block": False})
+# Почему: фильтр по чату стоит первым — сообщения из других чатов (личка,
+# лог-чат) отсекаются диспетчером до обращения к FSM-хранилищу и хендлеру.
+@router.message(F.chat.id == settings.forum_chat_id, StateFilter(None), flags={"block": False})
 async def moderate_message(message: Message, bot: Bot) -> None:
     """Модерация сообщений. Пропускает пользователей в FSM-состоянии (заполняют форму)."""
     moderated = await run_moderation(message, bot)
 
     # Бот НЕ комментирует и не отвечает сам — только реагирует эмодзи на
     # подходящие сообщения. Отвечает лишь когда к нему обращаются (см. help.py).
-    if message.chat.id == settings.forum_chat_id:
-        if not moderated:
-            await _maybe_react(message, bot)
+    if not moderated:
+        await _maybe_react(message, bot)
@@ -11,9 +11,13 @@ watchdog-джоба возобновляет driver после рестарта
 from __future__ import annotations
 
 import asyncio
+import heapq
 import logging
 import random
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from typing import TYPE_CHECKING
 
 from aiogram import Bot, Router
 from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
@@ -21,9 +25,14 @@ from aiogram.filters import Command
 from aiogram.types import Message
 
 from app.config import settings
-from app.db import get_session
+from app.db import get_session_ctx
 from app.services import quiz as q
-from app.services.coins import get_or_create_stats
+from app.services.coins import get_or_create_stats, get_or_create_stats_many
+from app.utils.text import plural_ru
+from app.utils.time import ensure_aware
+
+if TYPE_CHECKING:
+    from app.models import QuizQuestion
 
 logger = logging.getLogger(__name__)
 
@@ -31,20 +40,88 @@ router = Router()
 
 QUIZ_HOUR = 20  # старт в 20:00 МСК
 
-# chat-lock: сериализует приём ответов и переходы вопроса (first-wins атомарен).
-_chat_locks: dict[int, asyncio.Lock] = {}
-# Событие «на текущий вопрос ответили верно» — driver ждёт его вместо таймаута.
-_answer_events: dict[int, asyncio.Event] = {}
+
+@dataclass(slots=True)
+class _ChatSync:
+    """Примитивы синхронизации тура в одном чате.
+
+    lock — chat-lock: сериализует приём ответов и переходы вопроса (first-wins
+    атомарен). event — «на текущий вопрос ответили верно»: driver ждёт его
+    вместо таймаута. Живут и нужны всегда парой, поэтому одна запись на чат
+    вместо двух параллельных словарей с одинаковыми ключами.
+    """
+
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    event: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+_chat_sync: dict[int, _ChatSync] = {}
 # Активные driver-таски: chat_id → Task (для watchdog: возобновить после рестарта).
 _running: dict[int, asyncio.Task] = {}
+# Финиши туров, запущенные driver'ом: chat_id → Task. Отмена driver'а их не
+# прерывает (shield), поэтому stop_quiz_drivers дожидается их отдельно.
+_finishing: dict[int, asyncio.Task] = {}
+
+
+@dataclass(slots=True)
+class _LiveQuestion:
+    """Снимок текущего вопроса — то, что нужно приёму ответов без БД."""
+
+    phase: str
+    index: int
+    answer: str
+    winner_user_id: int | None
+    # Сообщение вопроса и его текст — для правки «осталось 10 секунд».
+    board_message_id: int | None = None
+    board_text: str = ""
+
+
+# Почему: on_answer видит каждое сообщение темы игр, а тур идёт раз в сутки.
+# Болтовню вне тура, неверные ответы и опоздавших отсекаем по снимку в памяти —
+# без сессии БД и без chat-lock. None — «тура нет» (тоже кэшируется). Снимок
+# обновляют все, кто пишет состояние тура; БД остаётся источником истины и
+# перечитывается под локом, когда ответ верный.
+_live: dict[int, _LiveQuestion | None] = {}
+# Идущие первичные чтения снимка: chat_id → task (см. _load_live).
+_live_loads: dict[int, asyncio.Task] = {}
+
+
+def _remember_live(chat_id: int, state: q.QuizState | None) -> None:
+    if state is None:
+        _live[chat_id] = None
+        return
+    # id сообщения с вопросом живёт только здесь (в state_json его больше нет):
+    # пока вопрос тот же, переносим его из прежнего снимка.
+    previous = _live.get(chat_id)
+    board_message_id = None
+    if previous is not None and previous.index == state.index:
+        board_message_id = previous.board_message_id
+    open_question = state.phase == "asking" and state.winner_user_id is None
+    _live[chat_id] = _LiveQuestion(
+        state.phase, state.index, state.current_answer, state.winner_user_id,
+        board_message_id, _question_text(state) if open_question else "",
+    )
+
+
+# Почему: setdefault(key, asyncio.Lock()) создавал новый Lock/Event на каждый
+# вызов, даже когда он уже есть, — а лок берётся на каждом шаге тура. Ключ —
+# chat_id (int), чатов с викториной единицы, поэтому записи не чистим: удалять
+# лок, который может кто-то ждать, опаснее, чем хранить пару объектов.
+
+
+def _sync_for(chat_id: int) -> _ChatSync:
+    sync = _chat_sync.get(chat_id)
+    if sync is None:
+        sync = _chat_sync[chat_id] = _ChatSync()
+    return sync
 
 
 def _lock_for(chat_id: int) -> asyncio.Lock:
-    return _chat_locks.setdefault(chat_id, asyncio.Lock())
+    return _sync_for(chat_id).lock
 
 
 def _event_for(chat_id: int) -> asyncio.Event:
-    return _answer_events.setdefault(chat_id, asyncio.Event())
+    return _sync_for(chat_id).event
 
 
 _INVITATIONS = (
@@ -87,12 +164,18 @@ def _in_games_topic(message: Message) -> bool:
 def _is_games_topic_answer(message: Message) -> bool:
     """Фильтр приёма ответов: срабатывает ТОЛЬКО на не-командный текст в теме
     игр. Иначе catch-all перехватил бы все сообщения форума и лишил бы
-    модерацию входящих (роутер викторины идёт до модерации)."""
-    return (
-        message.text is not None
-        and not message.text.startswith("/")
-        and _in_games_topic(message)
-    )
+    модерацию входящих (роутер викторины идёт до модерации).
+
+    Фильтр вызывается на каждое сообщение форума, поэтому первой идёт самая
+    отсекающая проверка — номер темы: сообщения других тем отбрасываются
+    одним сравнением, без разбора текста.
+    """
+    topic = settings.topic_games
+    if topic is None or message.message_thread_id != topic:
+        return False
+    if message.chat.id != settings.forum_chat_id:
+        return False
+    return (text := message.text) is not None and not text.startswith("/")
 
 
 def _display_name(message: Message) -> str | None:
@@ -126,6 +209,24 @@ async def _safe_edit(bot: Bot, message_id: int | None, text: str) -> None:
 _CORRECT_REACTIONS = ("🎉", "🏆", "⚡", "🔥", "👏")
 _WRONG_REACTION = "🤔"
 
+# Почему: на каждый неверный ответ уходил отдельный setMessageReaction —
+# десяток игроков, перебирающих варианты, выжигал лимит запросов бота в чат,
+# и под RetryAfter попадали сами вопросы. Реакции на промахи — не чаще
+# _WRONG_REACTIONS_PER_SEC в секунду на чат, остальные промахи молча.
+_WRONG_REACTIONS_PER_SEC = 3
+_wrong_reaction_window: dict[int, tuple[int, int]] = {}  # chat_id -> (секунда, сколько)
+
+
+def _wrong_reaction_allowed(chat_id: int) -> bool:
+    second = int(time.monotonic())
+    window, count = _wrong_reaction_window.get(chat_id, (second, 0))
+    if window != second:
+        count = 0
+    if count >= _WRONG_REACTIONS_PER_SEC:
+        return False
+    _wrong_reaction_window[chat_id] = (second, count + 1)
+    return True
+
 
 async def _safe_react(bot: Bot, message: Message, emoji: str) -> None:
     """Ставит эмодзи-реакцию на сообщение игрока (анимация в клиенте Telegram).
@@ -157,6 +258,14 @@ async def _send_start_animation(bot: Bot) -> None:
 # --- Тексты тура ---
 
 
+_WARN_SUFFIX = "\n\n⚡ Осталось 10 секунд!"
+# Почему: разделитель и таймер одинаковы для всех вопросов тура (как и
+# RULES_TEXT) — собираем их один раз при импорте, а не на каждое
+# сохранение/правку текста вопроса.
+_QUESTION_RULE = "\n━━━━━━━━━━━━\n"
+_QUESTION_TIMER = f" • {q.SECONDS_PER_QUESTION} сек"
+
+
 def _question_text(state: q.QuizState, *, warn: bool = False) -> str:
     num = state.index + 1
     # Знаменатель — фактический размер тура (вопрос мог быть снят при
@@ -164,13 +273,11 @@ def _question_text(state: q.QuizState, *, warn: bool = False) -> str:
     total = len(state.question_ids)
     hint = q.answer_length_hint(state.current_answer)
     text = (
-        f"❓ Вопрос {num}/{total}\n"
-        f"━━━━━━━━━━━━\n"
-        f"{state.question_text}\n\n"
-        f"💡 Ответ: {hint} • {q.SECONDS_PER_QUESTION} сек"
+        f"❓ Вопрос {num}/{total}{_QUESTION_RULE}"
+        f"{state.question_text}\n\n💡 Ответ: {hint}{_QUESTION_TIMER}"
     )
     if warn:
-        text += "\n\n⚡ Осталось 10 секунд!"
+        text += _WARN_SUFFIX
     return text
 
 
@@ -185,18 +292,27 @@ def _reveal_text(state: q.QuizState, winner_name: str | None) -> str:
     return text
 
 
+_CORRECT_FORMS = ("верный", "верных", "верных")
+
+
 def _final_text(scores: dict) -> str:
     winners, best = q.winners_from_scores(scores)
     lines = ["🏁 Викторина окончена!", "━━━━━━━━━━━━"]
     if not winners:
         lines.append("Сегодня никто не набрал очков. В следующий раз повезёт! 🍀")
         return "\n".join(lines)
-    # Итоговая таблица (топ по правильным).
-    ranked = sorted(scores.items(), key=lambda kv: int(kv[1].get("correct", 0)), reverse=True)
+    # Итоговая таблица (топ по правильным): счёт каждого достаём один раз.
+    # В таблицу идут пятеро — nlargest не сортирует всех участников тура
+    # (порядок равных тот же, что у sorted(..., reverse=True)).
+    ranked = heapq.nlargest(
+        5,
+        ((int(entry.get("correct", 0)), entry.get("name") or uid) for uid, entry in scores.items()),
+        key=lambda row: row[0],
+    )
     medals = {0: "🥇", 1: "🥈", 2: "🥉"}
-    for i, (uid, entry) in enumerate(ranked[:5]):
+    for i, (correct, name) in enumerate(ranked):
         mark = medals.get(i, f"{i + 1}.")
-        lines.append(f"{mark} {entry.get('name') or uid} — {int(entry.get('correct', 0))} верных")
+        lines.append(f"{mark} {name} — {correct} {plural_ru(correct, _CORRECT_FORMS)}")
     names = ", ".join(w[1] for w in winners)
     lines.append(f"\n🏆 Победитель тура: {names} (+{q.WINNER_BONUS} 🪙)")
     lines.append("Монеты начислены. До завтра, в 20:00! 🧠")
@@ -211,29 +327,37 @@ async def _run_quiz(bot: Bot, chat_id: int) -> None:
     берёт состояние из БД, доигрывает остаток времени по question_started_at."""
     try:
         while True:
-            async for session in get_session():
+            async with get_session_ctx() as session:
                 state = await q.load_session(session, chat_id)
                 await session.commit()
-                break
-            else:
-                return
+            _remember_live(chat_id, state)
             if state is None:
                 return
             # Финиш обрабатывает ТОЛЬКО driver и ТОЛЬКО вне лока — иначе
             # реентрантный дедлок (finish берёт тот же _lock_for).
             if state.phase == "finished":
-                await _finish_quiz(bot, chat_id)
+                # shield: отмена driver'а (остановка бота) посреди финиша не
+                # должна оставить тур без итогов — монеты, история и удаление
+                # сессии коммитятся вместе, а объявление уходит после коммита.
+                finish = _finishing.get(chat_id)
+                if finish is None:
+                    finish = asyncio.create_task(
+                        _finish_quiz(bot, chat_id), name=f"quiz-finish-{chat_id}"
+                    )
+                    _finishing[chat_id] = finish
+                    finish.add_done_callback(lambda _t: _finishing.pop(chat_id, None))
+                await asyncio.shield(finish)
                 return
 
             if state.phase == "asking":
                 # Вопрос уже забрали (гонка или возобновление после ответа) —
                 # закрываем сразу, не досиживая таймер.
                 if state.winner_user_id is not None:
-                    await _close_question(bot, chat_id)
+                    await _close_and_advance(bot, chat_id)
                     continue
                 remaining = _remaining_seconds(state)
                 if remaining <= 0:
-                    await _close_question(bot, chat_id)
+                    await _close_and_advance(bot, chat_id)
                     continue
                 # Событие чистится при ПОДГОТОВКЕ вопроса (_advance/_launch), а не
                 # здесь — иначе set() от быстрого ответа, пришедший до этого места,
@@ -249,7 +373,7 @@ async def _run_quiz(bot: Bot, chat_id: int) -> None:
                     except asyncio.TimeoutError:
                         # Анимация «финишная прямая»: дописываем предупреждение
                         # в сообщение вопроса, если его ещё никто не забрал.
-                        await _warn_last_seconds(bot, chat_id)
+                        await _warn_last_seconds(bot, chat_id, state.index)
                 if not answered:
                     try:
                         await asyncio.wait_for(
@@ -258,12 +382,11 @@ async def _run_quiz(bot: Bot, chat_id: int) -> None:
                         )
                     except asyncio.TimeoutError:
                         pass
-                await _close_question(bot, chat_id)
+                await _close_and_advance(bot, chat_id)
                 continue
 
-            if state.phase == "break":
-                await asyncio.sleep(q.BREAK_SECONDS)
-                await _advance_question(bot, chat_id)
+            if state.phase == "break":  # возобновление после рестарта в паузе
+                await _advance_question(bot, chat_id, await _break_with_prefetch(state))
                 continue
     except asyncio.CancelledError:
         raise
@@ -274,44 +397,95 @@ async def _run_quiz(bot: Bot, chat_id: int) -> None:
 
 
 def _remaining_seconds(state: q.QuizState) -> float:
+    """Остаток времени вопроса по стене часов.
+
+    Почему не monotonic: отсчёт обязан пережить рестарт бота, а question_started_at
+    хранится в state_json. Устаревшие таймеры и заявки сверяют целый индекс
+    вопроса, а не время, — здесь время нужно только для длительности ожидания.
+    """
     if not state.question_started_at:
         return q.SECONDS_PER_QUESTION
     try:
         started = datetime.fromisoformat(state.question_started_at)
     except ValueError:
         return q.SECONDS_PER_QUESTION
-    from app.utils.time import ensure_aware
     elapsed = (datetime.now(timezone.utc) - ensure_aware(started)).total_seconds()
     return max(0.0, q.SECONDS_PER_QUESTION - elapsed)
 
 
-async def _warn_last_seconds(bot: Bot, chat_id: int) -> None:
+async def _warn_last_seconds(bot: Bot, chat_id: int, index: int) -> None:
     """Дописывает «⚡ Осталось 10 секунд!» в сообщение вопроса (если он ещё
-    не взят) — живая динамика без лишних сообщений в теме."""
-    async with _lock_for(chat_id):
-        async for session in get_session():
-            state = await q.load_session(session, chat_id)
-            await session.commit()
-            break
-        else:
-            return
+    не взят) — живая динамика без лишних сообщений в теме.
+
+    index — номер вопроса, на который driver ставил таймер: если снимок уже
+    показывает другой вопрос или победителя, таймер устарел (проверка «эпохи»
+    вместо отмены таймера при каждом ответе). Текст и message_id вопроса
+    берутся из снимка — ни лока, ни БД.
+    """
+    live = _live.get(chat_id)
     if (
-        state is not None
-        and state.phase == "asking"
-        and state.winner_user_id is None
-        and state.board_message_id
+        live is None
+        or live.index != index
+        or live.phase != "asking"
+        or live.winner_user_id is not None
+        or not live.board_message_id
     ):
-        await _safe_edit(bot, state.board_message_id, _question_text(state, warn=True))
+        return
+    await _safe_edit(bot, live.board_message_id, live.board_text + _WARN_SUFFIX)
+
+
+async def _close_and_advance(bot: Bot, chat_id: int) -> None:
+    """Закрывает вопрос и после паузы сразу публикует следующий.
+
+    Почему: пауза — собственный переход driver'а, перечитывать ради неё
+    состояние из БД незачем; вся цепочка вопроса идёт в одной итерации цикла.
+    """
+    state = await _close_question(bot, chat_id)
+    if state is None or state.phase != "break":
+        return
+    await _advance_question(bot, chat_id, await _break_with_prefetch(state))
+
+
+async def _break_with_prefetch(state: q.QuizState) -> QuizQuestion | None:
+    """Выдерживает паузу, параллельно читая следующий вопрос тура.
+
+    Почему: к концу паузы вопрос уже в руках, и под локом остаётся только
+    запись состояния — между ответом и новым вопросом нет чтения из БД.
+    """
+    next_index = state.index + 1
+    if next_index >= len(state.question_ids):
+        await asyncio.sleep(q.BREAK_SECONDS)
+        return None
+    prefetch = asyncio.create_task(_load_question(state.question_ids[next_index]))
+    try:
+        await asyncio.sleep(q.BREAK_SECONDS)
+        return await prefetch
+    finally:
+        prefetch.cancel()
 
 
-async def _close_question(bot: Bot, chat_id: int) -> None:
-    """Показывает верный ответ и переводит тур в паузу или к финишу."""
+async def _load_question(question_id: int) -> QuizQuestion | None:
+    """Читает вопрос в собственной сессии; сбой — не повод ронять тур."""
+    try:
+        async with get_session_ctx() as session:
+            return await q.get_question(session, question_id)
+    except Exception:  # noqa: BLE001 — _advance_question перечитает сам
+        logger.debug("QUIZ: предзагрузка вопроса %s не удалась.", question_id, exc_info=True)
+        return None
+
+
+async def _close_question(bot: Bot, chat_id: int) -> q.QuizState | None:
+    """Показывает верный ответ и переводит тур в паузу или к финишу.
+
+    Возвращает сохранённое состояние (фаза break/finished) или None, если
+    закрывать было нечего.
+    """
     async with _lock_for(chat_id):
-        async for session in get_session():
+        async with get_session_ctx() as session:
             state = await q.load_session(session, chat_id)
             if state is None or state.phase != "asking":
                 await session.commit()
-                return
+                return None
             winner_name = None
             if state.winner_user_id is not None:
                 entry = state.scores.get(str(state.winner_user_id))
@@ -322,18 +496,23 @@ async def _close_question(bot: Bot, chat_id: int) -> None:
             state.phase = "finished" if is_last else "break"
             await q.save_session(session, chat_id, settings.topic_games, state)
             await session.commit()
-            break
-        else:
-            return
+            _remember_live(chat_id, state)
 
     await _safe_send(bot, reveal)
+    return state
 
 
-async def _advance_question(bot: Bot, chat_id: int) -> None:
+async def _advance_question(
+    bot: Bot, chat_id: int, prefetched: QuizQuestion | None = None
+) -> None:
     """Готовит следующий вопрос и публикует его. Финиш НЕ зовёт — только ставит
-    phase=finished, а driver его подхватит вне лока (иначе реентрантный дедлок)."""
+    phase=finished, а driver его подхватит вне лока (иначе реентрантный дедлок).
+
+    prefetched — вопрос, прочитанный во время паузы; берётся, только если это
+    действительно очередной вопрос тура, иначе читаем из БД как обычно.
+    """
     async with _lock_for(chat_id):
-        async for session in get_session():
+        async with get_session_ctx() as session:
             state = await q.load_session(session, chat_id)
             if state is None or state.phase != "break":
                 await session.commit()
@@ -343,8 +522,13 @@ async def _advance_question(bot: Bot, chat_id: int) -> None:
                 state.phase = "finished"
                 await q.save_session(session, chat_id, settings.topic_games, state)
                 await session.commit()
+                _remember_live(chat_id, state)
                 return
-            question = await q.get_question(session, state.question_ids[state.index])
+            question_id = state.question_ids[state.index]
+            if prefetched is not None and prefetched.id == question_id:
+                question = prefetched
+            else:
+                question = await q.get_question(session, question_id)
             if question is None:
                 # Вопрос пропал из БД (синхронизация базы во время тура) —
                 # вычёркиваем из списка, НЕ съедая номер: нумерация остаётся
@@ -353,6 +537,7 @@ async def _advance_question(bot: Bot, chat_id: int) -> None:
                 state.index -= 1  # следующий заход возьмёт этот же индекс
                 await q.save_session(session, chat_id, settings.topic_games, state)
                 await session.commit()
+                _remember_live(chat_id, state)
                 return
             state.phase = "asking"
             state.current_answer = question.answer
@@ -363,31 +548,30 @@ async def _advance_question(bot: Bot, chat_id: int) -> None:
             _event_for(chat_id).clear()  # свежее событие под новый вопрос
             await q.save_session(session, chat_id, settings.topic_games, state)
             await session.commit()
-            text = _question_text(state)
-            break
-        else:
-            return
+            _remember_live(chat_id, state)
+            text, index = _question_text(state), state.index
     msg = await _safe_send(bot, text)
     if msg is not None:
-        await _remember_question_message(chat_id, msg.message_id)
+        _remember_question_message(chat_id, index, msg.message_id)
 
 
-async def _remember_question_message(chat_id: int, message_id: int) -> None:
-    """Сохраняет message_id вопроса в состоянии — для предупреждения за 10 сек."""
-    async with _lock_for(chat_id):
-        async for session in get_session():
-            state = await q.load_session(session, chat_id)
-            if state is not None and state.phase == "asking":
-                state.board_message_id = message_id
-                await q.save_session(session, chat_id, settings.topic_games, state)
-            await session.commit()
-            return
+def _remember_question_message(chat_id: int, index: int, message_id: int) -> None:
+    """Запоминает message_id вопроса в снимке — для предупреждения за 10 сек.
+
+    Почему: раньше это была отдельная транзакция (лок, чтение и запись
+    QuizSession) на каждый вопрос сразу после публикации. Предупреждение —
+    украшение, после рестарта без него можно обойтись, поэтому id живёт в
+    памяти, и на вопрос приходится одна запись состояния вместо двух.
+    """
+    live = _live.get(chat_id)
+    if live is not None and live.index == index:
+        live.board_message_id = message_id
 
 
 async def _finish_quiz(bot: Bot, chat_id: int) -> None:
     """Начисляет монеты победителям, пишет историю, публикует итоги."""
     async with _lock_for(chat_id):
-        async for session in get_session():
+        async with get_session_ctx() as session:
             state = await q.load_session(session, chat_id)
             if state is None:
                 await session.commit()
@@ -395,11 +579,10 @@ async def _finish_quiz(bot: Bot, chat_id: int) -> None:
             winners, best = q.winners_from_scores(state.scores)
             winner_ids = {w[0] for w in winners}
             # Бонус победителям (монеты за верные ответы уже начислены по ходу тура).
-            for uid in winner_ids:
-                entry = state.scores.get(str(uid))
-                stats = await get_or_create_stats(
-                    session, uid, chat_id, display_name=entry.get("name") if entry else None
-                )
+            names = {
+                uid: (state.scores.get(str(uid)) or {}).get("name") for uid in winner_ids
+            }
+            for stats in (await get_or_create_stats_many(session, chat_id, names)).values():
                 stats.coins += q.WINNER_BONUS
             await q.record_round(
                 session, chat_id=chat_id, scores=state.scores,
@@ -408,9 +591,8 @@ async def _finish_quiz(bot: Bot, chat_id: int) -> None:
             final = _final_text(state.scores)
             await q.delete_session(session, chat_id)
             await session.commit()
-            break
-        else:
-            return
+            _remember_live(chat_id, None)
+            _top_cache.pop(chat_id, None)
     await _safe_send(bot, final)
 
 
@@ -420,7 +602,7 @@ async def _finish_quiz(bot: Bot, chat_id: int) -> None:
 async def _launch_quiz(bot: Bot, chat_id: int) -> str | None:
     """Создаёт сессию и публикует первый вопрос. Возврат — причина отказа или None."""
     async with _lock_for(chat_id):
-        async for session in get_session():
+        async with get_session_ctx() as session:
             existing = await q.load_session(session, chat_id)
             if existing is not None and existing.phase != "finished":
                 await session.commit()
@@ -444,10 +626,8 @@ async def _launch_quiz(bot: Bot, chat_id: int) -> str | None:
             _event_for(chat_id).clear()  # свежее событие под первый вопрос
             await q.save_session(session, chat_id, settings.topic_games, state)
             await session.commit()
-            text = _question_text(state)
-            break
-        else:
-            return "Не удалось открыть сессию."
+            _remember_live(chat_id, state)
+            text, index = _question_text(state), state.index
 
     intro = (
         "🧠 Викторина начинается!\n"
@@ -458,7 +638,7 @@ async def _launch_quiz(bot: Bot, chat_id: int) -> str | None:
     await _safe_send(bot, intro)
     msg = await _safe_send(bot, text)
     if msg is not None:
-        await _remember_question_message(chat_id, msg.message_id)
+        _remember_question_message(chat_id, index, msg.message_id)
     _start_driver(bot, chat_id)
     return None
 
@@ -468,58 +648,130 @@ def _start_driver(bot: Bot, chat_id: int) -> None:
     task = _running.get(chat_id)
     if task is not None and not task.done():
         return
-    _running[chat_id] = asyncio.create_task(_run_quiz(bot, chat_id))
+    _running[chat_id] = asyncio.create_task(
+        _run_quiz(bot, chat_id), name=f"quiz-driver-{chat_id}"
+    )
+
+
+async def stop_quiz_drivers() -> None:
+    """Останавливает driver'ы туров при выключении бота и дожидается их.
+
+    Почему: иначе незавершённые таски гасит уже закрывающийся цикл событий,
+    поверх закрытой сессии бота. Состояние тура в БД, и после рестарта
+    watchdog возобновит его с того же места. Начатый финиш не отменяется:
+    отменённый driver бросает его под shield, и без ожидания здесь итоги
+    уходили бы уже в закрытую сессию бота.
+    """
+    tasks = [task for task in _running.values() if not task.done()]
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+    finishing = list(_finishing.values())
+    if finishing:
+        await asyncio.gather(*finishing, return_exceptions=True)
 
 
 # --- Приём ответов (обычные сообщения в теме игр) ---
 
 
-@router.message(_is_games_topic_answer)
-async def on_answer(message: Message, bot: Bot) -> None:
-    if message.from_user is None:
-        return
-    text = message.text or ""
-    user_id = message.from_user.id
-    chat_id = message.chat.id
-    outcome: str | None = None  # correct | wrong (для реакции вне лока)
+async def _read_live(chat_id: int) -> None:
+    async with get_session_ctx() as session:
+        loaded = await q.load_session(session, chat_id)
+        await session.commit()
+    _remember_live(chat_id, loaded)
+
+
+async def _load_live(chat_id: int) -> None:
+    """Первичное чтение снимка — одно на чат, сколько бы сообщений ни ждало.
+
+    Почему: после рестарта в теме игр разом приходит пачка сообщений, и
+    каждое, не найдя снимка, открывало бы свою сессию. Первое запускает
+    чтение, остальные ждут его же результата. shield — чтобы отмена одного
+    хендлера не обрывала чтение, которого ждут другие.
+    """
+    task = _live_loads.get(chat_id)
+    if task is None:
+        task = _live_loads[chat_id] = asyncio.ensure_future(_read_live(chat_id))
+        task.add_done_callback(lambda _: _live_loads.pop(chat_id, None))
+    await asyncio.shield(task)
 
+
+def _release_claim(chat_id: int, live: _LiveQuestion, user_id: int) -> None:
+    """Снимает заявку из снимка, если запись победителя в БД не состоялась."""
+    if _live.get(chat_id) is live and live.winner_user_id == user_id:
+        live.winner_user_id = None
+
+
+async def _claim_question(message: Message, chat_id: int, user_id: int, index: int) -> bool:
+    """Фиксирует победителя вопроса в БД. False — вопрос уже закрыт или сменён."""
     async with _lock_for(chat_id):
-        async for session in get_session():
+        async with get_session_ctx() as session:
             state = await q.load_session(session, chat_id)
-            if state is None or state.phase != "asking":
+            # Под локом перепроверяем по БД: пока ждали лок, driver мог
+            # закрыть вопрос или перейти к следующему.
+            if (
+                state is None
+                or state.phase != "asking"
+                or state.winner_user_id is not None
+                or state.index != index
+            ):
                 await session.commit()
-                return
-            if state.winner_user_id is not None:
-                await session.commit()  # вопрос уже забрали — молча игнор
-                return
-            if not q.check_answer(state.current_answer, text):
-                await session.commit()  # неверно — попытку НЕ жжём (фикс старой версии)
-                outcome = "wrong"
-                break
-            # Первый верный: фиксируем победителя, начисляем монеты, будим driver.
+                _remember_live(chat_id, state)
+                return False
+            # Первый верный: фиксируем победителя, начисляем монеты.
             name = _display_name(message)
             state.winner_user_id = user_id
-            key = str(user_id)
-            entry = state.scores.get(key, {"name": name, "correct": 0})
-            entry["name"] = name or entry.get("name")
+            entry = state.scores.setdefault(str(user_id), {"name": name, "correct": 0})
+            if name:
+                entry["name"] = name
             entry["correct"] = int(entry.get("correct", 0)) + 1
-            state.scores[key] = entry
             stats = await get_or_create_stats(session, user_id, chat_id, display_name=name)
             stats.coins += q.COINS_PER_CORRECT
             await q.save_session(session, chat_id, settings.topic_games, state)
             await session.commit()
-            outcome = "correct"
-            break
-        else:
-            return
+            _remember_live(chat_id, state)
+    return True
+
+
+@router.message(_is_games_topic_answer)
+async def on_answer(message: Message, bot: Bot) -> None:
+    if (user := message.from_user) is None:
+        return
+    text = message.text or ""
+    user_id = user.id
+    chat_id = message.chat.id
+
+    if chat_id not in _live:
+        # Снимка ещё нет (первое сообщение после рестарта) — читаем БД один раз.
+        await _load_live(chat_id)
+    live = _live[chat_id]
+    if live is None or live.phase != "asking" or live.winner_user_id is not None:
+        return  # тура нет, пауза или вопрос уже забрали — молча игнор
+    if not q.check_answer(live.answer, text):
+        # Неверно — попытку НЕ жжём (фикс старой версии); ни БД, ни лока.
+        if _wrong_reaction_allowed(chat_id):
+            await _safe_react(bot, message, _WRONG_REACTION)
+        return
 
-    # Реакции и пробуждение driver'а — вне лока (Telegram-вызовы под локом
+    # Заявка на вопрос — прямо в снимке: между проверкой выше и этой строкой
+    # нет await, так что в одном event loop она атомарна. Одновременные верные
+    # ответы уходят на проверке winner_user_id, не выстраиваясь в очередь на
+    # лок; под локом остаётся единственный писатель — заявивший победитель.
+    live.winner_user_id = user_id
+    try:
+        won = await _claim_question(message, chat_id, user_id, live.index)
+    except BaseException:
+        _release_claim(chat_id, live, user_id)
+        raise
+    if not won:
+        _release_claim(chat_id, live, user_id)
+        return
+
+    # Реакция и пробуждение driver'а — вне лока (Telegram-вызовы под локом
     # тормозили бы приём других ответов; см. вечер флуд-контроля блэкджека).
-    if outcome == "correct":
-        _event_for(chat_id).set()  # driver прекращает ждать и закрывает вопрос
-        await _safe_react(bot, message, random.choice(_CORRECT_REACTIONS))
-    elif outcome == "wrong":
-        await _safe_react(bot, message, _WRONG_REACTION)
+    _event_for(chat_id).set()  # driver прекращает ждать и закрывает вопрос
+    await _safe_react(bot, message, random.choice(_CORRECT_REACTIONS))
 
 
 # --- Команды ---
@@ -532,34 +784,51 @@ async def cmd_rules(message: Message) -> None:
     await message.reply(RULES_TEXT)
 
 
-@router.message(Command("викторина_топ", "quiz_top"))
-async def cmd_top(message: Message) -> None:
-    if not _in_games_topic(message):
-        return
-    async for session in get_session():
-        rows = await q.get_alltime_leaderboard(session, message.chat.id)
+# Топ за всё время меняется только в конце тура (record_round), а _finish_quiz
+# сбрасывает запись, поэтому повторные /викторина_топ отдаём из памяти уже
+# готовым текстом. TTL — лишь страховка от ручных правок истории в БД.
+_TOP_CACHE_TTL_SEC = 600.0
+_top_cache: dict[int, tuple[float, str]] = {}
+
+
+async def _cached_top_text(chat_id: int) -> str:
+    now = time.monotonic()
+    hit = _top_cache.get(chat_id)
+    if hit is not None and now - hit[0] < _TOP_CACHE_TTL_SEC:
+        return hit[1]
+    async with get_session_ctx() as session:
+        rows = await q.get_alltime_leaderboard(session, chat_id)
         await session.commit()
-        break
-    else:
-        return
+    text = _top_text(rows)
+    _top_cache[chat_id] = (now, text)
+    return text
+
+
+def _top_text(rows: list[tuple[str, int, int]]) -> str:
     if not rows:
-        await message.reply("Пока нет сыгранных викторин. Первая — сегодня в 20:00!")
-        return
+        return "Пока нет сыгранных викторин. Первая — сегодня в 20:00!"
     lines = ["🧠 Знатоки викторины (за всё время)", "━━━━━━━━━━━━"]
     medals = {0: "🥇", 1: "🥈", 2: "🥉"}
     for i, (name, correct, wins) in enumerate(rows):
         mark = medals.get(i, f"{i + 1}.")
-        lines.append(f"{mark} {name} — {correct} верных, побед {wins}")
-    await message.reply("\n".join(lines))
+        lines.append(f"{mark} {name} — {correct} {plural_ru(correct, _CORRECT_FORMS)}, побед {wins}")
+    return "\n".join(lines)
+
+
+@router.message(Command("викторина_топ", "quiz_top"))
+async def cmd_top(message: Message) -> None:
+    if not _in_games_topic(message):
+        return
+    await message.reply(await _cached_top_text(message.chat.id))
 
 
 @router.message(Command("quiz_start"))
 async def cmd_quiz_start(message: Message, bot: Bot) -> None:
     """Ручной старт (админ, в теме игр) — на случай теста или пропуска автозапуска."""
-    from app.utils.admin import is_admin
+    from app.utils.admin import is_admin_cached
     if not _in_games_topic(message) or message.from_user is None:
         return
-    if not await is_admin(bot, settings.forum_chat_id, message.from_user.id):
+    if not await is_admin_cached(bot, settings.forum_chat_id, message.from_user.id):
         return
     reason = await _launch_quiz(bot, message.chat.id)
     if reason:
@@ -573,28 +842,25 @@ _EXHAUSTED_FLAG = "quiz_bank_exhausted"
 
 async def _bank_is_exhausted() -> bool:
     """True, если свежих вопросов меньше, чем нужно на тур."""
-    async for session in get_session():
+    async with get_session_ctx() as session:
         fresh = await q.count_fresh_questions(session)
         await session.commit()
-        return fresh < q.QUESTIONS_PER_ROUND
-    return True
+    return fresh < q.QUESTIONS_PER_ROUND
 
 
 async def _exhausted_already_announced() -> bool:
     from app.models import MigrationFlag
-    async for session in get_session():
+    async with get_session_ctx() as session:
         flag = await session.get(MigrationFlag, _EXHAUSTED_FLAG)
         await session.commit()
-        return flag is not None
-    return True
+    return flag is not None
 
 
 async def _mark_exhausted_announced() -> None:
     from app.models import MigrationFlag
-    async for session in get_session():
+    async with get_session_ctx() as session:
         session.add(MigrationFlag(key=_EXHAUSTED_FLAG))
         await session.commit()
-        return
 
 
 # --- Scheduler-джобы ---
@@ -613,6 +879,13 @@ async def announce_quiz_soon(bot: Bot) -> None:
         logger.warning("QUIZ: анонс не отправился.", exc_info=True)
 
 
+async def _notify_admins(bot: Bot, text: str) -> None:
+    try:
+        await bot.send_message(settings.admin_log_chat_id, text)
+    except (TelegramBadRequest, TelegramRetryAfter):
+        pass
+
+
 async def start_quiz_auto(bot: Bot) -> None:
     """20:00 ежедневно: автозапуск тура.
 
@@ -626,31 +899,25 @@ async def start_quiz_auto(bot: Bot) -> None:
         if await _bank_is_exhausted():
             if not await _exhausted_already_announced():
                 await _mark_exhausted_announced()
-                try:
-                    await bot.send_message(
-                        settings.admin_log_chat_id,
+                # Сообщения в разные чаты друг от друга не зависят — шлём разом.
+                await asyncio.gather(
+                    _notify_admins(
+                        bot,
                         "🏁 База вопросов викторины полностью исчерпана — все вопросы "
                         "заданы, викторина закрыта.\nЧтобы возобновить: добавь вопросы "
                         "(xlsx → scripts/import_quiz_xlsx) и задеплой.",
-                    )
-                except (TelegramBadRequest, TelegramRetryAfter):
-                    pass
-                await _safe_send(
-                    bot,
-                    "🏁 Викторина сыграла все свои вопросы — спасибо, знатоки!\n"
-                    "Вернёмся с новой базой. Следите за анонсами 🧠",
+                    ),
+                    _safe_send(
+                        bot,
+                        "🏁 Викторина сыграла все свои вопросы — спасибо, знатоки!\n"
+                        "Вернёмся с новой базой. Следите за анонсами 🧠",
+                    ),
                 )
             return
         reason = await _launch_quiz(bot, settings.forum_chat_id)
         if reason:
             logger.warning("QUIZ: автозапуск пропущен — %s", reason)
-            try:
-                await bot.send_message(
-                    settings.admin_log_chat_id,
-                    f"⚠️ Викторина в 20:00 не запустилась: {reason}",
-                )
-            except (TelegramBadRequest, TelegramRetryAfter):
-                pass
+            await _notify_admins(bot, f"⚠️ Викторина в 20:00 не запустилась: {reason}")
     except Exception:
         logger.warning("QUIZ: автозапуск упал.", exc_info=True)
 
@@ -661,24 +928,18 @@ async def quiz_watchdog(bot: Bot) -> None:
     if settings.topic_games is None:
         return
     try:
-        async for session in get_session():
+        async with get_session_ctx() as session:
             active = await q.get_active_chat_ids(session)
             await session.commit()
-            break
-        else:
-            return
         now = datetime.now(timezone.utc)
         for chat_id, _topic in active:
             task = _running.get(chat_id)
             if task is not None and not task.done():
                 continue  # driver жив
             # Проверяем свежесть; зависшую (>10 мин без прогресса) — закрываем.
-            async for session in get_session():
+            async with get_session_ctx() as session:
                 state = await q.load_session(session, chat_id)
                 await session.commit()
-                break
-            else:
-                continue
             if state is None:
                 continue
             if state.phase == "finished" or state.is_stale(now):
@@ -4,13 +4,16 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import ssl
 from logging.handlers import RotatingFileHandler
 from collections.abc import Awaitable, Callable
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
+import certifi
 from aiogram import BaseMiddleware, Bot, Dispatcher
+from aiogram import __version__ as aiogram_version
 from aiogram.client.session.aiohttp import AiohttpSession
 from aiogram.exceptions import (
     TelegramAPIError,
@@ -29,9 +32,11 @@ from aiogram.types import (
     TelegramObject,
     Update,
 )
+from aiohttp import ClientSession, TCPConnector
+from aiohttp.hdrs import USER_AGENT
+from aiohttp.http import SERVER_SOFTWARE
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from sqlalchemy import Integer, inspect, text, update
-from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
 from app.config import settings
@@ -48,10 +53,16 @@ from app.handlers import (
     text_publish,
 )
 from app.models import MigrationFlag, UserStat
-from app.services.topic_stats import bump_topic_stat
+from app.services.topic_stats import (
+    TOPIC_STATS_FLUSH_INTERVAL_SEC,
+    flush_topic_stats,
+    record_topic_message,
+)
+from app.services.message_log import flush_message_log, run_message_log_flusher
 from app.services.health import get_health_state, update_heartbeat, update_notice
 from app.services.db_maintenance import cleanup_old_data, optimize_sqlite
-from app.utils.time import now_tz
+from app.utils.tasks import spawn_background
+from app.utils.time import today_key
 from app.services.ai_module import clear_assistant_cache, close_ai_client, get_ai_client, set_ai_admin_notifier
 from app.services.backup import send_db_backup
 from app.services.daily_report import send_daily_report
@@ -109,43 +120,90 @@ class LoggingMiddleware(BaseMiddleware):
     ) -> Any:
         if isinstance(event, Update) and event.message:
             msg = event.message
-            user = msg.from_user
-            user_info = f"{user.full_name} (id={user.id})" if user else "unknown"
-            text = msg.text or msg.caption or "[no text]"
-            logger.info(
-                f"IN: chat={msg.chat.id} topic={msg.message_thread_id} "
-                f"user={user_info} text={text[:100]!r}"
-            )
+            # Почему: middleware стоит на каждом апдейте, а f-строка собиралась
+            # до logger.info даже при выключенном INFO. Ленивые %-аргументы
+            # форматируются только если запись действительно пишется.
+            if logger.isEnabledFor(logging.INFO):
+                user = msg.from_user
+                text = msg.text or msg.caption or "[no text]"
+                logger.info(
+                    "IN: chat=%s topic=%s user=%s text=%r",
+                    msg.chat.id,
+                    msg.message_thread_id,
+                    f"{user.full_name} (id={user.id})" if user else "unknown",
+                    text[:100],
+                )
             # Сбор статистики по топикам (не блокирует хендлеры)
             if (
                 msg.chat.id == settings.forum_chat_id
                 and msg.message_thread_id is not None
                 and msg.text
             ):
-                date_key = now_tz().date().isoformat()
-                async for session in get_session():
-                    try:
-                        await bump_topic_stat(
-                            session,
-                            settings.forum_chat_id,
-                            msg.message_thread_id,
-                            date_key,
-                            msg.text,
-                        )
-                        await session.commit()
-                    except OperationalError as exc:
-                        logger.warning("Не удалось обновить статистику тем: %s", exc)
-                        await session.rollback()
+                record_topic_message(
+                    settings.forum_chat_id,
+                    msg.message_thread_id,
+                    today_key(),
+                    msg.text,
+                )
         return await handler(event, data)
 
 
 MAX_RETRIES_ON_FLOOD = 3
 MAX_RETRIES_ON_NETWORK = 3
 NETWORK_RETRY_BACKOFF = (1.0, 2.0, 4.0)
+TG_KEEPALIVE_SECONDS = 75
+TG_CONNECTION_LIMIT = 100
+
+try:
+    import orjson
+except ImportError:  # без orjson работает stdlib json
+    orjson = None
+
+
+def _orjson_dumps(value: Any) -> str:
+    return orjson.dumps(value).decode()
+
 
 class RetryOnFloodSession(AiohttpSession):
     """Повторяет запросы при флуд-контроле и сетевых сбоях Telegram."""
 
+    def __init__(self, **kwargs: Any) -> None:
+        # Почему: каждый send_message и каждый апдейт проходят через
+        # json.dumps/json.loads сессии; orjson делает это в разы быстрее.
+        # Пакет опционален — без него остаются дефолты aiogram.
+        if orjson is not None:
+            kwargs.setdefault("json_loads", orjson.loads)
+            kwargs.setdefault("json_dumps", _orjson_dumps)
+        super().__init__(**kwargs)
+        self._tg_session: ClientSession | None = None
+
+    async def create_session(self) -> ClientSession:
+        # Почему: все запросы идут на один хост api.telegram.org. Дефолтные 15 с
+        # keep-alive aiohttp рвут простаивающее TLS-соединение между всплесками,
+        # и пара «предупреждение + лог админам» снова платит за рукопожатие.
+        # HTTP/2 aiohttp не поддерживает — держим пул HTTP/1.1 соединений тёплым.
+        # С прокси коннектор собирает aiogram — его настройки не трогаем.
+        if self.proxy is not None:
+            return await super().create_session()
+        if self._tg_session is None or self._tg_session.closed:
+            self._tg_session = ClientSession(
+                connector=TCPConnector(
+                    ssl=ssl.create_default_context(cafile=certifi.where()),
+                    limit=TG_CONNECTION_LIMIT,
+                    limit_per_host=TG_CONNECTION_LIMIT,
+                    keepalive_timeout=TG_KEEPALIVE_SECONDS,
+                ),
+                headers={USER_AGENT: f"{SERVER_SOFTWARE} aiogram/{aiogram_version}"},
+            )
+        return self._tg_session
+
+    async def close(self) -> None:
+        if self._tg_session is not None and not self._tg_session.closed:
+            await self._tg_session.close()
+            # Как и aiogram: даём SSL-соединениям закрыться корректно.
+            await asyncio.sleep(0.25)
+        await super().close()
+
     async def make_request(
         self,
         bot: Bot,
@@ -505,19 +563,6 @@ async def _sync_places_from_sheets() -> None:
         logger.exception("Ошибка импорта инфраструктуры из Google Sheets.")
 
 
-def _run_background_task(coro: Awaitable[None], *, name: str) -> None:
-    """Запускает фоновую задачу и логирует исключения без падения процесса."""
-    task = asyncio.create_task(coro, name=name)
-
-    def _on_done(done_task: asyncio.Task[None]) -> None:
-        try:
-            done_task.result()
-        except Exception:
-            logger.exception("Фоновая задача %s завершилась с ошибкой.", name)
-
-    task.add_done_callback(_on_done)
-
-
 def _cleanup_flood_tracker() -> None:
     """Периодическая очистка FloodTracker от устаревших записей."""
     from app.handlers.moderation import FLOOD_TRACKER
@@ -532,6 +577,7 @@ async def schedule_jobs(bot: Bot) -> AsyncIOScheduler:
         heartbeat_job, "interval", minutes=HEARTBEAT_INTERVAL_MIN, args=[bot]
     )
     scheduler.add_job(_cleanup_flood_tracker, "interval", minutes=10)
+    scheduler.add_job(flush_topic_stats, "interval", seconds=TOPIC_STATS_FLUSH_INTERVAL_SEC)
     scheduler.add_job(
         cleanup_database,
         "cron",
@@ -745,10 +791,10 @@ async def on_startup_warmup(bot: Bot) -> None:
             logger.exception("Ошибка при проверке БД (некритично).")
         await cleanup_database()
 
-    _run_background_task(_bg_validate_and_cleanup(), name="startup_validate_cleanup")
+    spawn_background(_bg_validate_and_cleanup(), name="startup_validate_cleanup")
 
     # ── Heartbeat — в фон, не блокируем старт ───────────────────────────────
-    _run_background_task(heartbeat_job(bot), name="startup_heartbeat")
+    spawn_background(heartbeat_job(bot), name="startup_heartbeat")
 
     # ── Команды бота в меню Telegram — оба вызова параллельно ────────────────
     _step_t = _time.monotonic()
@@ -862,7 +908,7 @@ async def on_startup_warmup(bot: Bot) -> None:
     logger.info("⏱ seed_quiz: %.2fs", _time.monotonic() - _step_t)
 
     # ── Google Sheets — в фон ────────────────────────────────────────────────
-    _run_background_task(_sync_places_from_sheets(), name="startup_sync_places")
+    spawn_background(_sync_places_from_sheets(), name="startup_sync_places")
 
     # ── AI клиент + probe ────────────────────────────────────────────────────
     _step_t = _time.monotonic()
@@ -953,7 +999,7 @@ def _should_notify_error(signature: str) -> bool:
 async def error_handler(event: ErrorEvent) -> bool:
     """Глобальный обработчик ошибок — логирует и отправляет в админ-чат."""
     exc = event.exception
-    logger.exception(f"Ошибка: {exc}")
+    logger.exception("Ошибка: %s", exc)
 
     # Сетевые сбои Telegram обычно транзиентные (таймаут, обрыв соединения).
     # Мы их уже ретраем в RetryOnFloodSession, поэтому в админ-чат отправляем
@@ -1056,7 +1102,8 @@ async def main() -> None:
         scheduler = await schedule_jobs(bot)
         # Всё остальное — probes, seed, set_commands, AI probe, стартовое уведомление —
         # в фон, чтобы polling начал принимать сообщения немедленно.
-        _run_background_task(on_startup_warmup(bot), name="startup_warmup")
+        spawn_background(on_startup_warmup(bot), name="startup_warmup")
+        spawn_background(run_message_log_flusher(), name="message_log_flusher")
         polling_attempt = 0
         while True:
             try:
@@ -1109,9 +1156,23 @@ async def main() -> None:
         # укладывался в stop_grace_period и не получал SIGKILL.
         if scheduler is not None:
             scheduler.shutdown(wait=False)
+        await quiz_handler.stop_quiz_drivers()
+        await flush_message_log()
+        await flush_topic_stats()
         await close_ai_client()
         await bot.session.close()
 
 
+def _install_uvloop() -> None:
+    """Ставит uvloop, если он установлен: цикл событий на libuv дешевле
+    стандартного на каждом сетевом вызове. Без пакета — обычный asyncio."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
 if __name__ == "__main__":
+    _install_uvloop()
     asyncio.run(main())
@@ -23,8 +23,12 @@ from app.services.ai_usage import add_tokens, add_usage, get_usage_stats, try_re
 from app.services.faq import get_faq_answer
 from app.services.resident_kb import build_resident_answer, build_resident_context, search_resident_kb
 from app.services.web_search import format_search_context, search_duckduckgo, should_search_web
+from app.utils.cache import remember_bounded
+from app.utils.profanity import compile_profanity_pattern
 from app.utils.profanity import reload_profanity_runtime as reload_profanity_runtime_dict
-from app.utils.time import now_tz
+from app.utils.tasks import spawn_background
+from app.utils.time import today_key
+from app.utils.text import pick_other
 
 logger = logging.getLogger(__name__)
 
@@ -602,18 +606,6 @@ _UNGROUNDED_REPLIES = (
     "Не уверен и не хочу гадать — таких данных у меня нет.",
 )
 
-# Ссылки на фоновые задачи (fire-and-forget): без сильной ссылки GC может
-# собрать задачу до завершения — asyncio держит на неё лишь слабую ссылку.
-_BACKGROUND_TASKS: set[asyncio.Task] = set()
-
-
-def _spawn_background(coro) -> None:
-    """Запускает корутину в фоне, удерживая ссылку до её завершения."""
-    task = asyncio.get_running_loop().create_task(coro)
-    _BACKGROUND_TASKS.add(task)
-    task.add_done_callback(_BACKGROUND_TASKS.discard)
-
-
 # Служебные обёртки промпта из хендлера (help.py): контекст темы и пометки
 # диалога. Для лога «не знаю»-вопросов нужен чистый вопрос жителя, иначе в
 # дайджест и ключ дедупликации попадёт весь преамбул с чужими репликами.
@@ -642,7 +634,9 @@ def _strip_prompt_scaffolding(text: str) -> str:
 
 
 # Последний использованный style-hint per (chat_id, user_id) — чтобы не повторялся подряд.
+# Ограничен по размеру через remember_bounded: лишний — самый давний.
 _LAST_STYLE_HINT_BY_USER: dict[tuple[int, int], str] = {}
+_LAST_STYLE_HINT_MAX = 4096
 
 # Жалоба/авария/эмоция — юмор неуместен, нужна эмпатия и конкретика.
 _COMPLAINT_PATTERNS = re.compile(
@@ -691,9 +685,8 @@ def _pick_style_hint(prompt: str, *, has_factual_context: bool, chat_id: int, us
         pool = _STYLE_HINTS_NEUTRAL
     key = (chat_id or 0, user_id or 0)
     prev = _LAST_STYLE_HINT_BY_USER.get(key)
-    candidates = [h for h in pool if h != prev] or list(pool)
-    chosen = random.choice(candidates)
-    _LAST_STYLE_HINT_BY_USER[key] = chosen
+    chosen = pick_other(pool, prev)
+    remember_bounded(_LAST_STYLE_HINT_BY_USER, key, chosen, _LAST_STYLE_HINT_MAX)
     return chosen
 
 
@@ -921,6 +914,10 @@ _LATIN_TO_CYR = str.maketrans({
     "y": "у",
 })
 _DIGIT_TO_CYR = str.maketrans({"0": "о", "1": "и", "3": "з", "4": "ч", "6": "б"})
+# Почему: ё→е, латиница и цифры заменяются одним проходом translate вместо
+# трёх — таблицы не пересекаются, результат тот же.
+_PROFANITY_TRANSLATE = {ord("ё"): "е", **_LATIN_TO_CYR, **_DIGIT_TO_CYR}
+_PROFANITY_STRIP_RE = re.compile(r"[^а-яa-z0-9\s]+")
 
 PHONE_RE = re.compile(r"(?:\+7|8)\d{10}")
 EMAIL_RE = re.compile(r"[\w.+-]+@[\w.-]+\.[A-Za-z]{2,}")
@@ -1437,7 +1434,7 @@ class AnthropicProvider:
             # админам (fire-and-forget — ответ жителю не ждёт записи в БД).
             try:
                 from app.services.unanswered import log_unanswered
-                _spawn_background(log_unanswered(chat_id, clean_question))
+                spawn_background(log_unanswered(chat_id, clean_question))
             except Exception:
                 pass
             return random.choice(_UNGROUNDED_REPLIES)
@@ -1819,7 +1816,6 @@ def _has_aggressive_target(text: str) -> bool:
 
 
 def local_moderation(text: str) -> ModerationDecision:
-    normalized = normalize_for_profanity(text)
     lowered = text.lower()
     aggression_level = detect_aggression_level(text)
 
@@ -1827,7 +1823,7 @@ def local_moderation(text: str) -> ModerationDecision:
     if any(pattern in lowered for pattern in _RUDE_PATTERNS):
         return ModerationDecision("aggression", 3, 0.9, "delete_strike", False)
 
-    has_profanity = detect_profanity(normalized)
+    has_profanity = text_has_profanity(text)
     has_insult = any(pattern in lowered for pattern in _AGGRESSIVE_INSULT_PATTERNS)
     has_soft_aggression = any(pattern in lowered for pattern in _SOFT_AGGRESSION_PATTERNS)
     has_target = _has_aggressive_target(text)
@@ -1864,24 +1860,32 @@ def local_moderation(text: str) -> ModerationDecision:
 
 
 def normalize_for_profanity(text: str) -> str:
-    lowered = text.lower().replace("ё", "е")
-    lowered = lowered.translate(_LATIN_TO_CYR).translate(_DIGIT_TO_CYR)
-    lowered = re.sub(r"[^а-яa-z0-9\s]+", "", lowered)
+    lowered = _PROFANITY_STRIP_RE.sub("", text.lower().translate(_PROFANITY_TRANSLATE))
     return " ".join(lowered.split())
 
 
 def detect_profanity(normalized: str) -> bool:
-    if not normalized:
+    if len(normalized) < _PROFANITY_MIN_LEN:
         return False
 
-    for word in normalized.split():
-        if word in _PROFANITY_RUNTIME["exceptions"]:
-            continue
-        if word in _PROFANITY_RUNTIME["exact"]:
-            return True
-        if any(word.startswith(prefix) for prefix in _PROFANITY_RUNTIME["prefixes"]):
-            return True
-    return False
+    pattern = _PROFANITY_PATTERN
+    if pattern is None:
+        return False
+    # Совпадение — целое слово: точное или начинающееся с префикса из словаря.
+    exceptions = _PROFANITY_RUNTIME["exceptions"]
+    return any(match.group() not in exceptions for match in pattern.finditer(normalized))
+
+
+def text_has_profanity(text: str) -> bool:
+    """Нормализует и проверяет текст, пропуская заведомо короткие сообщения.
+
+    Почему: нормализация не удлиняет текст, поэтому сообщение короче самого
+    короткого слова словаря («ок», «да») матом быть не может — не тратим на
+    него translate/regex.
+    """
+    if len(text) < _PROFANITY_MIN_LEN:
+        return False
+    return detect_profanity(normalize_for_profanity(text))
 
 
 def detect_aggression_level(text: str) -> Literal["low", "high"]:
@@ -1891,7 +1895,7 @@ def detect_aggression_level(text: str) -> Literal["low", "high"]:
     has_insult = any(pattern in lowered for pattern in _AGGRESSIVE_INSULT_PATTERNS)
     has_soft_aggression = any(pattern in lowered for pattern in _SOFT_AGGRESSION_PATTERNS)
     has_target = _has_aggressive_target(text)
-    has_profanity = detect_profanity(normalize_for_profanity(text))
+    has_profanity = text_has_profanity(text)
 
     if has_threat or (has_insult and has_target and has_profanity):
         return "high"
@@ -2562,13 +2566,20 @@ _ADMIN_ALERT_NOTIFIER: Callable[[str], Awaitable[None]] | None = None
 _LAST_ERROR: str | None = None
 _LAST_ERROR_AT: datetime | None = None
 _PROFANITY_RUNTIME: dict[str, set[str]] = {"exact": set(), "prefixes": set(), "exceptions": set()}
+_PROFANITY_PATTERN: re.Pattern[str] | None = None
+_PROFANITY_MIN_LEN: int = 1
 
 
 def reload_profanity_runtime() -> dict[str, int]:
     """Перезагружает runtime-словарь мата и возвращает применённые размеры."""
 
-    global _PROFANITY_RUNTIME
+    global _PROFANITY_RUNTIME, _PROFANITY_PATTERN, _PROFANITY_MIN_LEN
     _PROFANITY_RUNTIME = reload_profanity_runtime_dict()
+    words = _PROFANITY_RUNTIME["exact"] | _PROFANITY_RUNTIME["prefixes"]
+    _PROFANITY_MIN_LEN = max(1, min((len(word) for word in words), default=1))
+    _PROFANITY_PATTERN = compile_profanity_pattern(
+        _PROFANITY_RUNTIME["exact"], _PROFANITY_RUNTIME["prefixes"],
+    )
     return {
         "exact": len(_PROFANITY_RUNTIME["exact"]),
         "prefixes": len(_PROFANITY_RUNTIME["prefixes"]),
@@ -2581,7 +2592,7 @@ reload_profanity_runtime()
 
 async def _can_use_remote_ai(chat_id: int) -> tuple[bool, str | None]:
     """Атомарно резервирует запрос в счёт дневного лимита (проверка+инкремент одной операцией)."""
-    date_key = now_tz().date().isoformat()
+    date_key = today_key()
     async for session in get_session():
         allowed, reason = await try_reserve_request(
             session,
@@ -2596,7 +2607,7 @@ async def _can_use_remote_ai(chat_id: int) -> tuple[bool, str | None]:
 
 async def _add_remote_usage(chat_id: int, tokens: int) -> None:
     """Полный учёт (запрос + токены) — для путей без предварительного резерва."""
-    date_key = now_tz().date().isoformat()
+    date_key = today_key()
     async for session in get_session():
         await add_usage(session, date_key=date_key, chat_id=chat_id, tokens_used=tokens)
         return
@@ -2604,7 +2615,7 @@ async def _add_remote_usage(chat_id: int, tokens: int) -> None:
 
 async def _add_remote_tokens(chat_id: int, tokens: int) -> None:
     """Только токены — запрос уже учтён резервом в _can_use_remote_ai."""
-    date_key = now_tz().date().isoformat()
+    date_key = today_key()
     async for session in get_session():
         await add_tokens(session, date_key=date_key, chat_id=chat_id, tokens_used=tokens)
         return
@@ -2628,7 +2639,7 @@ def resolve_provider_mode() -> Literal["remote", "stub"]:
 
 
 async def get_ai_usage_for_today(chat_id: int) -> tuple[int, int]:
-    date_key = now_tz().date().isoformat()
+    date_key = today_key()
     async for session in get_session():
         usage = await get_usage_stats(session, date_key=date_key, chat_id=chat_id)
         return usage.requests_used, usage.tokens_used
@@ -27,7 +27,7 @@ from app.services.ai_schemas import (
     SpamResult,
     TopicResult,
 )
-from app.utils.time import now_tz
+from app.utils.time import today_key
 
 logger = logging.getLogger(__name__)
 
@@ -82,7 +82,7 @@ async def _log_task(
     cost_usd: float = 0.0,
 ) -> None:
     try:
-        date_key = now_tz().date().isoformat()
+        date_key = today_key()
         async for session in get_session():
             entry = AiTaskLog(
                 date_key=date_key,
@@ -109,7 +109,7 @@ async def _check_daily_cost_limit(chat_id: int | None) -> bool:
     if settings.ai_max_daily_cost_usd <= 0:
         return True
     try:
-        date_key = now_tz().date().isoformat()
+        date_key = today_key()
         async for session in get_session():
             stmt = select(func.sum(AiTaskLog.cost_usd)).where(
                 AiTaskLog.date_key == date_key,
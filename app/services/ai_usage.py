@@ -11,7 +11,7 @@ from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import AiUsage
-from app.utils.time import now_tz
+from app.utils.time import now_tz, today_key
 
 logger = logging.getLogger(__name__)
 
@@ -166,7 +166,7 @@ async def reset_ai_usage(session: AsyncSession, *, chat_id: int | None = None) -
 
 
 async def clear_old_usage(session: AsyncSession) -> int:
-    today = now_tz().date().isoformat()
+    today = today_key()
     result = await session.execute(delete(AiUsage).where(AiUsage.date_key != today))
     await session.commit()
     return int(result.rowcount or 0)
@@ -186,7 +186,7 @@ _IMAGE_USAGE_CHAT_ID = 0
 
 async def get_today_image_count(session: AsyncSession) -> int:
     """Возвращает количество сгенерированных картинок за сегодня из БД."""
-    date_key = now_tz().date().isoformat()
+    date_key = today_key()
     usage = await session.get(AiUsage, {"date_key": date_key, "chat_id": _IMAGE_USAGE_CHAT_ID})
     return usage.request_count if usage else 0
 
@@ -197,7 +197,7 @@ async def add_image_usage(session: AsyncSession) -> int:
     Избегает race condition при параллельных фоновых записях:
     одна транзакция — один INCREMENT без промежуточного чтения.
     """
-    date_key = now_tz().date().isoformat()
+    date_key = today_key()
     now_utc = datetime.now(timezone.utc).isoformat()
     try:
         await session.execute(
@@ -10,6 +10,7 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta
 
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import UserStat
@@ -42,6 +43,35 @@ async def get_or_create_stats(
     return stats
 
 
+async def get_or_create_stats_many(
+    session: AsyncSession,
+    chat_id: int,
+    names: dict[int, str | None],
+) -> dict[int, UserStat]:
+    """Как get_or_create_stats, но для нескольких игроков одним SELECT.
+
+    Почему: бонус победителям тура начисляется всем с максимумом очков —
+    вместо запроса на каждого берём всех сразу и создаём недостающих.
+    """
+    if not names:
+        return {}
+    rows = (await session.execute(
+        select(UserStat).where(UserStat.chat_id == chat_id, UserStat.user_id.in_(names))
+    )).scalars().all()
+    found = {row.user_id: row for row in rows}
+    for user_id, display_name in names.items():
+        stats = found.get(user_id)
+        if stats is None:
+            stats = found[user_id] = UserStat(
+                user_id=user_id, chat_id=chat_id, coins=DEFAULT_COINS, display_name=display_name
+            )
+            session.add(stats)
+        elif display_name:
+            stats.display_name = display_name
+    await session.flush()
+    return found
+
+
 def transfer_coins(sender: UserStat, receiver: UserStat, amount: int) -> str | None:
     """Перевод монет между пользователями. Возвращает None при успехе или текст ошибки."""
     if amount <= 0:
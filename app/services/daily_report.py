@@ -10,14 +10,14 @@ from sqlalchemy import func, select
 from app.config import settings
 from app.db import get_session
 from app.models import AiTaskLog, UnansweredQuestion
-from app.utils.time import now_tz
+from app.utils.time import today_key
 
 logger = logging.getLogger(__name__)
 
 
 async def send_daily_report(bot: Bot) -> None:
     """Вечерняя сводка (22:30): запросы, токены, стоимость, «не знаю», топ-задачи."""
-    date_key = now_tz().date().isoformat()
+    date_key = today_key()
     try:
         async for session in get_session():
             # Агрегаты по AI-задачам за сегодня
@@ -2,37 +2,68 @@
 
 from __future__ import annotations
 
-from collections import deque
-from datetime import datetime, timedelta, timezone
+import math
+import time
+
+_MAX_KEYS = 20_000
+
+
+class _Window:
+    __slots__ = ("index", "current", "previous")
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.current = 0
+        self.previous = 0
 
 
 class FloodTracker:
-    """Простой трекер сообщений за окно времени."""
+    """Приближённое скользящее окно из двух фиксированных счётчиков.
+
+    Почему: на пользователя хватает трёх целых — счётчиков текущего и
+    предыдущего окна и номера окна. Оценка за последние window_seconds:
+    current + previous × доля предыдущего окна, ещё попадающая в интервал
+    (алгоритм rate limiting Cloudflare). Регистрация — O(1) без циклов.
+    Оценка округляется вверх: всплеск на стыке окон не должен проскочить
+    на единицу ниже лимита, который точный подсчёт по меткам бы поймал.
+    Время — секунды time.monotonic(): float-арифметика вместо datetime и
+    нечувствительность к переводу системных часов.
+    """
 
-    def __init__(self, limit: int, window_seconds: int) -> None:
+    def __init__(self, limit: int, window_seconds: int, max_keys: int = _MAX_KEYS) -> None:
         self.limit = limit
-        self.window = timedelta(seconds=window_seconds)
-        self._messages: dict[tuple[int, int], deque[datetime]] = {}
+        self.window_seconds = window_seconds
+        self._max_keys = max_keys
+        self._windows: dict[tuple[int, int], _Window] = {}
 
-    def register(self, user_id: int, chat_id: int, timestamp: datetime) -> int:
+    def register(self, user_id: int, chat_id: int, timestamp: float | None = None) -> int:
         key = (user_id, chat_id)
-        if key not in self._messages:
-            self._messages[key] = deque()
-        bucket = self._messages[key]
-        bucket.append(timestamp)
-        cutoff = timestamp - self.window
-        while bucket and bucket[0] < cutoff:
-            bucket.popleft()
-        return len(bucket)
+        seconds = time.monotonic() if timestamp is None else timestamp
+        index, offset = divmod(seconds, self.window_seconds)
+        index = int(index)
+        window = self._windows.pop(key, None)
+        if window is None:
+            window = _Window(index)
+            if len(self._windows) >= self._max_keys:
+                # Вытесняем давно молчавшего: dict хранит порядок последних обращений.
+                del self._windows[next(iter(self._windows))]
+        if index == window.index + 1:
+            window.previous = window.current
+            window.current = 0
+            window.index = index
+        elif index > window.index + 1:
+            window.previous = 0
+            window.current = 0
+            window.index = index
+        window.current += 1
+        self._windows[key] = window
+        weight = 1.0 - offset / self.window_seconds
+        return math.ceil(window.current + window.previous * weight)
 
     def cleanup(self) -> int:
         """Удаляет устаревшие записи из трекера. Возвращает количество удалённых."""
-        now = datetime.now(timezone.utc)
-        cutoff = now - self.window
-        stale_keys = [
-            key for key, bucket in self._messages.items()
-            if not bucket or bucket[-1] < cutoff
-        ]
+        current = int(time.monotonic() // self.window_seconds)
+        stale_keys = [key for key, window in self._windows.items() if window.index < current - 1]
         for key in stale_keys:
-            del self._messages[key]
+            del self._windows[key]
         return len(stale_keys)
@@ -20,11 +20,11 @@ async def get_health_state(session: AsyncSession) -> HealthState:
 
 async def update_heartbeat(session: AsyncSession, timestamp: datetime) -> None:
     state = await get_health_state(session)
+    # Без flush: вызывающий коммитит один раз, поля уйдут одним UPDATE.
     state.last_heartbeat_at = timestamp
-    await session.flush()
 
 
 async def update_notice(session: AsyncSession, timestamp: datetime) -> None:
     state = await get_health_state(session)
+    # Без flush: вызывающий коммитит один раз.
     state.last_notice_at = timestamp
-    await session.flush()
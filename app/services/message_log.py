@@ -0,0 +1,93 @@
+"""Почему: журнал сообщений пишется на каждое сообщение чата — копим строки
+в очереди и сбрасываем пачкой, а не отдельным INSERT + COMMIT на сообщение."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.db import get_session_ctx
+from app.models import MessageLog
+
+logger = logging.getLogger(__name__)
+
+LOG_QUEUE_MAX = 10_000
+LOG_BATCH_SIZE = 500
+LOG_FLUSH_INTERVAL_SEC = 0.5
+
+_LOG_QUEUE: asyncio.Queue[MessageLog] = asyncio.Queue(maxsize=LOG_QUEUE_MAX)
+
+# Почему: журнал — аналитика, потеря последних строк при падении допустима,
+# поэтому на Postgres коммит пачки не ждёт fsync WAL. Страйки и события
+# модерации пишутся другими сессиями с обычным synchronous_commit. На SQLite
+# аналога на уровне транзакции нет: PRAGMA synchronous действует на всё
+# соединение пула, а WAL + synchronous=NORMAL и так не делают fsync на коммит.
+_ASYNC_COMMIT = settings.database_url.startswith("postgresql")
+
+
+def enqueue_message_log(record: MessageLog) -> bool:
+    """Ставит запись в очередь на запись. При переполнении — отбрасывает."""
+    try:
+        _LOG_QUEUE.put_nowait(record)
+    except asyncio.QueueFull:
+        logger.warning("Очередь журнала сообщений переполнена, запись отброшена.")
+        return False
+    return True
+
+
+def _drain(limit: int) -> list[MessageLog]:
+    batch: list[MessageLog] = []
+    while len(batch) < limit:
+        try:
+            batch.append(_LOG_QUEUE.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+    return batch
+
+
+async def _write_batch(batch: list[MessageLog]) -> None:
+    try:
+        async with get_session_ctx() as session:
+            if _ASYNC_COMMIT:
+                await session.execute(text("SET LOCAL synchronous_commit = OFF"))
+            session.add_all(batch)
+            await session.commit()
+    except Exception:  # noqa: BLE001 — журнал не должен ронять flusher
+        logger.exception("Не удалось записать пачку журнала сообщений (%d шт.).", len(batch))
+
+
+async def flush_message_log() -> int:
+    """Сбрасывает всё накопленное в БД. Возвращает число записанных строк."""
+    written = 0
+    while batch := _drain(LOG_BATCH_SIZE):
+        await _write_batch(batch)
+        written += len(batch)
+    return written
+
+
+async def run_message_log_flusher() -> None:
+    """Фоновый цикл: ждёт первую запись, добирает пачку за интервал и пишет её."""
+    loop = asyncio.get_running_loop()
+    batch: list[MessageLog] = []
+    try:
+        while True:
+            batch.append(await _LOG_QUEUE.get())
+            deadline = loop.time() + LOG_FLUSH_INTERVAL_SEC
+            while len(batch) < LOG_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(_LOG_QUEUE.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            pending, batch = batch, []
+            await _write_batch(pending)
+    finally:
+        # При остановке не теряем то, что уже накоплено.
+        if batch:
+            await _write_batch(batch)
+        await flush_message_log()
@@ -14,12 +14,14 @@ import random
 import re
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 
 from sqlalchemy import Integer, delete, desc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import QuizQuestion, QuizRound, QuizSession
 from app.utils.morphology import lemmatize
+from app.utils.text import plural_ru
 from app.utils.time import ensure_aware
 
 logger = logging.getLogger(__name__)
@@ -44,6 +46,9 @@ _STOP_WORDS = frozenset({
 
 # Разделители вариантов ответа в сид-данных: «Пётр Первый / Пётр I».
 _ALT_SPLIT = re.compile(r"\s*[/;]\s*|\s+или\s+", re.IGNORECASE)
+# Почему: str.translate по string.punctuation не покрывает «», —, … и прочую
+# юникодную пунктуацию, поэтому остаётся регэксп, но скомпилированный заранее.
+_PUNCT_RE = re.compile(r"[^\w\s]")
 
 
 # --- Нормализация и матч ответов ---
@@ -52,7 +57,7 @@ _ALT_SPLIT = re.compile(r"\s*[/;]\s*|\s+или\s+", re.IGNORECASE)
 def _normalize(text: str) -> str:
     """lower, ё→е, пунктуацию — в пробелы, схлопнуть пробелы."""
     lowered = text.lower().replace("ё", "е")
-    cleaned = re.sub(r"[^\w\s]", " ", lowered)
+    cleaned = _PUNCT_RE.sub(" ", lowered)
     return " ".join(cleaned.split())
 
 
@@ -137,17 +142,15 @@ def _token_matches(correct: str, given_tokens: list[str]) -> bool:
     return False
 
 
-def _variant_matched(variant: str, given_tokens: list[str]) -> bool:
+def _variant_matched(required_tokens: tuple[str, ...], given_tokens: list[str]) -> bool:
     """Вариант эталона засчитан, если ВСЕ его значимые токены есть в ответе.
 
     Лишние слова в ответе игнорируются («это Москва» → «Москва» ок).
+    Значимые токены варианта отобраны заранее (_answer_variants).
     """
-    correct_tokens = [t for t in _tokens(variant) if t not in _STOP_WORDS]
-    if not correct_tokens:
-        correct_tokens = _tokens(variant)  # ответ целиком из стоп-слов — берём как есть
-    if not correct_tokens:
+    if not required_tokens:
         return False
-    return all(_token_matches(c, given_tokens) for c in correct_tokens)
+    return all(_token_matches(c, given_tokens) for c in required_tokens)
 
 
 def _drop_negated(tokens: list[str]) -> list[str]:
@@ -174,28 +177,68 @@ def check_answer(correct: str, given: str) -> bool:
     совпасть с любой. Слово под отрицанием («не Париж») не засчитывается —
     кроме эталонов, где «не/ни» часть самого ответа («Ни пуха, ни пера»).
     """
-    raw_tokens = [t for t in _tokens(given) if t]
+    return _check_normalized(correct, _normalize(given))
+
+
+@lru_cache(maxsize=256)
+def _check_normalized(correct: str, given: str) -> bool:
+    """Вердикт по уже нормализованному ответу.
+
+    Почему: на каждый вопрос тему игр засыпают одинаковыми догадками («Москва»,
+    «москва!») — после нормализации это один ключ, и лемматизация с
+    Левенштейном считаются один раз. Функция чистая, кэш безопасен.
+    """
+    raw_tokens = given.split()
     if not raw_tokens:
         return False
     filtered_tokens = _drop_negated(raw_tokens)
-    for v in _ALT_SPLIT.split(correct):
-        if not v.strip():
-            continue
-        v_tokens = _tokens(v)
-        # Эталон с «не/ни» внутри — отрицание не фильтруем, оно часть ответа.
-        use = raw_tokens if ("не" in v_tokens or "ни" in v_tokens) else filtered_tokens
-        if use and _variant_matched(v, use):
+    # Повторы слова («ааа ааа ааа», «да да да») ничего не добавляют к вердикту,
+    # но каждый гонял бы лемматизацию и Левенштейн против каждого токена эталона.
+    # Отрицание сняли по исходному порядку — теперь можно схлопнуть дубли.
+    raw_tokens = list(dict.fromkeys(raw_tokens))
+    filtered_tokens = list(dict.fromkeys(filtered_tokens))
+    for required, keeps_negation in _answer_variants(correct):
+        use = raw_tokens if keeps_negation else filtered_tokens
+        if use and _variant_matched(required, use):
             return True
     return False
 
 
+@lru_cache(maxsize=64)
+def _answer_variants(correct: str) -> tuple[tuple[tuple[str, ...], bool], ...]:
+    """Разобранные варианты эталона: (значимые токены, «не/ни» — часть ответа).
+
+    Почему: кэш вердиктов ключуется ещё и ответом игрока, поэтому каждая новая
+    догадка заново резала эталон, отсеивала стоп-слова и искала в нём «не/ни».
+    Всё это зависит только от эталона — считаем один раз на вопрос.
+    """
+    variants = []
+    for variant in _ALT_SPLIT.split(correct):
+        if not variant.strip():
+            continue
+        tokens = _tokens(variant)
+        # Ответ целиком из стоп-слов — берём как есть.
+        required = tuple(t for t in tokens if t not in _STOP_WORDS) or tuple(tokens)
+        # Эталон с «не/ни» внутри — отрицание не фильтруем, оно часть ответа.
+        variants.append((required, "не" in tokens or "ни" in tokens))
+    return tuple(variants)
+
+
+_WORD_FORMS = ("слово", "слова", "слов")
+
+
+@lru_cache(maxsize=256)
 def answer_length_hint(answer: str) -> str:
-    """Подсказка о форме ответа без палева содержания."""
+    """Подсказка о форме ответа без палева содержания.
+
+    Почему: текст вопроса пересобирается при каждом сохранении состояния, а
+    подсказка — чистая функция эталона; токенизация идёт один раз на вопрос.
+    """
     first_variant = _ALT_SPLIT.split(answer)[0]
     words = _tokens(first_variant)
     if len(words) <= 1:
         return "одно слово" if not _is_number(first_variant) else "число"
-    return f"{len(words)} слова"
+    return f"{len(words)} {plural_ru(len(words), _WORD_FORMS)}"
 
 
 # --- Состояние сессии (в QuizSession.state_json) ---
@@ -211,7 +254,6 @@ class QuizState:
     question_text: str = ""
     question_started_at: str = ""  # ISO с tz
     winner_user_id: int | None = None  # угадавший текущий вопрос (для first-wins)
-    board_message_id: int | None = None
     scores: dict = field(default_factory=dict)  # {str(user_id): {"name": str, "correct": int}}
     updated_at: str = ""
 
@@ -226,7 +268,6 @@ class QuizState:
             "question_text": self.question_text,
             "question_started_at": self.question_started_at,
             "winner_user_id": self.winner_user_id,
-            "board_message_id": self.board_message_id,
             "scores": self.scores,
             "updated_at": self.updated_at,
         }, ensure_ascii=False)
@@ -246,7 +287,6 @@ class QuizState:
                 question_text=str(data.get("question_text", "")),
                 question_started_at=str(data.get("question_started_at", "")),
                 winner_user_id=data.get("winner_user_id"),
-                board_message_id=data.get("board_message_id"),
                 scores=dict(data.get("scores", {})),
                 updated_at=str(data.get("updated_at", "")),
             )
@@ -268,15 +308,14 @@ class QuizState:
 
 def winners_from_scores(scores: dict) -> tuple[list[tuple[int, str, int]], int]:
     """Победители тура — все с максимумом правильных (>0). Возврат (список, max)."""
-    best = 0
-    for entry in scores.values():
-        best = max(best, int(entry.get("correct", 0)))
+    counted = [(uid, entry, int(entry.get("correct", 0))) for uid, entry in scores.items()]
+    best = max((correct for _, _, correct in counted), default=0)
     if best == 0:
         return [], 0
     winners = [
-        (int(uid), entry.get("name") or str(uid), int(entry["correct"]))
-        for uid, entry in scores.items()
-        if int(entry.get("correct", 0)) == best
+        (int(uid), entry.get("name") or str(uid), correct)
+        for uid, entry, correct in counted
+        if correct == best
     ]
     return winners, best
 
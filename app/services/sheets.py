@@ -5,13 +5,13 @@ from __future__ import annotations
 import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import Any
-
-import gspread
-from google.oauth2.service_account import Credentials
+from typing import TYPE_CHECKING, Any
 
 from app.config import settings
 
+if TYPE_CHECKING:
+    import gspread
+
 logger = logging.getLogger(__name__)
 
 _SCOPES = [
@@ -29,7 +29,14 @@ _SUGGESTION_HEADERS = [
 
 
 def _get_client() -> gspread.Client:
-    """Создаёт аутентифицированный клиент gspread."""
+    """Создаёт аутентифицированный клиент gspread.
+
+    Почему импорт здесь: gspread с google-auth тянут ~150 мс на старте бота,
+    а нужны только при редкой записи предложения в таблицу.
+    """
+    import gspread
+    from google.oauth2.service_account import Credentials
+
     creds = Credentials.from_service_account_file(
         settings.google_service_account_file,
         scopes=_SCOPES,
@@ -39,6 +46,8 @@ def _get_client() -> gspread.Client:
 
 def _ensure_suggestions_sheet(spreadsheet: gspread.Spreadsheet) -> gspread.Worksheet:
     """Возвращает лист «Предложения», создаёт его если нет."""
+    import gspread
+
     try:
         ws = spreadsheet.worksheet(_SUGGESTIONS_WORKSHEET)
     except gspread.WorksheetNotFound:
@@ -15,34 +15,37 @@ STRIKE_RESET_DAYS = 30
 
 
 async def add_strike(session: AsyncSession, user_id: int, chat_id: int) -> int:
-    """Добавляет страйк и возвращает текущее количество страйков."""
+    """Добавляет страйк и возвращает текущее количество страйков.
+
+    Почему: сначала INSERT, затем один агрегатный SELECT (min + count) —
+    два обращения к БД вместо трёх. Счёт после вставки сохраняет прежнее
+    поведение при конкурентных страйках (второй увидит и первый).
+    """
 
-    oldest = await session.scalar(
-        select(func.min(Strike.created_at)).where(
-            Strike.user_id == user_id,
-            Strike.chat_id == chat_id,
-        )
-    )
     now = datetime.now(timezone.utc)
+    strike = Strike(user_id=user_id, chat_id=chat_id, created_at=now)
+    session.add(strike)
+    await session.flush()
+
+    oldest, count = (
+        await session.execute(
+            select(func.min(Strike.created_at), func.count()).where(
+                Strike.user_id == user_id,
+                Strike.chat_id == chat_id,
+            )
+        )
+    ).one()
     # SQLite возвращает created_at без tzinfo — приводим к aware, иначе
     # вычитание naive/aware падает с TypeError (страйк за мат не проставлялся).
     if oldest and now - ensure_aware(oldest) > timedelta(days=STRIKE_RESET_DAYS):
         await session.execute(
-            delete(Strike).where(Strike.user_id == user_id, Strike.chat_id == chat_id)
-        )
-        oldest = None
-
-    session.add(Strike(user_id=user_id, chat_id=chat_id, created_at=now))
-    await session.flush()
-
-    count = await session.scalar(
-        select(func.count())
-        .select_from(Strike)
-        .where(
-            Strike.user_id == user_id,
-            Strike.chat_id == chat_id,
+            delete(Strike).where(
+                Strike.user_id == user_id,
+                Strike.chat_id == chat_id,
+                Strike.id != strike.id,
+            )
         )
-    )
+        return 1
     return int(count or 0)
 
 
@@ -2,11 +2,58 @@
 
 from __future__ import annotations
 
+import logging
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db import get_session_ctx
 from app.models import TopicStat
 
+logger = logging.getLogger(__name__)
+
+TOPIC_STATS_FLUSH_INTERVAL_SEC = 30
+
+# Почему: счётчик тем бампался отдельной сессией (SELECT + UPDATE + COMMIT)
+# в middleware ДО хендлера — каждое сообщение форума ждало запись в БД, даже
+# в болтливой теме игр. Сводке нужны дневные итоги, поэтому копим приращения
+# в памяти и пишем их пачкой раз в TOPIC_STATS_FLUSH_INTERVAL_SEC.
+# (chat_id, topic_id, date_key) -> [сколько сообщений, последнее сообщение]
+_PENDING: dict[tuple[int, int, str], list] = {}
+
+
+def record_topic_message(
+    chat_id: int, topic_id: int, date_key: str, last_message: str | None
+) -> None:
+    """Учитывает сообщение темы в памяти — без БД и без await."""
+    pending = _PENDING.get((chat_id, topic_id, date_key))
+    if pending is None:
+        pending = _PENDING[(chat_id, topic_id, date_key)] = [0, None]
+    pending[0] += 1
+    if last_message:
+        pending[1] = last_message[:200]
+
+
+async def flush_topic_stats() -> int:
+    """Пишет накопленные счётчики одной транзакцией. Возвращает число тем-дней."""
+    if not _PENDING:
+        return 0
+    batch = dict(_PENDING)
+    _PENDING.clear()
+    try:
+        async with get_session_ctx() as session:
+            await bump_topic_stats_many(session, batch)
+            await session.commit()
+    except Exception:  # noqa: BLE001 — статистика не должна ронять планировщик
+        logger.warning("Не удалось записать статистику тем (%d шт.).", len(batch), exc_info=True)
+        # Возвращаем приращения в буфер — допишем при следующем сбросе.
+        for key, (count, last_message) in batch.items():
+            pending = _PENDING.setdefault(key, [0, None])
+            pending[0] += count
+            pending[1] = pending[1] or last_message
+        return 0
+    return len(batch)
+
 
 async def bump_topic_stat(
     session: AsyncSession,
@@ -14,6 +61,8 @@ async def bump_topic_stat(
     topic_id: int,
     date_key: str,
     last_message: str | None,
+    *,
+    count: int = 1,
 ) -> None:
     stat = await session.scalar(
         select(TopicStat).where(
@@ -30,12 +79,50 @@ async def bump_topic_stat(
             messages_count=0,
         )
         session.add(stat)
-    stat.messages_count += 1
+    stat.messages_count += count
     if last_message:
         stat.last_message = last_message[:200]
     await session.flush()
 
 
+async def bump_topic_stats_many(
+    session: AsyncSession, batch: dict[tuple[int, int, str], list]
+) -> None:
+    """Как bump_topic_stat, но для всей пачки одним SELECT и одним flush.
+
+    Почему: уникального ключа (chat_id, topic_id, date_key) в таблице нет,
+    поэтому ON CONFLICT недоступен; вместо SELECT+flush на каждую тему-день
+    читаем все затронутые строки разом и дописываем недостающие.
+    """
+    if not batch:
+        return
+    chat_ids = {key[0] for key in batch}
+    topic_ids = {key[1] for key in batch}
+    date_keys = {key[2] for key in batch}
+    rows = (
+        await session.scalars(
+            select(TopicStat).where(
+                TopicStat.chat_id.in_(chat_ids),
+                TopicStat.topic_id.in_(topic_ids),
+                TopicStat.date_key.in_(date_keys),
+            )
+        )
+    ).all()
+    found = {(row.chat_id, row.topic_id, row.date_key): row for row in rows}
+    for key, (count, last_message) in batch.items():
+        stat = found.get(key)
+        if stat is None:
+            chat_id, topic_id, date_key = key
+            stat = found[key] = TopicStat(
+                chat_id=chat_id, topic_id=topic_id, date_key=date_key, messages_count=0
+            )
+            session.add(stat)
+        stat.messages_count += count
+        if last_message:
+            stat.last_message = last_message[:200]
+    await session.flush()
+
+
 async def get_daily_stats(
     session: AsyncSession, chat_id: int, date_key: str
 ) -> list[TopicStat]:
@@ -3,24 +3,55 @@
 from __future__ import annotations
 
 import logging
+import time
 
 from aiogram import Bot
 from aiogram.types import Message
 
+from app.utils.cache import remember_bounded
+
 logger = logging.getLogger(__name__)
 
+# Почему: проверка админа — сетевой вызов get_chat_member на каждое сообщение;
+# статус меняется редко, поэтому кэшируем его на минуту.
+_ADMIN_CACHE: dict[tuple[int, int], tuple[bool, float]] = {}
+_ADMIN_CACHE_TTL = 60.0
+_ADMIN_CACHE_MAX = 4096
+
 
 async def is_admin(bot: Bot, chat_id: int, user_id: int) -> bool:
     member = await bot.get_chat_member(chat_id, user_id)
     return member.status in {"administrator", "creator"}
 
 
+async def is_admin_cached(bot: Bot, chat_id: int, user_id: int) -> bool:
+    """То же, что is_admin, но с TTL-кэшем на горячем пути (модерация и т.п.)."""
+    key = (chat_id, user_id)
+    now = time.monotonic()
+    cached = _ADMIN_CACHE.get(key)
+    if cached is not None and now - cached[1] < _ADMIN_CACHE_TTL:
+        return cached[0]
+    result = await is_admin(bot, chat_id, user_id)
+    # Вытесняем одну самую давнюю запись, а не весь кэш: полный сброс дал бы
+    # залп get_chat_member на следующей волне сообщений.
+    remember_bounded(_ADMIN_CACHE, key, (result, now), _ADMIN_CACHE_MAX)
+    return result
+
+
+def invalidate_admin_cache(chat_id: int, user_id: int) -> None:
+    """Сбрасывает кэш статуса, когда Telegram сообщил о смене прав участника."""
+    _ADMIN_CACHE.pop((chat_id, user_id), None)
+
+
 async def is_admin_message(bot: Bot, chat_id: int, message: Message) -> bool:
-    """Проверяет права администратора для сообщения, включая анонимных админов."""
+    """Проверяет права администратора для сообщения, включая анонимных админов.
+
+    Статус берётся из TTL-кэша: смену прав сбрасывает invalidate_admin_cache.
+    """
     if message.from_user is None:
         return bool(message.sender_chat and message.sender_chat.id == chat_id)
     try:
-        return await is_admin(bot, chat_id, message.from_user.id)
+        return await is_admin_cached(bot, chat_id, message.from_user.id)
     except Exception:  # noqa: BLE001 - не выдаём доступ при ошибке проверки
         logger.exception("Не удалось проверить права администратора.")
         return False
@@ -0,0 +1,19 @@
+"""Почему: per-user словари состояния (последний ответ, style-hint, история)
+пополняются каждым новым жителем и за аптайм не чистятся. Один хелпер держит
+их в пределах лимита вместо копий одной и той же LRU-логики по модулям."""
+
+from __future__ import annotations
+
+from typing import Any, Hashable
+
+
+def remember_bounded(store: dict, key: Hashable, value: Any, limit: int) -> None:
+    """Кладёт значение в конец словаря; при переполнении выбрасывает самое давнее.
+
+    dict хранит порядок вставки, поэтому pop + вставка переносят обновлённый
+    ключ в конец — это LRU без OrderedDict.
+    """
+    store.pop(key, None)
+    store[key] = value
+    if len(store) > limit:
+        store.pop(next(iter(store)))
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import re
+from functools import lru_cache
 from pathlib import Path
 from typing import TypedDict
 
@@ -69,13 +71,91 @@ def build_profanity_runtime(words: set[str], exceptions: set[str]) -> ProfanityR
     return {"exact": exact, "prefixes": prefixes, "exceptions": exceptions}
 
 
+def _trie_pattern(words: set[str]) -> str:
+    """Строит regex в форме префиксного дерева: «бля|бляд|блядь» → «бля(?:дь?)?».
+
+    Почему: плоская альтернация пробует каждое слово заново с первой буквы,
+    а дерево проходится за один спуск по символам слова — как marisa-trie,
+    только внутри стандартного движка regex и без внешних зависимостей.
+    """
+    root: dict[str, dict] = {}
+    for word in words:
+        node = root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: dict[str, dict]) -> str:
+        is_end = "" in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if is_end else group
+
+    return render(root)
+
+
+def compile_profanity_pattern(exact: set[str], prefixes: set[str]) -> re.Pattern[str] | None:
+    """Собирает весь словарь в один regex для прохода по тексту за один скан.
+
+    Почему: вместо перебора «слово × каждый префикс» в Python движок regex
+    находит совпадения сам. Каждое совпадение — целое слово (точное или
+    начинающееся с префикса), чтобы исключения проверялись по слову целиком.
+    """
+    return _compile_profanity_pattern(frozenset(exact), frozenset(prefixes))
+
+
+@lru_cache(maxsize=4)
+def _compile_profanity_pattern(
+    exact: frozenset[str], prefixes: frozenset[str]
+) -> re.Pattern[str] | None:
+    # Почему: /reload_profanity без правок словаря не должен заново строить дерево.
+    branches: list[str] = []
+    if prefixes:
+        branches.append(rf"\b(?:{_trie_pattern(prefixes)})\w*")
+    if exact:
+        branches.append(rf"\b(?:{_trie_pattern(exact)})\b")
+    if not branches:
+        return None
+    return re.compile("|".join(branches))
+
+
+_SOURCE_STAMP: tuple[tuple[int, int], ...] | None = None
+
+
+def _source_stamp() -> tuple[tuple[int, int], ...]:
+    """Отпечаток файлов словаря: (mtime_ns, size) каждого, (-1, -1) если файла нет."""
+
+    stamp: list[tuple[int, int]] = []
+    for path in (PROFANITY_PATH, PROFANITY_EXCEPTIONS_PATH):
+        try:
+            stat = path.stat()
+        except OSError:
+            stamp.append((-1, -1))
+        else:
+            stamp.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(stamp)
+
+
 def reload_profanity_runtime() -> ProfanityRuntime:
-    """Перезагружает runtime-словарь с диска и возвращает его."""
+    """Перезагружает runtime-словарь с диска и возвращает его.
+
+    Почему: словарь разбирается заново только если файлы изменились —
+    повторные вызовы (импорт в нескольких местах, /reload_profanity без
+    правок) обходятся одним stat() на файл.
+    """
 
-    global _PROFANITY_RUNTIME
+    global _PROFANITY_RUNTIME, _SOURCE_STAMP
+    stamp = _source_stamp()
+    if stamp == _SOURCE_STAMP:
+        return get_profanity_runtime()
     words = load_profanity()
     exceptions = load_profanity_exceptions()
     _PROFANITY_RUNTIME = build_profanity_runtime(words, exceptions)
+    _SOURCE_STAMP = stamp
     return get_profanity_runtime()
 
 
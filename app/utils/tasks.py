@@ -0,0 +1,32 @@
+"""Почему: fire-and-forget задачи нужны и хендлерам, и сервисам, и запуску бота.
+asyncio держит на задачу лишь слабую ссылку — без общего реестра GC может
+собрать её до завершения, а исключение потеряется без следа в логе."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Coroutine
+
+logger = logging.getLogger(__name__)
+
+_BACKGROUND_TASKS: set[asyncio.Task] = set()
+
+
+def _on_background_done(task: asyncio.Task) -> None:
+    _BACKGROUND_TASKS.discard(task)
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.error(
+            "Фоновая задача %s завершилась с ошибкой.", task.get_name(), exc_info=exc
+        )
+
+
+def spawn_background(coro: Coroutine[Any, Any, Any], *, name: str | None = None) -> asyncio.Task:
+    """Запускает корутину в фоне, удерживая ссылку до её завершения."""
+    task = asyncio.get_running_loop().create_task(coro, name=name)
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_on_background_done)
+    return task
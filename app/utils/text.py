@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+import random
 import re
+from collections.abc import Sequence
 
 
-LINK_PATTERN = re.compile(r"https?://\S+|www\.\S+|t\.me/\S+", re.IGNORECASE)
+# Почему: для проверки «есть ли ссылка» достаточно одного непробельного символа
+# после префикса — хвост \S+ заставлял движок дочитывать всю ссылку до пробела.
+LINK_PATTERN = re.compile(r"(?:https?://|www\.|t\.me/)\S", re.IGNORECASE)
 MENTION_PATTERN = re.compile(r"@\w{3,}")
+_NON_WORD_RE = re.compile(r"[^\w\s]")
 
 # Телефон: +7 (495) 401-60-06 / 8 495 401 60 06 / 8-800-100-20-30.
 _PHONE_PATTERN = re.compile(
@@ -24,6 +29,42 @@ _URL_BARE_PATTERN = re.compile(
 )
 
 
+def pick_other(pool: Sequence[str], previous: str | None) -> str:
+    """Случайная фраза из пула, по возможности не совпадающая с предыдущей.
+
+    Почему: раньше на каждый ответ собирался список кандидатов без previous —
+    теперь один randrange по кортежу, а при попадании в previous сдвиг на
+    случайный ненулевой шаг (распределение по остальным остаётся равномерным).
+    """
+
+    size = len(pool)
+    index = random.randrange(size)
+    if size > 1 and pool[index] == previous:
+        index = (index + random.randrange(1, size)) % size
+    return pool[index]
+
+
+def _plural_index(n: int) -> int:
+    """Номер формы для n: 0 — «одно слово», 1 — «два слова», 2 — «пять слов»."""
+
+    if n % 10 == 1 and n % 100 != 11:
+        return 0
+    if 2 <= n % 10 <= 4 and not 12 <= n % 100 <= 14:
+        return 1
+    return 2
+
+
+# Почему: форма зависит только от n % 100 — сто вариантов считаем один раз при
+# импорте, и подбор формы сводится к индексу в кортеже без цепочки ветвлений.
+_PLURAL_INDEX = tuple(_plural_index(n) for n in range(100))
+
+
+def plural_ru(n: int, forms: tuple[str, str, str]) -> str:
+    """Русская форма слова при числе n: forms = («слово», «слова», «слов»)."""
+
+    return forms[_PLURAL_INDEX[abs(n) % 100]]
+
+
 def extract_phones(text: str) -> list[str]:
     """Возвращает уникальные телефонные номера из текста в исходном виде."""
 
@@ -102,8 +143,7 @@ def contains_forbidden_link(text: str) -> bool:
 def normalize_words(text: str) -> list[str]:
     """Разбивает текст на слова для простого поиска запретных слов."""
 
-    cleaned = re.sub(r"[^\w\s]", " ", text.lower())
-    return [word for word in cleaned.split() if word]
+    return _NON_WORD_RE.sub(" ", text.lower()).split()
 
 
 def contains_profanity(
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
 from app.config import settings
@@ -12,6 +13,31 @@ def now_tz() -> datetime:
     return datetime.now(tz=ZoneInfo(settings.timezone))
 
 
+# (unix-время ближайшей местной полуночи, дата «сегодня» в ISO)
+_TODAY_KEY: tuple[float, str] = (0.0, "")
+
+
+def today_key() -> str:
+    """Сегодняшняя дата по местной таймзоне в ISO («2026-10-17»).
+
+    Почему: ключ дня нужен на каждое сообщение форума (счётчики тем) и на
+    каждый AI-запрос (резерв дневного лимита, учёт токенов), а
+    now_tz().date().isoformat() — это ZoneInfo, aware-datetime и форматирование
+    на каждый вызов. Строка меняется только в полночь: считаем её один раз
+    и держим до ближайшей местной полуночи.
+    """
+    global _TODAY_KEY
+    until, key = _TODAY_KEY
+    now = time.time()
+    if now < until:
+        return key
+    current = now_tz()
+    midnight = (current + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    key = current.date().isoformat()
+    _TODAY_KEY = (midnight.timestamp(), key)
+    return key
+
+
 def ensure_aware(dt: datetime) -> datetime:
     """Если datetime naive — считаем его UTC и добавляем tzinfo."""
     if dt.tzinfo is None:
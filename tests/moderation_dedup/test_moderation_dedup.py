@@ -15,8 +15,10 @@ from app.handlers import moderation
 def clear_moderated_cache() -> None:
     """Очищаем in-memory кеш dedup перед/после теста."""
     moderation._MODERATED_MSG_IDS.clear()
+    moderation._AI_DECISION_CACHE.clear()
     yield
     moderation._MODERATED_MSG_IDS.clear()
+    moderation._AI_DECISION_CACHE.clear()
 
 
 def _build_message(message_id: int) -> SimpleNamespace:
@@ -40,7 +42,7 @@ def _build_message(message_id: int) -> SimpleNamespace:
 def test_second_call_with_same_message_id_is_skipped(monkeypatch) -> None:
     """Повторная модерация того же message_id не должна доходить до AI."""
     monkeypatch.setattr(moderation.settings, "forum_chat_id", 12345)
-    monkeypatch.setattr(moderation, "is_admin", AsyncMock(return_value=False))
+    monkeypatch.setattr(moderation, "is_admin_cached", AsyncMock(return_value=False))
     monkeypatch.setattr(moderation, "contains_forbidden_link", lambda _: False)
     monkeypatch.setattr(moderation, "_get_topic_context", AsyncMock(return_value=[]))
     monkeypatch.setattr(moderation, "_store_message_log", AsyncMock())
@@ -64,7 +66,7 @@ def test_second_call_with_same_message_id_is_skipped(monkeypatch) -> None:
 def test_dedup_cache_is_trimmed_when_overflow(monkeypatch) -> None:
     """При переполнении кеш сокращается, чтобы не расти бесконечно."""
     monkeypatch.setattr(moderation.settings, "forum_chat_id", 12345)
-    monkeypatch.setattr(moderation, "is_admin", AsyncMock(return_value=False))
+    monkeypatch.setattr(moderation, "is_admin_cached", AsyncMock(return_value=False))
     monkeypatch.setattr(moderation, "contains_forbidden_link", lambda _: False)
     monkeypatch.setattr(moderation, "_get_topic_context", AsyncMock(return_value=[]))
     monkeypatch.setattr(moderation, "_store_message_log", AsyncMock())
@@ -83,11 +85,101 @@ def test_dedup_cache_is_trimmed_when_overflow(monkeypatch) -> None:
     assert len(moderation._MODERATED_MSG_IDS) <= moderation._MODERATED_MSG_IDS_MAX // 2 + 2
 
 
+def test_repeated_text_reuses_ai_decision(monkeypatch) -> None:
+    """Дословный повтор текста и одновременные копии уходят в AI один раз."""
+    monkeypatch.setattr(moderation.settings, "forum_chat_id", 12345)
+    monkeypatch.setattr(moderation, "is_admin_cached", AsyncMock(return_value=False))
+    monkeypatch.setattr(moderation, "contains_forbidden_link", lambda _: False)
+    monkeypatch.setattr(moderation, "_get_topic_context", AsyncMock(return_value=[]))
+    monkeypatch.setattr(moderation, "_store_message_log", AsyncMock())
+    monkeypatch.setattr(moderation, "_check_flood", AsyncMock(return_value=False))
+
+    async def slow_moderate(*_args, **_kwargs):
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(severity=0, sentiment="neutral", used_fallback=False)
+
+    ai_moderate = AsyncMock(side_effect=slow_moderate)
+    monkeypatch.setattr(moderation, "get_ai_client", lambda: SimpleNamespace(moderate=ai_moderate))
+    monkeypatch.setattr(moderation.settings, "ai_feature_moderation", True)
+
+    async def scenario() -> None:
+        await asyncio.gather(
+            moderation.run_moderation(_build_message(message_id=3001), AsyncMock()),
+            moderation.run_moderation(_build_message(message_id=3002), AsyncMock()),
+        )
+        await moderation.run_moderation(_build_message(message_id=3003), AsyncMock())
+
+    asyncio.run(scenario())
+
+    assert ai_moderate.await_count == 1
+
+
+def test_ai_decision_is_not_shared_across_users_or_threads(monkeypatch) -> None:
+    """Тот же текст от другого автора или в другой теме модель оценивает заново."""
+    monkeypatch.setattr(moderation.settings, "forum_chat_id", 12345)
+    monkeypatch.setattr(moderation, "is_admin_cached", AsyncMock(return_value=False))
+    monkeypatch.setattr(moderation, "contains_forbidden_link", lambda _: False)
+    monkeypatch.setattr(moderation, "_get_topic_context", AsyncMock(return_value=[]))
+    monkeypatch.setattr(moderation, "_store_message_log", AsyncMock())
+    monkeypatch.setattr(moderation, "_check_flood", AsyncMock(return_value=False))
+
+    ai_moderate = AsyncMock(
+        return_value=SimpleNamespace(severity=0, sentiment="neutral", used_fallback=False)
+    )
+    monkeypatch.setattr(moderation, "get_ai_client", lambda: SimpleNamespace(moderate=ai_moderate))
+    monkeypatch.setattr(moderation.settings, "ai_feature_moderation", True)
+
+    other_user = _build_message(message_id=4002)
+    other_user.from_user = SimpleNamespace(id=888, mention_html=lambda: "@v")
+    other_thread = _build_message(message_id=4003)
+    other_thread.message_thread_id = 100
+
+    async def scenario() -> None:
+        for message in (_build_message(message_id=4001), other_user, other_thread):
+            await moderation.run_moderation(message, AsyncMock())
+
+    asyncio.run(scenario())
+
+    assert ai_moderate.await_count == 3
+
+
+def test_ai_decision_cache_is_lru_and_stamped_after_verdict(monkeypatch) -> None:
+    """Метка TTL ставится по ответу модели, попадание освежает позицию в кэше."""
+    import time
+
+    answered_at: list[float] = []
+
+    async def slow_moderate(*_args, **_kwargs):
+        await asyncio.sleep(0.02)
+        answered_at.append(time.monotonic())
+        return SimpleNamespace(severity=0, sentiment="neutral", used_fallback=False)
+
+    monkeypatch.setattr(
+        moderation, "get_ai_client", lambda: SimpleNamespace(moderate=slow_moderate)
+    )
+    monkeypatch.setattr(moderation, "_AI_DECISION_MAX", 2)
+
+    async def scenario() -> None:
+        for text in ("первое", "второе"):
+            await moderation._moderate_with_ai(1, None, text, [])
+        await moderation._moderate_with_ai(1, None, "первое", [])  # попадание
+        await moderation._moderate_with_ai(1, None, "третье", [])
+
+    asyncio.run(scenario())
+
+    first = moderation._ai_decision_key(1, None, "первое")
+    second = moderation._ai_decision_key(1, None, "второе")
+    third = moderation._ai_decision_key(1, None, "третье")
+    assert list(moderation._AI_DECISION_CACHE) == [first, third]
+    assert second not in moderation._AI_DECISION_CACHE
+    assert moderation._AI_DECISION_CACHE[first][0] >= answered_at[0]
+
+
 def test_blackjack_topic_is_not_moderated(monkeypatch) -> None:
     """В теме блэкджека мат/грубость не отслеживаются — модерация не запускается."""
     monkeypatch.setattr(moderation.settings, "forum_chat_id", 12345)
     monkeypatch.setattr(moderation.settings, "topic_games", 42)
-    monkeypatch.setattr(moderation, "is_admin", AsyncMock(return_value=False))
+    monkeypatch.setattr(moderation, "is_admin_cached", AsyncMock(return_value=False))
 
     ai_moderate = AsyncMock(return_value=SimpleNamespace(severity=3, sentiment="toxic"))
     monkeypatch.setattr(moderation, "get_ai_client", lambda: SimpleNamespace(moderate=ai_moderate))
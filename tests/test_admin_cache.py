@@ -0,0 +1,51 @@
+"""Почему: статус админа кэшируется, чтобы не дёргать Telegram на каждое сообщение."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from app.utils import admin
+
+
+def test_is_admin_cached_hits_api_once_until_invalidated() -> None:
+    admin._ADMIN_CACHE.clear()
+    bot = SimpleNamespace(
+        get_chat_member=AsyncMock(return_value=SimpleNamespace(status="administrator"))
+    )
+
+    assert asyncio.run(admin.is_admin_cached(bot, 1, 42)) is True
+    assert asyncio.run(admin.is_admin_cached(bot, 1, 42)) is True
+    assert bot.get_chat_member.await_count == 1
+
+    admin.invalidate_admin_cache(1, 42)
+    bot.get_chat_member.return_value = SimpleNamespace(status="member")
+    assert asyncio.run(admin.is_admin_cached(bot, 1, 42)) is False
+    assert bot.get_chat_member.await_count == 2
+    admin._ADMIN_CACHE.clear()
+
+
+def test_is_admin_message_uses_cache() -> None:
+    admin._ADMIN_CACHE.clear()
+    bot = SimpleNamespace(
+        get_chat_member=AsyncMock(return_value=SimpleNamespace(status="creator"))
+    )
+    message = SimpleNamespace(from_user=SimpleNamespace(id=7), sender_chat=None)
+
+    for _ in range(3):
+        assert asyncio.run(admin.is_admin_message(bot, 1, message)) is True
+    assert bot.get_chat_member.await_count == 1
+    admin._ADMIN_CACHE.clear()
+
+
+def test_full_admin_cache_evicts_only_the_oldest(monkeypatch) -> None:
+    admin._ADMIN_CACHE.clear()
+    monkeypatch.setattr(admin, "_ADMIN_CACHE_MAX", 2)
+    bot = SimpleNamespace(
+        get_chat_member=AsyncMock(return_value=SimpleNamespace(status="member"))
+    )
+
+    for user_id in (1, 2, 3):
+        asyncio.run(admin.is_admin_cached(bot, 1, user_id))
+
+    assert list(admin._ADMIN_CACHE) == [(1, 2), (1, 3)]
+    admin._ADMIN_CACHE.clear()
@@ -1,6 +1,7 @@
 import asyncio
 
 import httpx
+import pytest
 from app.services.ai_module import (
     AiModuleClient,
     _ASSISTANT_SYSTEM_PROMPT,
@@ -55,6 +56,48 @@ def test_detects_masked_profanity() -> None:
     assert detect_profanity(normalized)
 
 
+def test_profanity_pattern_matches_whole_words_from_trie() -> None:
+    from app.utils.profanity import compile_profanity_pattern
+
+    pattern = compile_profanity_pattern({"блядь", "бляха"}, {"бля", "хуе"})
+    found = [m.group() for m in pattern.finditer("ну бляха муха хуевый день оглобля")]
+    assert found == ["бляха", "хуевый"]
+    assert compile_profanity_pattern(set(), set()) is None
+
+
+def test_profanity_runtime_reparsed_only_when_files_change(monkeypatch, tmp_path) -> None:
+    import os
+
+    from app.utils import profanity
+
+    words = tmp_path / "profanity.txt"
+    words.write_text("гад\n", encoding="utf-8")
+    monkeypatch.setattr(profanity, "PROFANITY_PATH", words)
+    monkeypatch.setattr(profanity, "PROFANITY_EXCEPTIONS_PATH", tmp_path / "missing.txt")
+    monkeypatch.setattr(profanity, "_SOURCE_STAMP", None)
+    monkeypatch.setattr(profanity, "_PROFANITY_RUNTIME", profanity._PROFANITY_RUNTIME)
+    calls: list[int] = []
+    original = profanity.load_profanity
+    monkeypatch.setattr(profanity, "load_profanity", lambda: calls.append(1) or original())
+
+    assert profanity.reload_profanity_runtime()["exact"] == {"гад"}
+    assert profanity.reload_profanity_runtime()["exact"] == {"гад"}
+    assert len(calls) == 1
+
+    words.write_text("гадина\n", encoding="utf-8")
+    os.utime(words, ns=(0, 10**9))
+    assert profanity.reload_profanity_runtime()["exact"] == {"гадина"}
+    assert len(calls) == 2
+
+
+def test_text_has_profanity_skips_texts_shorter_than_dictionary(monkeypatch) -> None:
+    from app.services import ai_module
+
+    monkeypatch.setattr(ai_module, "_PROFANITY_MIN_LEN", 3)
+    monkeypatch.setattr(ai_module, "normalize_for_profanity", lambda text: pytest.fail(text))
+    assert not ai_module.text_has_profanity("ок")
+
+
 def test_reload_profanity_runtime_changes_detect_behavior(monkeypatch) -> None:
     from app.services import ai_module
 
@@ -682,6 +725,23 @@ def test_bot_name_called_recognizes_cyrillic_alias() -> None:
     assert not _is_bot_name_called("Алекс, привет", prof)
 
 
+def test_mention_prefilter_skips_messages_without_bot_names(monkeypatch) -> None:
+    """Быстрый префильтр отсекает сообщения без имени/@username бота."""
+    from app.handlers import help as help_handler
+
+    monkeypatch.setattr(help_handler, "_BOT_PROFILE_CACHE", None)
+    monkeypatch.setattr(help_handler, "_MENTION_NEEDLES", ())
+
+    class _Profile:
+        first_name = "Jabot"
+        username = "alexjk_bot"
+
+    help_handler.prewarm_bot_profile(_Profile())
+    assert help_handler._may_mention_bot("Жабот, привет", [])
+    assert help_handler._may_mention_bot("спроси @AlexJK_bot", [])
+    assert not help_handler._may_mention_bot("привет всем, как дела", [])
+
+
 def test_bot_identity_is_zhabot_everywhere() -> None:
     """Бот представляется только Жаботом — никаких «Алекс» в текстах."""
     from app.handlers.help import _ABILITIES_CONTEXT, HELP_MENU_TEXT
@@ -734,3 +794,12 @@ def test_kb_search_finds_entries_by_inflected_query() -> None:
 
     result = search_resident_kb("вопрос про пропуска на машину")
     assert result.matches, "запрос с падежом должен находить запись про пропуск"
+
+
+def test_pick_other_never_repeats_previous() -> None:
+    from app.utils.text import pick_other
+
+    pool = ("a", "b", "c")
+    picks = {pick_other(pool, "b") for _ in range(200)}
+    assert picks == {"a", "c"}
+    assert pick_other(("only",), "only") == "only"
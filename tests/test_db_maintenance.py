@@ -1,6 +1,7 @@
 import asyncio
 from datetime import datetime, timedelta
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from app.db import Base
@@ -86,3 +87,45 @@ def test_cleanup_old_data_removes_outdated_rows() -> None:
         "ai_feedback": 0,
         "frequent_questions": 0,
     }
+
+
+def test_file_sqlite_engine_reuses_pooled_connections(tmp_path) -> None:
+    """Файловая SQLite держит пул соединений: PRAGMA не гоняются на каждую сессию."""
+    from sqlalchemy import event
+
+    from app.db import _engine_options
+
+    url = f"sqlite+aiosqlite:///{tmp_path}/pool.db"
+    engine = create_async_engine(url, **_engine_options(url))
+    connects: list[int] = []
+    event.listen(engine.sync_engine, "connect", lambda *_: connects.append(1))
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def _run() -> None:
+        for _ in range(3):
+            async with session_factory() as session:
+                await session.execute(text("SELECT 1"))
+        await engine.dispose()
+
+    asyncio.run(_run())
+    assert len(connects) == 1
+    assert "poolclass" not in _engine_options("sqlite+aiosqlite:///:memory:")
+
+
+def test_sqlite_pragmas_set_cache_and_mmap(tmp_path, monkeypatch) -> None:
+    """Хук подключения задаёт WAL, кэш страниц и mmap для каждого соединения."""
+    import sqlite3
+
+    from app import db
+
+    monkeypatch.setattr(db.settings, "database_url", "sqlite+aiosqlite:///bot.db")
+    conn = sqlite3.connect(tmp_path / "pragmas.db")
+    try:
+        db._configure_sqlite_pragmas(conn, None)
+        values = {
+            name: conn.execute(f"PRAGMA {name}").fetchone()[0]
+            for name in ("journal_mode", "cache_size", "mmap_size")
+        }
+    finally:
+        conn.close()
+    assert values == {"journal_mode": "wal", "cache_size": -64000, "mmap_size": 268435456}
@@ -0,0 +1,48 @@
+"""Тесты хендлеров доработок: ответы в Telegram — после закрытия сессии БД."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+
+class _TrackedSession:
+    def __init__(self, events: list[str]) -> None:
+        self.events = events
+
+    async def __aenter__(self):
+        self.events.append("open")
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.events.append("close")
+
+    async def commit(self) -> None:
+        self.events.append("commit")
+
+
+def test_vote_reply_is_sent_after_session_closed(monkeypatch) -> None:
+    """Отказ в голосовании уходит в Telegram уже без открытой сессии."""
+    from app.handlers import economy
+
+    events: list[str] = []
+    monkeypatch.setattr(economy, "get_session_ctx", lambda: _TrackedSession(events))
+
+    async def _vote(session, **kwargs):
+        return None, "not_found", False
+
+    monkeypatch.setattr(economy, "vote_for_improvement", _vote)
+
+    async def _answer(*args, **kwargs) -> None:
+        events.append("answer")
+
+    callback = SimpleNamespace(
+        from_user=SimpleNamespace(id=1, full_name="Житель"),
+        message=SimpleNamespace(message_thread_id=None),
+        data="impr_vote:5",
+        answer=_answer,
+    )
+    asyncio.run(economy.improvement_vote_callback(callback, AsyncMock()))
+
+    assert events == ["open", "close", "answer"]
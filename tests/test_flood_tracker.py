@@ -0,0 +1,40 @@
+"""Почему: антифлуд считает сообщения в скользящем окне без роста памяти."""
+
+import time
+
+from app.services.flood import FloodTracker
+
+
+def test_register_counts_within_window_and_expires() -> None:
+    tracker = FloodTracker(limit=10, window_seconds=120)
+    start = 1_200.0
+    for i in range(5):
+        count = tracker.register(1, 100, start + i)
+    assert count == 5
+    # Другой пользователь считается отдельно
+    assert tracker.register(2, 100, start) == 1
+    # В начале следующего окна прошлые сообщения ещё учитываются с весом
+    # (оценка округляется вверх), а через два окна — уже нет.
+    assert tracker.register(1, 100, start + 125) == 6
+    assert tracker.register(1, 100, start + 250) == 2
+
+
+def test_burst_across_window_boundary_reaches_limit() -> None:
+    """6 сообщений в конце окна и 5 сразу после стыка — это 11 за 2 минуты."""
+    tracker = FloodTracker(limit=10, window_seconds=120)
+    for i in range(6):
+        tracker.register(1, 100, 1_430.0 + i)
+    count = 0
+    for i in range(5):
+        count = tracker.register(1, 100, 1_440.5 + i * 0.1)
+    assert count > tracker.limit
+
+
+def test_tracker_is_bounded_and_cleanup_drops_idle_users() -> None:
+    tracker = FloodTracker(limit=10, window_seconds=120, max_keys=3)
+    old = time.monotonic() - 3600
+    for user_id in range(5):
+        tracker.register(user_id, 100, old)
+    assert len(tracker._windows) == 3
+    assert tracker.cleanup() == 3
+    assert not tracker._windows
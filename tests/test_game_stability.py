@@ -117,6 +117,76 @@ def test_21_resends_table_for_alive_game(db, monkeypatch) -> None:
     assert state.message_id == 555  # кнопки живут на новом сообщении
 
 
+def test_21_settles_expired_game_and_opens_table_in_one_commit(db, monkeypatch) -> None:
+    """Просроченная партия закрывается и новый стол открывается одним коммитом;
+    старое сообщение правится уже после него."""
+    from datetime import datetime, timedelta, timezone
+
+    from app.handlers import blackjack as h
+    from app.services import blackjack as bj
+
+    monkeypatch.setattr(h.settings, "forum_chat_id", 100)
+    monkeypatch.setattr(h.settings, "topic_games", 42)
+    monkeypatch.setattr(h, "is_game_time_allowed", lambda a, b: True)
+
+    async def _prepare():
+        async with db() as session:
+            await bj.save_game(session, 7, 100, bj.new_betting_state(message_id=111))
+            state, reason = await bj.place_bet_and_deal(session, 7, 100, 25, "Вася")
+            assert reason is None
+            state.started_at = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+            await bj.save_game(session, 7, 100, state)
+            await session.commit()
+
+    asyncio.run(_prepare())
+
+    events: list[str] = []
+
+    async def _get_session():
+        async with db() as session:
+            real_commit = session.commit
+
+            async def _commit():
+                events.append("commit")
+                await real_commit()
+
+            session.commit = _commit
+            yield session
+
+    async def _edit(bot, chat_id, message_id, text, *args, **kwargs):
+        events.append(f"edit:{message_id}")
+
+    monkeypatch.setattr(h, "get_session", _get_session)
+    monkeypatch.setattr(h, "_safe_edit", _edit)
+
+    message = _game_message(user_id=7)
+    asyncio.run(h.cmd_blackjack(message, AsyncMock()))
+
+    assert "Стол готов" in message.reply.await_args.args[0]
+    # Коммит закрытия+нового стола, правка старого стола, коммит message_id.
+    assert events == ["commit", "edit:111", "commit"]
+
+
+def test_21top_reuses_cached_leaderboard(db, monkeypatch) -> None:
+    """Повторный /21top в пределах TTL не пересчитывает топ."""
+    from app.handlers import blackjack as h
+
+    monkeypatch.setattr(h.settings, "forum_chat_id", 100)
+    monkeypatch.setattr(h.settings, "topic_games", 42)
+    h._top_cache.clear()
+    calls: list[int] = []
+
+    async def _board(_session, chat_id):
+        calls.append(chat_id)
+        return [], []
+
+    monkeypatch.setattr(h.bj, "get_leaderboard", _board)
+    for _ in range(3):
+        asyncio.run(h.cmd_leaderboard(_game_message()))
+    assert calls == [100]
+    h._top_cache.clear()
+
+
 def test_safe_answer_swallows_stale_callback() -> None:
     """«query is too old» от позднего answer не роняет обработчик кнопки."""
     from aiogram.exceptions import TelegramBadRequest
@@ -140,7 +210,7 @@ def test_gate_intent_ai_called_only_after_prefilter(monkeypatch) -> None:
     monkeypatch.setattr(moderation.settings, "topic_gate", 55)
     monkeypatch.setattr(moderation.settings, "ai_enabled", True)
     monkeypatch.setattr(moderation.settings, "ai_feature_moderation", False)
-    monkeypatch.setattr(moderation, "is_admin", AsyncMock(return_value=False))
+    monkeypatch.setattr(moderation, "is_admin_cached", AsyncMock(return_value=False))
     monkeypatch.setattr(moderation, "contains_forbidden_link", lambda _: False)
     monkeypatch.setattr(moderation, "_get_topic_context", AsyncMock(return_value=[]))
     monkeypatch.setattr(moderation, "_store_message_log", AsyncMock())
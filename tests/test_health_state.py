@@ -0,0 +1,43 @@
+import asyncio
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db import Base
+from app.models import HealthState
+from app.services.health import get_health_state, update_heartbeat, update_notice
+
+
+async def _heartbeat_updates() -> tuple[list[str], HealthState]:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with session_factory() as session:
+        await get_health_state(session)
+        await session.commit()
+
+    statements: list[str] = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda _c, _cur, statement, *_: statements.append(statement),
+    )
+    now = datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+    async with session_factory() as session:
+        await update_notice(session, now)
+        await update_heartbeat(session, now)
+        await session.commit()
+        state = await session.get(HealthState, 1)
+    await engine.dispose()
+    return statements, state
+
+
+def test_heartbeat_and_notice_are_written_in_one_update() -> None:
+    """Отметка heartbeat и уведомления пишутся одним UPDATE строки состояния."""
+    statements, state = asyncio.run(_heartbeat_updates())
+    updates = [s for s in statements if s.lstrip().upper().startswith("UPDATE")]
+    assert len(updates) == 1
+    assert "last_heartbeat_at" in updates[0] and "last_notice_at" in updates[0]
+    assert state.last_heartbeat_at is not None and state.last_notice_at is not None
@@ -10,6 +10,7 @@ from app.handlers.help import (
     AI_UNCERTAIN_REPLY_COOLDOWN,
     LAST_AI_REPLY_TIME,
     _LAST_UNCERTAIN_REPLY_TIME,
+    _classify_topic,
     _extract_ai_prompt,
     _get_ai_context,
     _is_ai_reply_rate_limited,
@@ -203,3 +204,20 @@ def test_uncertain_reply_is_throttled_for_repeated_questions() -> None:
         datetime.now(timezone.utc) - AI_UNCERTAIN_REPLY_COOLDOWN - timedelta(seconds=1)
     )
     assert _should_skip_uncertain_reply(**payload) is False
+
+
+def test_classify_topic_picks_best_scoring_topic() -> None:
+    assert _classify_topic("не открывается шлагбаум, пульт не работает") == "Шлагбаум"
+    assert _classify_topic("просто поболтать") is None
+
+
+def test_per_user_reply_state_is_bounded() -> None:
+    """Словари «последний ответ жителю» не растут бесконечно: лишний — самый давний."""
+    from app.utils.cache import remember_bounded
+
+    store: dict[tuple[int, int], int] = {}
+    for uid in range(3):
+        remember_bounded(store, (1, uid), uid, 3)
+    remember_bounded(store, (1, 0), 10, 3)  # освежили первого
+    remember_bounded(store, (1, 3), 3, 3)
+    assert list(store) == [(1, 2), (1, 0), (1, 3)]
@@ -0,0 +1,89 @@
+"""Почему: журнал сообщений копится в очереди и пишется пачками."""
+
+import asyncio
+
+from app.models import MessageLog
+from app.services import message_log
+
+
+def test_flush_writes_queued_records_in_batches(monkeypatch) -> None:
+    written: list[int] = []
+
+    async def _capture(batch: list[MessageLog]) -> None:
+        written.append(len(batch))
+
+    monkeypatch.setattr(message_log, "_write_batch", _capture)
+    monkeypatch.setattr(message_log, "LOG_BATCH_SIZE", 2)
+    for i in range(3):
+        assert message_log.enqueue_message_log(MessageLog(chat_id=1, user_id=i, severity=0))
+
+    assert asyncio.run(message_log.flush_message_log()) == 3
+    assert written == [2, 1]
+    assert asyncio.run(message_log.flush_message_log()) == 0
+
+
+def test_store_message_log_enqueues_instead_of_writing(monkeypatch) -> None:
+    from types import SimpleNamespace
+
+    from app.handlers import moderation
+
+    def _no_session():
+        raise AssertionError("журнал без внешней транзакции не открывает сессию")
+
+    queue: asyncio.Queue[MessageLog] = asyncio.Queue()
+    monkeypatch.setattr(message_log, "_LOG_QUEUE", queue)
+    monkeypatch.setattr(moderation, "get_session_ctx", _no_session)
+    monkeypatch.setattr(moderation, "get_session", _no_session)
+    message = SimpleNamespace(
+        chat=SimpleNamespace(id=1),
+        message_thread_id=42,
+        from_user=SimpleNamespace(id=7),
+        text="привет",
+    )
+
+    asyncio.run(moderation._store_message_log(message, 0, sentiment="neutral"))
+
+    record = queue.get_nowait()
+    assert (record.chat_id, record.topic_id, record.user_id, record.text) == (1, 42, 7, "привет")
+    assert queue.empty()
+
+
+def test_enqueue_drops_record_when_queue_is_full(monkeypatch) -> None:
+    queue: asyncio.Queue[MessageLog] = asyncio.Queue(maxsize=1)
+    monkeypatch.setattr(message_log, "_LOG_QUEUE", queue)
+
+    assert message_log.enqueue_message_log(MessageLog(chat_id=1, user_id=1, severity=0))
+    assert not message_log.enqueue_message_log(MessageLog(chat_id=1, user_id=2, severity=0))
+    assert queue.qsize() == 1
+
+
+def test_shutdown_flush_drains_what_flusher_has_not_taken(monkeypatch) -> None:
+    """Пока flusher пишет пачку, остаток очереди дописывает flush при остановке."""
+    written: list[int] = []
+
+    async def _run() -> int:
+        flusher_busy = asyncio.Event()
+
+        async def _capture(batch: list[MessageLog]) -> None:
+            written.extend(r.user_id for r in batch)
+            if not flusher_busy.is_set():
+                flusher_busy.set()
+                await asyncio.Event().wait()  # «медленная» запись пачки flusher'а
+
+        monkeypatch.setattr(message_log, "_write_batch", _capture)
+        monkeypatch.setattr(message_log, "_LOG_QUEUE", asyncio.Queue())
+        monkeypatch.setattr(message_log, "LOG_BATCH_SIZE", 2)
+        for i in range(5):
+            message_log.enqueue_message_log(MessageLog(chat_id=1, user_id=i, severity=0))
+        flusher = asyncio.create_task(message_log.run_message_log_flusher())
+        await flusher_busy.wait()
+        drained = await message_log.flush_message_log()
+        flusher.cancel()
+        try:
+            await flusher
+        except asyncio.CancelledError:
+            pass
+        return drained
+
+    assert asyncio.run(_run()) == 3
+    assert written == [0, 1, 2, 3, 4]
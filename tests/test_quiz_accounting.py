@@ -27,19 +27,15 @@ def db(tmp_path, monkeypatch):
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
 
-    async def _get_session():
-        async with factory() as session:
-            yield session
-
     asyncio.run(_prepare())
-    monkeypatch.setattr("app.handlers.quiz.get_session", _get_session)
+    monkeypatch.setattr("app.handlers.quiz.get_session_ctx", factory)
     yield factory
     asyncio.run(engine.dispose())
 
 
 def _make_bot() -> AsyncMock:
-    """Бот-мок: send_message возвращает объект с настоящим message_id (иначе
-    board_message_id в state_json — AsyncMock, и JSON-сериализация падает)."""
+    """Бот-мок: send_message возвращает объект с настоящим message_id
+    (его запоминает снимок вопроса для предупреждения за 10 секунд)."""
     bot = AsyncMock()
     counter = {"n": 0}
 
@@ -72,9 +68,10 @@ def _prime(monkeypatch, seconds=1, brk=0):
     monkeypatch.setattr(h.q, "QUESTIONS_PER_ROUND", 3)
     monkeypatch.setattr(h.q, "SECONDS_PER_QUESTION", seconds)
     monkeypatch.setattr(h.q, "BREAK_SECONDS", brk)
-    h._chat_locks.clear()
-    h._answer_events.clear()
+    h._chat_sync.clear()
     h._running.clear()
+    h._finishing.clear()
+    h._live.clear()
 
 
 def test_full_round_exact_accounting(db, monkeypatch) -> None:
@@ -106,11 +103,10 @@ def test_full_round_exact_accounting(db, monkeypatch) -> None:
         await asyncio.sleep(0.05)
 
         async def _current_answer() -> str:
-            async for session in h.get_session():
+            async with h.get_session_ctx() as session:
                 state = await h.q.load_session(session, 100)
                 await session.commit()
-                return state.current_answer
-            return ""
+            return state.current_answer
 
         # Вопрос 1 (порядок случайный — отвечаем по фактическому эталону):
         # Аня ошибается, затем верно; Петя после — уже поздно.
@@ -139,10 +135,9 @@ def test_full_round_exact_accounting(db, monkeypatch) -> None:
         """Ждём, пока driver продвинет тур до нужного вопроса."""
         for _ in range(100):
             await asyncio.sleep(0.05)
-            async for session in __import__("app.handlers.quiz", fromlist=["get_session"]).get_session():
+            async with h.get_session_ctx() as session:
                 state = await h.q.load_session(session, 100)
                 await session.commit()
-                break
             if state is not None and state.phase == phase and state.index == index:
                 return
         raise AssertionError(f"тур не дошёл до {phase}/{index}")
@@ -26,13 +26,8 @@ def db(tmp_path, monkeypatch):
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
 
-    async def _get_session():
-        async with factory() as session:
-            yield session
-
     asyncio.run(_prepare())
-    monkeypatch.setattr("app.handlers.quiz.get_session", _get_session)
-    monkeypatch.setattr("app.services.quiz.get_session", _get_session, raising=False)
+    monkeypatch.setattr("app.handlers.quiz.get_session_ctx", factory)
     yield factory
     asyncio.run(engine.dispose())
 
@@ -61,9 +56,10 @@ def _prime(monkeypatch, questions_per_round=2, seconds=1, brk=0):
     monkeypatch.setattr(h.q, "QUESTIONS_PER_ROUND", questions_per_round)
     monkeypatch.setattr(h.q, "SECONDS_PER_QUESTION", seconds)
     monkeypatch.setattr(h.q, "BREAK_SECONDS", brk)
-    h._chat_locks.clear()
-    h._answer_events.clear()
+    h._chat_sync.clear()
     h._running.clear()
+    h._finishing.clear()
+    h._live.clear()
 
 
 def test_full_round_completes_without_deadlock(db, monkeypatch) -> None:
@@ -176,3 +172,234 @@ def test_correct_answer_ends_question_fast(db, monkeypatch) -> None:
     from app.services.quiz import COINS_PER_CORRECT, WINNER_BONUS
     assert u.coins == 200 + COINS_PER_CORRECT + WINNER_BONUS
     assert len(rounds) == 1 and rounds[0].is_winner is True
+
+
+def test_stale_warning_timer_skips_db(db, monkeypatch) -> None:
+    """Таймер предупреждения для уже забранного вопроса не трогает лок и БД."""
+    from app.handlers import quiz as h
+    from app.services import quiz as q
+
+    _prime(monkeypatch, questions_per_round=1, seconds=30, brk=0)
+    h._remember_live(100, q.QuizState(
+        phase="asking", question_ids=[1, 2], index=0, current_answer="a", winner_user_id=7,
+    ))
+    monkeypatch.setattr("app.handlers.quiz.get_session_ctx", lambda: pytest.fail("БД не нужна"))
+    bot = _make_bot()
+
+    asyncio.run(h._warn_last_seconds(bot, 100, 0))
+
+    bot.edit_message_text.assert_not_awaited()
+
+
+def test_warning_edits_question_from_snapshot(db, monkeypatch) -> None:
+    """Предупреждение правит опубликованный вопрос по снимку, без лока и БД."""
+    from app.handlers import quiz as h
+    from app.services import quiz as q
+
+    _prime(monkeypatch, questions_per_round=1, seconds=30, brk=0)
+    state = q.QuizState(
+        phase="asking", question_ids=[1, 2], index=1, current_answer="Париж",
+        question_text="Столица Франции?",
+    )
+    h._remember_live(100, state)
+    h._remember_question_message(100, 1, 777)
+    monkeypatch.setattr("app.handlers.quiz.get_session_ctx", lambda: pytest.fail("БД не нужна"))
+    bot = _make_bot()
+
+    asyncio.run(h._warn_last_seconds(bot, 100, 1))
+
+    bot.edit_message_text.assert_awaited_once()
+    args, kwargs = bot.edit_message_text.await_args
+    assert args[0] == h._question_text(state, warn=True)
+    assert kwargs["message_id"] == 777
+
+
+def test_next_question_is_prefetched_during_break(db, monkeypatch) -> None:
+    """Следующий вопрос читается во время паузы, а не под локом после неё."""
+    from app.handlers import quiz as h
+    from app.services import quiz as q
+
+    _prime(monkeypatch, questions_per_round=2, seconds=1, brk=0)
+
+    async def _seed():
+        async with db() as session:
+            session.add(QuizQuestion(id=1, question="Q1?", answer="a1"))
+            session.add(QuizQuestion(id=2, question="Q2?", answer="a2"))
+            state = q.QuizState(
+                phase="asking", question_ids=[1, 2], index=0,
+                current_answer="a1", question_text="Q1?",
+            )
+            await q.save_session(session, 100, 42, state)
+            await session.commit()
+
+    asyncio.run(_seed())
+    bot = _make_bot()
+    locked_reads: list[int] = []
+    real_get = q.get_question
+
+    async def _spy(session, question_id):
+        if h._lock_for(100).locked():
+            locked_reads.append(question_id)
+        return await real_get(session, question_id)
+
+    monkeypatch.setattr(h.q, "get_question", _spy)
+
+    async def _run():
+        await h._close_and_advance(bot, 100)
+        async with db() as session:
+            return await q.load_session(session, 100)
+
+    state = asyncio.run(_run())
+    assert state.phase == "asking" and state.index == 1
+    assert state.question_text == "Q2?"
+    assert locked_reads == []
+
+
+def test_resumed_break_also_prefetches_next_question(db, monkeypatch) -> None:
+    """Возобновление в паузе после рестарта тоже читает вопрос вне лока."""
+    from app.handlers import quiz as h
+    from app.services import quiz as q
+
+    _prime(monkeypatch, questions_per_round=2, seconds=1, brk=0)
+
+    async def _seed():
+        async with db() as session:
+            session.add(QuizQuestion(id=1, question="Q1?", answer="a1"))
+            session.add(QuizQuestion(id=2, question="Q2?", answer="a2"))
+            state = q.QuizState(phase="break", question_ids=[1, 2], index=0)
+            await q.save_session(session, 100, 42, state)
+            await session.commit()
+
+    asyncio.run(_seed())
+    locked_reads: list[int] = []
+    real_get = q.get_question
+
+    async def _spy(session, question_id):
+        if h._lock_for(100).locked():
+            locked_reads.append(question_id)
+        return await real_get(session, question_id)
+
+    monkeypatch.setattr(h.q, "get_question", _spy)
+    bot = _make_bot()
+    asyncio.run(h._run_quiz(bot, 100))
+
+    sent = [c.args[1] for c in bot.send_message.await_args_list]
+    assert any("Q2?" in text for text in sent)
+    assert locked_reads == []
+
+
+def test_driver_cancel_does_not_tear_finish(db, monkeypatch) -> None:
+    """Отмена driver'а посреди финиша не обрывает итоги тура."""
+    from app.handlers import quiz as h
+    from app.services import quiz as q
+
+    _prime(monkeypatch)
+
+    async def _seed():
+        async with db() as session:
+            state = q.QuizState(
+                phase="finished", question_ids=[1], index=0,
+                scores={"7": {"name": "Аня", "correct": 1}},
+            )
+            await q.save_session(session, 100, 42, state)
+            await session.commit()
+
+    asyncio.run(_seed())
+    bot = _make_bot()
+    release = asyncio.Event()
+    entered = asyncio.Event()
+    real_record = q.record_round
+
+    async def _slow_record(*args, **kwargs):
+        entered.set()
+        await release.wait()
+        return await real_record(*args, **kwargs)
+
+    monkeypatch.setattr(h.q, "record_round", _slow_record)
+
+    async def _run():
+        driver = asyncio.create_task(h._run_quiz(bot, 100))
+        await entered.wait()
+        driver.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await driver
+        release.set()
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if bot.send_message.await_count:
+                break
+        async with db() as session:
+            return await session.get(QuizSession, 100)
+
+    assert asyncio.run(_run()) is None
+    assert "Викторина окончена" in bot.send_message.await_args.args[1]
+
+
+def test_stop_quiz_drivers_waits_for_started_finish(db, monkeypatch) -> None:
+    """Остановка бота дожидается начатого финиша: итоги закоммичены и объявлены."""
+    from app.handlers import quiz as h
+    from app.services import quiz as q
+
+    _prime(monkeypatch)
+
+    async def _seed():
+        async with db() as session:
+            state = q.QuizState(
+                phase="finished", question_ids=[1], index=0,
+                scores={"7": {"name": "Аня", "correct": 1}},
+            )
+            await q.save_session(session, 100, 42, state)
+            await session.commit()
+
+    asyncio.run(_seed())
+    bot = _make_bot()
+    release = asyncio.Event()
+    entered = asyncio.Event()
+    real_record = q.record_round
+
+    async def _slow_record(*args, **kwargs):
+        entered.set()
+        await release.wait()
+        return await real_record(*args, **kwargs)
+
+    monkeypatch.setattr(h.q, "record_round", _slow_record)
+
+    async def _run():
+        h._start_driver(bot, 100)
+        await entered.wait()
+        asyncio.get_running_loop().call_later(0.05, release.set)
+        await h.stop_quiz_drivers()
+        announced = bot.send_message.await_count
+        async with db() as session:
+            return await session.get(QuizSession, 100), announced
+
+    stored, announced = asyncio.run(_run())
+    assert stored is None
+    assert announced == 1
+    assert "Викторина окончена" in bot.send_message.await_args.args[1]
+    assert h._finishing == {}
+
+
+def test_stop_quiz_drivers_cancels_and_awaits(monkeypatch) -> None:
+    """При выключении driver'ы отменяются и дожидаются, таск назван по чату."""
+    from app.handlers import quiz as h
+
+    _prime(monkeypatch)
+    started = asyncio.Event()
+
+    async def _forever(bot, chat_id):
+        started.set()
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(h, "_run_quiz", _forever)
+
+    async def _run():
+        h._start_driver(AsyncMock(), 100)
+        task = h._running[100]
+        await started.wait()
+        await h.stop_quiz_drivers()
+        return task
+
+    task = asyncio.run(_run())
+    assert task.cancelled()
+    assert task.get_name() == "quiz-driver-100"
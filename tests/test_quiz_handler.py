@@ -22,12 +22,8 @@ def db(monkeypatch):
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
 
-    async def _get_session():
-        async with factory() as session:
-            yield session
-
     asyncio.run(_prepare())
-    monkeypatch.setattr("app.handlers.quiz.get_session", _get_session)
+    monkeypatch.setattr("app.handlers.quiz.get_session_ctx", factory)
     yield factory
     asyncio.run(engine.dispose())
 
@@ -45,9 +41,11 @@ def _prime_topic(monkeypatch) -> None:
     from app.handlers import quiz as h
     monkeypatch.setattr(h.settings, "forum_chat_id", 100)
     monkeypatch.setattr(h.settings, "topic_games", 42)
-    h._chat_locks.clear()
-    h._answer_events.clear()
+    h._chat_sync.clear()
     h._running.clear()
+    h._finishing.clear()
+    h._live.clear()
+    h._wrong_reaction_window.clear()
 
 
 async def _start_asking(db, answer: str) -> None:
@@ -147,3 +145,214 @@ def test_topic_gate_filter(monkeypatch) -> None:
 
     command = _answer_msg("/start", user_id=1)
     assert h._is_games_topic_answer(command) is False  # команды не перехватываем
+
+
+def test_answer_filter_is_bound_to_on_answer() -> None:
+    """Фильтр темы игр висит именно на приёме ответов, а не на соседней функции."""
+    from app.handlers import quiz as h
+
+    handlers = [
+        handler.callback
+        for handler in h.router.message.handlers
+        if any(f.callback is h._is_games_topic_answer for f in handler.filters)
+    ]
+    assert handlers == [h.on_answer]
+
+
+def test_chatter_is_filtered_without_db_after_first_read(db, monkeypatch) -> None:
+    """Вне тура и на неверных ответах БД читается один раз — дальше снимок."""
+    from app.handlers import quiz as h
+
+    _prime_topic(monkeypatch)
+    opened: list[int] = []
+
+    def _counting_session():
+        opened.append(1)
+        return db()
+
+    monkeypatch.setattr("app.handlers.quiz.get_session_ctx", _counting_session)
+
+    asyncio.run(h.on_answer(_answer_msg("всем привет", user_id=1), AsyncMock()))
+    asyncio.run(h.on_answer(_answer_msg("кто играет?", user_id=2), AsyncMock()))
+    assert len(opened) == 1  # тура нет — запомнили и больше не спрашиваем
+
+    h._live.clear()
+    asyncio.run(_start_asking(db, "Москва"))
+    asyncio.run(h.on_answer(_answer_msg("Питер", user_id=1), AsyncMock()))
+    asyncio.run(h.on_answer(_answer_msg("Казань", user_id=2), AsyncMock()))
+    assert len(opened) == 2  # неверные ответы отсечены без сессии
+
+
+def test_cold_start_burst_reads_snapshot_once(db, monkeypatch) -> None:
+    """Пачка сообщений сразу после рестарта открывает одну сессию, а не пачку."""
+    from app.handlers import quiz as h
+
+    _prime_topic(monkeypatch)
+    opened: list[int] = []
+
+    def _counting_session():
+        opened.append(1)
+        return db()
+
+    monkeypatch.setattr("app.handlers.quiz.get_session_ctx", _counting_session)
+
+    async def _burst():
+        await asyncio.gather(*(
+            h.on_answer(_answer_msg(f"привет {uid}", user_id=uid), AsyncMock())
+            for uid in range(5)
+        ))
+
+    asyncio.run(_burst())
+    assert len(opened) == 1
+    assert h._live[100] is None and h._live_loads == {}
+
+
+def test_simultaneous_correct_answers_cost_one_db_write(db, monkeypatch) -> None:
+    """Пачка одновременных верных ответов: сессию открывает только победитель."""
+    from app.handlers import quiz as h
+    from app.services import quiz as q
+
+    _prime_topic(monkeypatch)
+    asyncio.run(_start_asking(db, "Москва"))
+    opened: list[int] = []
+
+    def _counting_session():
+        opened.append(1)
+        return db()
+
+    monkeypatch.setattr("app.handlers.quiz.get_session_ctx", _counting_session)
+
+    async def _race():
+        await h.on_answer(_answer_msg("Питер", user_id=4), AsyncMock())  # снимок прогрет
+        await asyncio.gather(*(
+            h.on_answer(_answer_msg("Москва", user_id=uid), AsyncMock()) for uid in (1, 2, 3)
+        ))
+
+    asyncio.run(_race())
+
+    async def _check():
+        async with db() as session:
+            return await q.load_session(session, 100)
+
+    state = asyncio.run(_check())
+    assert state.winner_user_id == 1
+    assert list(state.scores) == ["1"]
+    assert len(opened) == 2  # первичное чтение снимка + запись победителя
+
+
+def test_late_correct_answer_does_not_wait_for_lock(db, monkeypatch) -> None:
+    """Пока победитель пишет в БД, остальные верные ответы не ждут лок,
+    а сорвавшаяся запись снимает заявку — вопрос снова открыт."""
+    from app.handlers import quiz as h
+    from app.services import quiz as q
+
+    _prime_topic(monkeypatch)
+    asyncio.run(_start_asking(db, "Москва"))
+
+    async def _run():
+        await h.on_answer(_answer_msg("Питер", user_id=4), AsyncMock())  # снимок прогрет
+        async with h._lock_for(100):  # лок занят (например, driver)
+            first = asyncio.create_task(h.on_answer(_answer_msg("Москва", user_id=1), AsyncMock()))
+            await asyncio.sleep(0)
+            late_bot = AsyncMock()
+            await asyncio.wait_for(
+                h.on_answer(_answer_msg("Москва", user_id=2), late_bot), timeout=1
+            )
+            assert late_bot.set_message_reaction.await_count == 0
+        await first
+
+    asyncio.run(_run())
+
+    async def _check():
+        async with db() as session:
+            return await q.load_session(session, 100)
+
+    assert asyncio.run(_check()).winner_user_id == 1
+
+    # Запись в БД упала — заявка снята, следующий верный ответ засчитывается.
+    h._live.clear()
+    asyncio.run(_start_asking(db, "Москва"))
+
+    async def _broken(*_args, **_kwargs):
+        raise RuntimeError("db down")
+
+    async def _run_failing():
+        await h.on_answer(_answer_msg("Питер", user_id=4), AsyncMock())
+        monkeypatch.setattr(h, "_claim_question", _broken)
+        with pytest.raises(RuntimeError):
+            await h.on_answer(_answer_msg("Москва", user_id=1), AsyncMock())
+        assert h._live[100].winner_user_id is None
+
+    asyncio.run(_run_failing())
+
+
+def test_wrong_answer_reactions_are_capped_per_chat(db, monkeypatch) -> None:
+    """Шквал промахов не превращается в шквал setMessageReaction."""
+    from app.handlers import quiz as h
+
+    _prime_topic(monkeypatch)
+    monkeypatch.setattr(h, "time", SimpleNamespace(monotonic=lambda: 1000.0))
+    reacted: list[str] = []
+
+    async def _react(_bot, _message, emoji):
+        reacted.append(emoji)
+
+    monkeypatch.setattr(h, "_safe_react", _react)
+    asyncio.run(_start_asking(db, "Москва"))
+
+    async def _run():
+        for uid in range(10):
+            await h.on_answer(_answer_msg("Питер", user_id=uid), AsyncMock())
+
+    asyncio.run(_run())
+    assert reacted == [h._WRONG_REACTION] * h._WRONG_REACTIONS_PER_SEC
+
+
+def test_leaderboard_is_cached_until_round_finishes(db, monkeypatch) -> None:
+    """Повторный топ не ходит в БД; финиш тура сбрасывает кэш."""
+    from app.handlers import quiz as h
+
+    _prime_topic(monkeypatch)
+    h._top_cache.clear()
+    calls: list[int] = []
+
+    async def _board(_session, chat_id, limit=5):
+        calls.append(chat_id)
+        return [("u1", 3, 1)]
+
+    monkeypatch.setattr(h.q, "get_alltime_leaderboard", _board)
+
+    first = asyncio.run(h._cached_top_text(100))
+    assert "u1 — 3 верных, побед 1" in first
+    assert asyncio.run(h._cached_top_text(100)) is first
+    assert calls == [100]
+
+    asyncio.run(_start_asking(db, "Москва"))
+    asyncio.run(h._finish_quiz(AsyncMock(), 100))
+    asyncio.run(h._cached_top_text(100))
+    assert calls == [100, 100]
+
+
+def test_final_text_lists_top_five_in_score_order() -> None:
+    """Итоговая таблица — пятеро лучших; равные идут в порядке участия."""
+    from app.handlers import quiz as h
+
+    scores = {
+        str(uid): {"name": f"p{uid}", "correct": correct}
+        for uid, correct in ((1, 1), (2, 3), (3, 2), (4, 3), (5, 0), (6, 1), (7, 2))
+    }
+    lines = h._final_text(scores).splitlines()
+    table = [line for line in lines if " верн" in line]
+    assert [line.split()[1] for line in table] == ["p2", "p4", "p3", "p7", "p1"]
+    assert table[-1].endswith("p1 — 1 верный")
+
+
+def test_chat_lock_and_event_share_one_record() -> None:
+    """Лок и событие чата живут в одной записи и не пересоздаются."""
+    from app.handlers import quiz as h
+
+    h._chat_sync.clear()
+    lock, event = h._lock_for(100), h._event_for(100)
+    assert list(h._chat_sync) == [100]
+    assert h._lock_for(100) is lock and h._event_for(100) is event
+    h._chat_sync.clear()
@@ -140,3 +140,72 @@ def test_winners_from_scores() -> None:
     assert winners_from_scores({}) == ([], 0)
     # Никто не набрал очков → нет победителей
     assert winners_from_scores({"1": {"name": "X", "correct": 0}}) == ([], 0)
+
+
+def test_repeated_guess_is_checked_once() -> None:
+    """Одинаковые после нормализации догадки считаются один раз."""
+    from app.services import quiz as q
+
+    q._check_normalized.cache_clear()
+    assert q.check_answer("Москва", "Москва!")
+    assert q.check_answer("Москва", "  москва ")
+    assert not q.check_answer("Москва", "Казань")
+    info = q._check_normalized.cache_info()
+    assert (info.hits, info.misses) == (1, 2)
+
+
+def test_answer_length_hint_is_memoized() -> None:
+    answer_length_hint.cache_clear()
+    for _ in range(3):
+        assert answer_length_hint("Красная площадь") == "2 слова"
+    assert answer_length_hint.cache_info().misses == 1
+
+
+def test_answer_variants_parsed_once_per_answer() -> None:
+    from app.services.quiz import _answer_variants
+
+    _answer_variants.cache_clear()
+    for guess in ("Пётр", "Петр Первый", "пётр I", "Екатерина"):
+        check_answer("Пётр Первый / Пётр I", guess)
+    assert _answer_variants.cache_info().misses == 1
+
+
+def test_repeated_words_in_guess_are_matched_once(monkeypatch) -> None:
+    """Повторы слова в ответе не умножают сверку с эталоном."""
+    from app.services import quiz as q
+
+    seen: list[list[str]] = []
+    real = q._variant_matched
+
+    def _spy(variant_tokens, given_tokens):
+        seen.append(list(given_tokens))
+        return real(variant_tokens, given_tokens)
+
+    monkeypatch.setattr(q, "_variant_matched", _spy)
+    q._check_normalized.cache_clear()
+    assert q.check_answer("Москва", "москва москва москва")
+    assert not q.check_answer("Париж", "не париж не париж")
+    assert seen[0] == ["москва"]
+    q._check_normalized.cache_clear()
+
+
+def test_answer_length_hint_agrees_with_word_count() -> None:
+    assert answer_length_hint("раз два три четыре пять") == "5 слов"
+    assert answer_length_hint("Красная площадь") == "2 слова"
+
+
+def test_plural_ru_forms() -> None:
+    from app.utils.text import plural_ru
+
+    forms = ("слово", "слова", "слов")
+    assert [plural_ru(n, forms) for n in (1, 2, 5, 11, 12, 21, 22, 25, 101, 111)] == [
+        "слово", "слова", "слов", "слов", "слов", "слово", "слова", "слов", "слово", "слов",
+    ]
+
+
+def test_answer_variants_keep_only_significant_tokens() -> None:
+    from app.services.quiz import _answer_variants
+
+    variants = _answer_variants("Ни пуха, ни пера / Москва")
+    assert variants[1] == (("москва",), False)
+    assert variants[0][1] is True  # «ни» — часть ответа, отрицание не снимаем
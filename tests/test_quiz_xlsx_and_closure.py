@@ -80,12 +80,8 @@ def db(tmp_path, monkeypatch):
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
 
-    async def _get_session():
-        async with factory() as session:
-            yield session
-
     asyncio.run(_prepare())
-    monkeypatch.setattr("app.handlers.quiz.get_session", _get_session)
+    monkeypatch.setattr("app.handlers.quiz.get_session_ctx", factory)
     yield factory
     asyncio.run(engine.dispose())
 
@@ -4,11 +4,8 @@ from __future__ import annotations
 
 import asyncio
 
-from app.services.ai_module import (
-    _BACKGROUND_TASKS,
-    _spawn_background,
-    _strip_prompt_scaffolding,
-)
+from app.services.ai_module import _strip_prompt_scaffolding
+from app.utils.tasks import _BACKGROUND_TASKS, spawn_background
 
 
 def test_strip_scaffolding_returns_bare_question() -> None:
@@ -47,10 +44,154 @@ def test_spawn_background_keeps_reference_until_done() -> None:
         async def _job() -> None:
             done.set()
 
-        _spawn_background(_job())
+        spawn_background(_job())
         assert _BACKGROUND_TASKS, "ссылка на задачу должна удерживаться"
         await done.wait()
         await asyncio.sleep(0)  # даём done_callback снять ссылку
         return True
 
     assert asyncio.run(_run())
+
+
+def test_help_timer_clearing_own_state_is_not_cancelled() -> None:
+    """Таймер подсказки, очищающий своё состояние, доходит до правки сообщения,
+    а реестр задач пустеет после его завершения."""
+    from app.handlers import help as h
+
+    key = (1, 2)
+
+    async def _run() -> bool:
+        edited = asyncio.Event()
+
+        async def _timer() -> None:
+            h._clear_waiting_state(key)
+            await asyncio.sleep(0)  # здесь раньше прилетал CancelledError
+            edited.set()
+
+        task = asyncio.create_task(_timer())
+        h._track_task(h.HELP_TIMEOUT_TASKS, key, task)
+        await task
+        await asyncio.sleep(0)
+        return edited.is_set() and key not in h.HELP_TIMEOUT_TASKS
+
+    assert asyncio.run(_run())
+
+
+def test_cancelled_neighbor_timeout_keeps_replacement() -> None:
+    """Отменённый таймер знакомства не выкидывает из реестра новый."""
+    from app.handlers import forms
+
+    async def _run() -> bool:
+        forms._start_neighbor_timeout(object(), object(), 1, None, 2)
+        first = forms._neighbor_timeout_tasks[(1, 2)]
+        await asyncio.sleep(0)  # первый таймер уже спит внутри try
+        forms._start_neighbor_timeout(object(), object(), 1, None, 2)
+        second = forms._neighbor_timeout_tasks[(1, 2)]
+        await asyncio.gather(first, return_exceptions=True)
+        kept = forms._neighbor_timeout_tasks.get((1, 2)) is second
+        second.cancel()
+        await asyncio.gather(second, return_exceptions=True)
+        return kept and first is not second
+
+    assert asyncio.run(_run())
+
+
+def test_neighbors_trigger_filter_matches_only_topic_text(monkeypatch) -> None:
+    """Анкета соседей ловит только текст пользователя в теме «Соседи»."""
+    from types import SimpleNamespace
+
+    from app.handlers import forms
+
+    monkeypatch.setattr(forms.settings, "forum_chat_id", -100)
+    monkeypatch.setattr(forms.settings, "topic_neighbors", 7)
+
+    def msg(**overrides):
+        data = {
+            "chat": SimpleNamespace(id=-100),
+            "message_thread_id": 7,
+            "from_user": SimpleNamespace(id=1),
+            "text": "привет",
+        }
+        data.update(overrides)
+        return SimpleNamespace(**data)
+
+    assert forms._is_neighbors_topic_text(msg()) is True
+    assert forms._is_neighbors_topic_text(msg(message_thread_id=8)) is False
+    assert forms._is_neighbors_topic_text(msg(chat=SimpleNamespace(id=1))) is False
+    assert forms._is_neighbors_topic_text(msg(from_user=None)) is False
+    assert forms._is_neighbors_topic_text(msg(text=None)) is False
+
+
+def test_gate_response_confirms_without_waiting_admin_log(monkeypatch) -> None:
+    """Подтверждение анкеты шлагбаума не ждёт отправки заявки в лог-чат."""
+    from types import SimpleNamespace
+
+    from app.handlers import forms
+
+    monkeypatch.setattr(forms.settings, "admin_log_chat_id", -500)
+
+    async def _run() -> tuple[list[str], list[str]]:
+        order: list[str] = []
+        release = asyncio.Event()
+
+        async def _send_message(chat_id, text, **kwargs):
+            await release.wait()
+            order.append("admin")
+
+        async def _reply(text, **kwargs):
+            order.append("reply")
+
+        async def _clear():
+            return None
+
+        message = SimpleNamespace(
+            text="ответ",
+            from_user=SimpleNamespace(id=3, username=None, full_name="Жилец"),
+            reply=_reply,
+        )
+        bot = SimpleNamespace(send_message=_send_message)
+        await forms.gate_response(message, SimpleNamespace(clear=_clear), bot)
+        before = list(order)
+        release.set()
+        await asyncio.gather(*_BACKGROUND_TASKS)
+        return before, order
+
+    before, after = asyncio.run(_run())
+    assert before == ["reply"]
+    assert after == ["reply", "admin"]
+
+
+def test_logging_middleware_formats_nothing_when_info_disabled(monkeypatch) -> None:
+    """При выключенном INFO middleware не собирает строку лога, но считает темы."""
+    from aiogram.types import Update
+
+    import app.main as main_module
+
+    recorded: list[tuple] = []
+    monkeypatch.setattr(main_module, "record_topic_message", lambda *a: recorded.append(a))
+    monkeypatch.setattr(main_module.settings, "forum_chat_id", -100)
+    monkeypatch.setattr(main_module.logger, "isEnabledFor", lambda level: False)
+    logged: list[str] = []
+    monkeypatch.setattr(main_module.logger, "info", lambda *a, **k: logged.append(a[0]))
+
+    update = Update.model_validate(
+        {
+            "update_id": 1,
+            "message": {
+                "message_id": 1,
+                "date": 0,
+                "chat": {"id": -100, "type": "supergroup"},
+                "message_thread_id": 5,
+                "from": {"id": 7, "is_bot": False, "first_name": "Жилец"},
+                "text": "привет",
+            },
+        }
+    )
+
+    async def _handler(event, data):
+        return "ok"
+
+    result = asyncio.run(main_module.LoggingMiddleware()(_handler, update, {}))
+    assert result == "ok"
+    assert logged == []
+    assert recorded and recorded[0][1] == 5
@@ -95,7 +95,7 @@ def test_main_does_not_raise_when_polling_network_error(monkeypatch) -> None:
         monkeypatch.setattr(main_module, "on_startup_warmup", AsyncMock())
         monkeypatch.setattr(main_module, "schedule_jobs", AsyncMock(return_value=None))
         monkeypatch.setattr(main_module, "close_ai_client", AsyncMock())
-        monkeypatch.setattr(main_module, "_run_background_task", lambda coro, *, name: coro.close())
+        monkeypatch.setattr(main_module, "spawn_background", lambda coro, *, name: coro.close())
         monkeypatch.setattr(main_module.asyncio, "sleep", AsyncMock())
 
         await main_module.main()
@@ -151,7 +151,7 @@ def test_on_startup_runs_places_sync_in_background(monkeypatch) -> None:
         monkeypatch.setattr("app.main.heartbeat_job", AsyncMock())
         monkeypatch.setattr("app.main.get_ai_client", lambda: object())
         monkeypatch.setattr("app.main.set_ai_admin_notifier", lambda _fn: None)
-        monkeypatch.setattr("app.main._run_background_task", _fake_background_task)
+        monkeypatch.setattr("app.main.spawn_background", _fake_background_task)
 
         await on_startup_warmup(bot)
 
@@ -223,7 +223,7 @@ def test_main_does_not_raise_when_polling_api_error(monkeypatch) -> None:
         monkeypatch.setattr(main_module, "on_startup_warmup", AsyncMock())
         monkeypatch.setattr(main_module, "schedule_jobs", AsyncMock(return_value=None))
         monkeypatch.setattr(main_module, "close_ai_client", AsyncMock())
-        monkeypatch.setattr(main_module, "_run_background_task", lambda coro, *, name: coro.close())
+        monkeypatch.setattr(main_module, "spawn_background", lambda coro, *, name: coro.close())
 
         await main_module.main()
 
@@ -269,3 +269,23 @@ def test_heartbeat_job_does_not_crash_when_telegram_unavailable(monkeypatch) ->
 
 
     asyncio.run(_run())
+
+
+def test_telegram_session_keeps_connections_warm() -> None:
+    """Пул соединений к Telegram настроен явно, без правки приватных полей aiogram."""
+    from app.main import TG_CONNECTION_LIMIT, TG_KEEPALIVE_SECONDS, RetryOnFloodSession
+
+    async def _run() -> None:
+        session = RetryOnFloodSession()
+        client = await session.create_session()
+        try:
+            assert await session.create_session() is client
+            connector = client.connector
+            assert connector.limit == TG_CONNECTION_LIMIT
+            assert connector.limit_per_host == TG_CONNECTION_LIMIT
+            assert connector._keepalive_timeout == TG_KEEPALIVE_SECONDS
+        finally:
+            await session.close()
+        assert client.closed
+
+    asyncio.run(_run())
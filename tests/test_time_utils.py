@@ -0,0 +1,30 @@
+"""Почему: ключ дня берётся на каждое сообщение — кэш живёт до местной полуночи."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from app.utils import time as t
+
+
+def test_today_key_is_cached_until_local_midnight(monkeypatch) -> None:
+    tz = ZoneInfo("Europe/Moscow")
+    clock = {"now": datetime(2026, 10, 17, 23, 59, 0, tzinfo=tz)}
+    calls: list[int] = []
+
+    def _now_tz():
+        calls.append(1)
+        return clock["now"]
+
+    monkeypatch.setattr(t, "now_tz", _now_tz)
+    monkeypatch.setattr(t.time, "time", lambda: clock["now"].timestamp())
+    monkeypatch.setattr(t, "_TODAY_KEY", (0.0, ""))
+
+    assert t.today_key() == "2026-10-17"
+    clock["now"] = datetime(2026, 10, 17, 23, 59, 59, tzinfo=tz)
+    assert t.today_key() == "2026-10-17"
+    assert len(calls) == 1  # до полуночи — из кэша
+    clock["now"] = datetime(2026, 10, 18, 0, 0, 1, tzinfo=tz)
+    assert t.today_key() == "2026-10-18"
+    assert len(calls) == 2
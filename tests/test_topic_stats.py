@@ -0,0 +1,72 @@
+"""Почему: счётчики тем копятся в памяти и пишутся в БД одним проходом."""
+
+import asyncio
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models import Base, TopicStat
+from app.services import topic_stats
+
+
+def test_topic_stats_are_buffered_and_flushed_in_one_pass(monkeypatch) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    sessions: list[int] = []
+
+    def _get_session_ctx():
+        sessions.append(1)
+        return factory()
+
+    monkeypatch.setattr(topic_stats, "get_session_ctx", _get_session_ctx)
+    topic_stats._PENDING.clear()
+
+    async def _run():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        for text in ("раз", "два", "три"):
+            topic_stats.record_topic_message(1, 42, "2026-10-16", text)
+        topic_stats.record_topic_message(1, 7, "2026-10-16", "другая тема")
+        assert await topic_stats.flush_topic_stats() == 2
+        topic_stats.record_topic_message(1, 42, "2026-10-16", "четыре")
+        await topic_stats.flush_topic_stats()
+        async with factory() as session:
+            rows = (await session.execute(select(TopicStat))).scalars().all()
+        await engine.dispose()
+        return {r.topic_id: (r.messages_count, r.last_message) for r in rows}
+
+    assert asyncio.run(_run()) == {42: (4, "четыре"), 7: (1, "другая тема")}
+    assert len(sessions) == 2
+    assert asyncio.run(topic_stats.flush_topic_stats()) == 0
+
+
+def test_topic_stats_bulk_bump_reads_once_and_keeps_keys_apart() -> None:
+    """Пачка тем-дней — один SELECT; строки с «перекрёстным» ключом не путаются."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    selects: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, *args) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    async def _run():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with factory() as session:
+            session.add(TopicStat(chat_id=1, topic_id=42, date_key="d2", messages_count=5))
+            await session.commit()
+        selects.clear()
+        async with factory() as session:
+            await topic_stats.bump_topic_stats_many(
+                session, {(1, 42, "d1"): [2, "a"], (1, 7, "d2"): [1, "b"], (1, 42, "d2"): [1, None]}
+            )
+            await session.commit()
+        async with factory() as session:
+            rows = (await session.execute(select(TopicStat))).scalars().all()
+        await engine.dispose()
+        return {(r.topic_id, r.date_key): r.messages_count for r in rows}
+
+    assert asyncio.run(_run()) == {(42, "d2"): 6, (42, "d1"): 2, (7, "d2"): 1}
+    assert len(selects) == 2  # один на пачку + проверочный в конце